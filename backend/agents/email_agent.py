@@ -12,11 +12,14 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import logging
 
+from sqlalchemy.orm import contains_eager, joinedload
+
 from app.core.database import SessionLocal
 from app.models.user import User
 from app.models.company import Company
 from app.models.opportunity import Opportunity
 from app.models.evaluation import Evaluation
+from app.services.stats import stats_service
 from app.services.email import (
     email_service,
     get_daily_digest_template,
@@ -62,9 +65,9 @@ class EmailAgent:
         Get all users subscribed to daily digest emails.
 
         Returns:
-            List of User objects with daily email preference
+            List of User objects with daily email preference (company loaded)
         """
-        return self.db.query(User).filter(
+        return self.db.query(User).options(joinedload(User.company)).filter(
             User.email_verified == True,
             User.email_frequency == "daily",
             User.company_id.isnot(None)
@@ -83,9 +86,11 @@ class EmailAgent:
             since: Only return evaluations created after this time
 
         Returns:
-            List of Evaluation objects with BID recommendation
+            List of Evaluation objects with BID recommendation (opportunity loaded)
         """
-        return self.db.query(Evaluation).join(Opportunity).filter(
+        return self.db.query(Evaluation).join(Opportunity).options(
+            contains_eager(Evaluation.opportunity)
+        ).filter(
             Evaluation.company_id == company_id,
             Evaluation.recommendation == "BID",
             Evaluation.created_at >= since
@@ -104,11 +109,13 @@ class EmailAgent:
             days_ahead: Number of days to look ahead
 
         Returns:
-            List of Evaluation objects with upcoming deadlines
+            List of Evaluation objects with upcoming deadlines (opportunity loaded)
         """
         cutoff_date = datetime.utcnow() + timedelta(days=days_ahead)
 
-        return self.db.query(Evaluation).join(Opportunity).filter(
+        return self.db.query(Evaluation).join(Opportunity).options(
+            contains_eager(Evaluation.opportunity)
+        ).filter(
             Evaluation.company_id == company_id,
             Evaluation.user_saved.in_(["WATCHING", "BIDDING"]),
             Opportunity.response_deadline.isnot(None),
@@ -126,19 +133,15 @@ class EmailAgent:
         Returns:
             Dict with evaluation statistics
         """
-        total_evaluated = self.db.query(Evaluation).filter(
-            Evaluation.company_id == company_id
-        ).count()
-
-        bid_count = self.db.query(Evaluation).filter(
-            Evaluation.company_id == company_id,
-            Evaluation.recommendation == "BID"
-        ).count()
+        company = self.db.query(Company).filter(Company.id == company_id).first()
+        if not company:
+            return {"total_evaluated": 0, "bid_count": 0, "in_pipeline": 0}
 
-        in_pipeline = self.db.query(Evaluation).filter(
-            Evaluation.company_id == company_id,
-            Evaluation.user_saved.isnot(None)
-        ).count()
+        # Read from the company_stats summary row
+        company_stats = stats_service.get_company_stats(self.db, company)
+        total_evaluated = company_stats["total_evaluations"]
+        bid_count = company_stats["bid_recommendations"]
+        in_pipeline = stats_service.get_pipeline_stats(self.db, company)["total"]
 
         return {
             "total_evaluated": total_evaluated,
@@ -185,10 +188,8 @@ class EmailAgent:
         if not user.company_id:
             return False
 
-        # Get company
-        company = self.db.query(Company).filter(
-            Company.id == user.company_id
-        ).first()
+        # Get company (already loaded by get_digest_subscribers)
+        company = user.company
 
         if not company:
             return False
@@ -321,6 +322,30 @@ class EmailAgent:
         logger.info(f"Daily digest complete: {sent} sent, {failed} failed, {skipped} skipped")
         return {"sent": sent, "failed": failed, "skipped": skipped}
 
+    def get_reminder_recipients(self, company_ids) -> Dict:
+        """
+        Pick the user to notify for each company.
+
+        Args:
+            company_ids: Companies with reminders due
+
+        Returns:
+            Dict of company_id -> User (companies without an eligible user are absent)
+        """
+        if not company_ids:
+            return {}
+
+        users = self.db.query(User).filter(
+            User.company_id.in_(list(company_ids)),
+            User.email_verified == True,
+            User.email_frequency != "none"
+        ).order_by(User.created_at).all()
+
+        recipients = {}
+        for user in users:
+            recipients.setdefault(user.company_id, user)
+        return recipients
+
     def run_deadline_reminders(self) -> Dict:
         """
         Send deadline reminder emails for opportunities due in 1, 3, or 7 days.
@@ -341,20 +366,20 @@ class EmailAgent:
             target_end = datetime.combine(target_date, datetime.max.time())
 
             # Get evaluations with deadlines on this date
-            evaluations = self.db.query(Evaluation).join(Opportunity).filter(
+            evaluations = self.db.query(Evaluation).join(Opportunity).options(
+                contains_eager(Evaluation.opportunity)
+            ).filter(
                 Evaluation.user_saved.in_(["WATCHING", "BIDDING"]),
                 Opportunity.response_deadline >= target_start,
                 Opportunity.response_deadline <= target_end
             ).all()
 
+            # One recipient per company, fetched in a single query
+            recipients = self.get_reminder_recipients({e.company_id for e in evaluations})
+
             for evaluation in evaluations:
                 try:
-                    # Get user for this company
-                    user = self.db.query(User).filter(
-                        User.company_id == evaluation.company_id,
-                        User.email_verified == True,
-                        User.email_frequency != "none"
-                    ).first()
+                    user = recipients.get(evaluation.company_id)
 
                     if not user:
                         continue
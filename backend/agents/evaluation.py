@@ -18,6 +18,7 @@ from app.models.company import Company
 from app.models.opportunity import Opportunity
 from app.models.evaluation import Evaluation
 from app.services.ai_evaluator import ai_evaluator_service
+from app.services.evaluation_executor import EvaluationExecutor, EvaluationOutcome
 from app.services.opportunity import opportunity_service
 
 logger = logging.getLogger(__name__)
@@ -130,6 +131,45 @@ class EvaluationAgent:
             logger.error(f"Error evaluating opportunity: {str(e)}")
             raise
 
+    async def evaluate_batch(
+        self,
+        opportunities: List[Opportunity],
+        company: Company
+    ) -> List[EvaluationOutcome]:
+        """
+        Evaluate several opportunities for a company concurrently.
+
+        Calls are bounded and rate limited by EvaluationExecutor
+        (OPENAI_MAX_CONCURRENCY / _REQUESTS_PER_MINUTE / _TOKENS_PER_MINUTE)
+        and retried with backoff on rate-limit and transient errors.
+
+        Args:
+            opportunities: Opportunities to evaluate
+            company: The company profile
+
+        Returns:
+            EvaluationOutcome per opportunity, in input order
+        """
+        executor = EvaluationExecutor()
+        return await executor.evaluate_many(
+            [(opportunity, company) for opportunity in opportunities]
+        )
+
+    def save_evaluations(self, outcomes: List[EvaluationOutcome]) -> List[Evaluation]:
+        """
+        Save successful evaluation outcomes in one transaction.
+
+        Args:
+            outcomes: Outcomes from evaluate_batch (only successful ones are saved)
+
+        Returns:
+            Created or updated Evaluation objects
+        """
+        return opportunity_service.create_evaluations_batch(
+            self.db,
+            [outcome.to_evaluation_data() for outcome in outcomes if outcome.ok]
+        )
+
     def save_evaluation(
         self,
         opportunity: Opportunity,
@@ -180,27 +220,19 @@ class EvaluationAgent:
                 "errors": 0
             }
 
-        evaluated = 0
-        errors = 0
-
-        for opportunity in opportunities:
-            try:
-                # Evaluate using AI
-                eval_data = asyncio.run(
-                    self.evaluate_opportunity(opportunity, company)
-                )
-
-                # Save evaluation
-                self.save_evaluation(opportunity, company, eval_data)
-                evaluated += 1
-
-            except Exception as e:
-                logger.error(
-                    f"Error evaluating opportunity {opportunity.id} "
-                    f"for company {company.id}: {str(e)}"
-                )
-                errors += 1
-                continue
+        # One event loop for the whole batch; calls run concurrently
+        outcomes = asyncio.run(self.evaluate_batch(opportunities, company))
+
+        succeeded = [outcome for outcome in outcomes if outcome.ok]
+        errors = len(outcomes) - len(succeeded)
+
+        try:
+            self.save_evaluations(succeeded)
+            evaluated = len(succeeded)
+        except Exception as e:
+            logger.error(f"Error saving evaluations for company {company.id}: {str(e)}")
+            evaluated = 0
+            errors += len(succeeded)
 
         return {
             "company_id": str(company.id),
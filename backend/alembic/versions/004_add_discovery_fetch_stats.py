@@ -0,0 +1,27 @@
+"""Add fetch engine metrics to discovery runs
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Per-NAICS latency/retry metrics recorded by the concurrent fetch engine
+    op.add_column('discovery_runs', sa.Column('api_retries', sa.Integer, server_default='0'))
+    op.add_column('discovery_runs', sa.Column('naics_stats', JSONB, nullable=True))
+
+
+def downgrade():
+    op.drop_column('discovery_runs', 'naics_stats')
+    op.drop_column('discovery_runs', 'api_retries')
@@ -0,0 +1,89 @@
+"""Add unique (source, source_id) constraint to opportunities
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Duplicate (source, source_id) rows: keep the most recently updated one
+    # (ties: newest created, then highest id) as the survivor
+    op.execute(sa.text("""
+        CREATE TEMPORARY TABLE opportunity_duplicates AS
+        SELECT id, survivor_id
+        FROM (
+            SELECT id,
+                   FIRST_VALUE(id) OVER w AS survivor_id,
+                   ROW_NUMBER() OVER w AS rank
+            FROM opportunities
+            WINDOW w AS (
+                PARTITION BY source, source_id
+                ORDER BY updated_at DESC NULLS LAST, created_at DESC, id DESC
+            )
+        ) ranked
+        WHERE rank > 1
+    """))
+
+    # Evaluations (with users' pipeline flags and notes) move to the survivor.
+    # Where a company ends up with several evaluations of the survivor, keep
+    # the user-touched one, then the latest.
+    op.execute(sa.text("""
+        DELETE FROM evaluations
+        WHERE id IN (
+            SELECT id
+            FROM (
+                SELECT e.id,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY e.company_id, COALESCE(d.survivor_id, e.opportunity_id)
+                           ORDER BY (e.user_saved IS NOT NULL OR e.user_notes IS NOT NULL) DESC,
+                                    e.evaluated_at DESC NULLS LAST,
+                                    e.id DESC
+                       ) AS rank
+                FROM evaluations e
+                LEFT JOIN opportunity_duplicates d ON d.id = e.opportunity_id
+                WHERE COALESCE(d.survivor_id, e.opportunity_id) IN (
+                    SELECT survivor_id FROM opportunity_duplicates
+                )
+            ) ranked
+            WHERE rank > 1
+        )
+    """))
+    op.execute(sa.text("""
+        UPDATE evaluations e
+        SET opportunity_id = d.survivor_id
+        FROM opportunity_duplicates d
+        WHERE e.opportunity_id = d.id
+    """))
+
+    # Match scores are a cache; the next score refresh recomputes them
+    op.execute(sa.text("""
+        DELETE FROM company_opportunity_scores
+        WHERE opportunity_id IN (SELECT id FROM opportunity_duplicates)
+    """))
+
+    op.execute(sa.text("""
+        DELETE FROM opportunities
+        WHERE id IN (SELECT id FROM opportunity_duplicates)
+    """))
+    op.execute(sa.text("DROP TABLE opportunity_duplicates"))
+
+    # Conflict target for INSERT ... ON CONFLICT bulk upserts
+    op.create_unique_constraint(
+        'uq_opportunities_source_source_id',
+        'opportunities',
+        ['source', 'source_id']
+    )
+
+
+def downgrade():
+    op.drop_constraint('uq_opportunities_source_source_id', 'opportunities', type_='unique')
@@ -0,0 +1,27 @@
+"""Add content_hash fingerprint to opportunities
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Nullable: existing rows are backfilled on their next sync, when the
+    # upsert sees a NULL hash as changed and rewrites the row
+    op.add_column('opportunities', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.create_index('ix_opportunities_content_hash', 'opportunities', ['content_hash'])
+
+
+def downgrade():
+    op.drop_index('ix_opportunities_content_hash', table_name='opportunities')
+    op.drop_column('opportunities', 'content_hash')
@@ -0,0 +1,96 @@
+"""Move opportunities.raw_data into a compressed side table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import json
+import zlib
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    op.create_table(
+        'opportunity_raw_payloads',
+        sa.Column('opportunity_id', postgresql.UUID(as_uuid=True),
+                  sa.ForeignKey('opportunities.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.add_column('opportunities', sa.Column('naics_description', sa.String(255), nullable=True))
+
+    op.execute("""
+        UPDATE opportunities
+        SET naics_description = LEFT(COALESCE(
+            raw_data->>'classificationCode',
+            raw_data->>'naicsDescription'
+        ), 255)
+        WHERE raw_data IS NOT NULL
+    """)
+
+    # Compress existing payloads into the side table in batches (keyset on id)
+    conn = op.get_bind()
+    payloads = sa.table(
+        'opportunity_raw_payloads',
+        sa.column('opportunity_id', postgresql.UUID(as_uuid=True)),
+        sa.column('payload', sa.LargeBinary()),
+        sa.column('size', sa.Integer()),
+        sa.column('updated_at', sa.DateTime(timezone=True)),
+    )
+    last_id = None
+    while True:
+        rows = conn.execute(sa.text(
+            "SELECT id, raw_data, updated_at FROM opportunities "
+            "WHERE raw_data IS NOT NULL"
+            + (" AND id > :last_id" if last_id else "")
+            + " ORDER BY id LIMIT :limit"
+        ), {'last_id': last_id, 'limit': BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+
+        batch = []
+        for row in rows:
+            encoded = json.dumps(row.raw_data, separators=(',', ':'), default=str).encode('utf-8')
+            batch.append({
+                'opportunity_id': row.id,
+                'payload': zlib.compress(encoded),
+                'size': len(encoded),
+                'updated_at': row.updated_at,
+            })
+        conn.execute(payloads.insert(), batch)
+        last_id = rows[-1].id
+
+    op.drop_column('opportunities', 'raw_data')
+
+    # Rows are re-fingerprinted with naics_description on their next sync
+    op.execute("UPDATE opportunities SET content_hash = NULL")
+
+
+def downgrade():
+    op.add_column('opportunities', sa.Column('raw_data', postgresql.JSONB(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT opportunity_id, payload FROM opportunity_raw_payloads"
+    )).fetchall()
+    for row in rows:
+        conn.execute(
+            sa.text("UPDATE opportunities SET raw_data = CAST(:raw AS JSONB) WHERE id = :id"),
+            {'raw': zlib.decompress(row.payload).decode('utf-8'), 'id': row.opportunity_id}
+        )
+
+    op.drop_column('opportunities', 'naics_description')
+    op.drop_table('opportunity_raw_payloads')
@@ -0,0 +1,41 @@
+"""Add composite indexes for keyset pagination
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Match the (sort key DESC NULLS LAST, id DESC) ordering used by
+    # app.core.pagination so every page is a single index range scan
+    op.create_index(
+        'ix_opportunities_status_posted_id',
+        'opportunities',
+        ['status', sa.text('posted_date DESC NULLS LAST'), sa.text('id DESC')]
+    )
+    op.create_index(
+        'ix_evaluations_company_fit_id',
+        'evaluations',
+        ['company_id', sa.text('fit_score DESC NULLS LAST'), sa.text('id DESC')]
+    )
+    op.create_index(
+        'ix_evaluations_company_evaluated_id',
+        'evaluations',
+        ['company_id', sa.text('evaluated_at DESC NULLS LAST'), sa.text('id DESC')]
+    )
+
+
+def downgrade():
+    op.drop_index('ix_evaluations_company_evaluated_id', table_name='evaluations')
+    op.drop_index('ix_evaluations_company_fit_id', table_name='evaluations')
+    op.drop_index('ix_opportunities_status_posted_id', table_name='opportunities')
@@ -0,0 +1,47 @@
+"""Add company_stats summary table and evaluation pipeline columns
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = [
+    'total_opportunities', 'active_opportunities',
+    'total_evaluations', 'bid_recommendations', 'no_bid_recommendations', 'research_recommendations',
+    'fit_score_count', 'win_probability_count',
+    'pipeline_watching', 'pipeline_bidding', 'pipeline_passed', 'pipeline_won', 'pipeline_lost',
+]
+
+
+def upgrade():
+    # Pipeline fields read by the API/agents (present in 002, missing from
+    # databases created from the current models)
+    op.execute("ALTER TABLE evaluations ADD COLUMN IF NOT EXISTS user_saved VARCHAR(20)")
+    op.execute("ALTER TABLE evaluations ADD COLUMN IF NOT EXISTS user_notes TEXT")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_evaluations_user_saved ON evaluations (user_saved)")
+
+    # Per-company dashboard counters; rows are built on first read
+    op.create_table(
+        'company_stats',
+        sa.Column('company_id', UUID(as_uuid=True), sa.ForeignKey('companies.id', ondelete='CASCADE'), primary_key=True),
+        *[sa.Column(name, sa.Integer, nullable=False, server_default='0') for name in COUNTER_COLUMNS],
+        sa.Column('fit_score_sum', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('win_probability_sum', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()')),
+    )
+
+
+def downgrade():
+    # The pipeline columns belong to 002 (the upgrade only backfills them),
+    # so they and their index stay in place
+    op.drop_table('company_stats')
@@ -0,0 +1,53 @@
+"""Add jobs table (DB-backed background job queue)
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'jobs',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column('company_id', UUID(as_uuid=True), sa.ForeignKey('companies.id', ondelete='CASCADE'), nullable=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('params', JSONB, nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('progress', JSONB, nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('result', JSONB, nullable=True),
+        sa.Column('error', sa.Text, nullable=True),
+        sa.Column('attempts', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('worker_id', sa.String(100), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # One queued/running job per (kind, company): duplicate triggers coalesce
+    op.create_index(
+        'uq_jobs_active_kind_company',
+        'jobs',
+        ['kind', 'company_id'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')")
+    )
+    op.create_index('ix_jobs_status_created_at', 'jobs', ['status', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_jobs_status_created_at', table_name='jobs')
+    op.drop_index('uq_jobs_active_kind_company', table_name='jobs')
+    op.drop_table('jobs')
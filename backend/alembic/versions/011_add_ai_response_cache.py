@@ -0,0 +1,39 @@
+"""Add ai_response_cache table (LLM responses keyed by prompt fingerprint)
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ai_response_cache',
+        sa.Column('key', sa.String(64), primary_key=True),
+        sa.Column('kind', sa.String(20), nullable=False),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('response', JSONB, nullable=False),
+        sa.Column('prompt_tokens', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('completion_tokens', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('total_tokens', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('hit_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('NOW()')),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_ai_response_cache_expires_at', 'ai_response_cache', ['expires_at'])
+
+
+def downgrade():
+    op.drop_index('ix_ai_response_cache_expires_at', table_name='ai_response_cache')
+    op.drop_table('ai_response_cache')
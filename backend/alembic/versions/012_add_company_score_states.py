@@ -0,0 +1,31 @@
+"""Add company_score_states table and opportunities.updated_at index (score refresh)
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'company_score_states',
+        sa.Column('company_id', UUID(as_uuid=True), sa.ForeignKey('companies.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('profile_hash', sa.String(64), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index('ix_opportunities_updated_at', 'opportunities', ['updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_opportunities_updated_at', table_name='opportunities')
+    op.drop_table('company_score_states')
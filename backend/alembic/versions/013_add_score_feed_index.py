@@ -0,0 +1,29 @@
+"""Add (company_id, fit_score DESC, opportunity_id DESC) index for the ranked feed
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Same (sort key DESC NULLS LAST, id DESC) shape as the 008 keyset indexes:
+    # top-N of a company's ranked feed is a single index range scan
+    op.create_index(
+        'ix_company_opportunity_scores_company_fit',
+        'company_opportunity_scores',
+        ['company_id', sa.text('fit_score DESC NULLS LAST'), sa.text('opportunity_id DESC')]
+    )
+
+
+def downgrade():
+    op.drop_index('ix_company_opportunity_scores_company_fit', table_name='company_opportunity_scores')
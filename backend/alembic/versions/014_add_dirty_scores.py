@@ -0,0 +1,27 @@
+"""Add company_score_states.dirty_scores (sub-score invalidation on profile edits)
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'company_score_states',
+        sa.Column('dirty_scores', ARRAY(sa.Text), nullable=False, server_default='{}')
+    )
+
+
+def downgrade():
+    op.drop_column('company_score_states', 'dirty_scores')
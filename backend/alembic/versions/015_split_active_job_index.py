@@ -0,0 +1,56 @@
+"""Split the active-job unique index: one queued and one running job per (kind, company)
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A follow-up job may be queued behind a running one (score_recompute)
+    op.create_index(
+        'uq_jobs_queued_kind_company',
+        'jobs',
+        ['kind', 'company_id'],
+        unique=True,
+        postgresql_where=sa.text("status = 'queued'")
+    )
+    op.create_index(
+        'uq_jobs_running_kind_company',
+        'jobs',
+        ['kind', 'company_id'],
+        unique=True,
+        postgresql_where=sa.text("status = 'running'")
+    )
+    op.drop_index('uq_jobs_active_kind_company', table_name='jobs')
+
+
+def downgrade():
+    # Fold follow-ups into their running job so the combined index can be built
+    op.execute(sa.text("""
+        UPDATE jobs q
+        SET status = 'failed', error = 'Superseded (migration downgrade)', finished_at = NOW()
+        WHERE q.status = 'queued'
+          AND EXISTS (
+              SELECT 1 FROM jobs r
+              WHERE r.status = 'running' AND r.kind = q.kind AND r.company_id = q.company_id
+          )
+    """))
+    op.create_index(
+        'uq_jobs_active_kind_company',
+        'jobs',
+        ['kind', 'company_id'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')")
+    )
+    op.drop_index('uq_jobs_running_kind_company', table_name='jobs')
+    op.drop_index('uq_jobs_queued_kind_company', table_name='jobs')
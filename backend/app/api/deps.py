@@ -1,20 +1,28 @@
-from typing import Generator
+from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.async_database import get_async_db
 from app.core.database import get_db
 from app.core.security import decode_access_token
 from app.models.user import User
-from app.services.auth import get_user_by_id
+from app.models.company import Company
+from app.services.identity_cache import CurrentIdentity, identity_cache
 
 security = HTTPBearer()
 
 
-def get_current_user(
+async def get_current_identity(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token."""
+    db: AsyncSession = Depends(get_async_db)
+) -> CurrentIdentity:
+    """
+    Resolve the authenticated user and their company from the JWT token.
+
+    One joined query (or an identity cache hit) per request; FastAPI caches
+    the result, so get_current_user and get_current_company share it. The
+    instances belong to the request's AsyncSession (get_async_db).
+    """
     token = credentials.credentials
 
     # Decode token
@@ -35,12 +43,22 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Get user from database
-    user = get_user_by_id(db, user_id)
-    if user is None:
+    # Get user and company
+    identity = await db.run_sync(identity_cache.load, user_id)
+    if identity is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    return user
+    return identity
+
+
+def get_current_user(identity: CurrentIdentity = Depends(get_current_identity)) -> User:
+    """Get current authenticated user from JWT token."""
+    return identity.user
+
+
+def get_current_company(identity: CurrentIdentity = Depends(get_current_identity)) -> Optional[Company]:
+    """Get the current user's company (None if no profile has been created)."""
+    return identity.company
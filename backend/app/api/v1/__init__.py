@@ -3,6 +3,7 @@ from .auth import router as auth_router
 from .company import router as company_router
 from .reference import router as reference_router
 from .opportunities import router as opportunities_router
+from .jobs import router as jobs_router
 from app.api.v1.awards import router as awards_router
 from .documents import router as documents_router
 from .agencies import router as agencies_router
@@ -16,6 +17,7 @@ api_router.include_router(reference_router, prefix="/reference", tags=["Referenc
 # to ensure /evaluations/stale-count is matched before /evaluations/{evaluation_id}
 api_router.include_router(evaluations_router, prefix="/evaluations", tags=["Dynamic Re-scoring"])
 api_router.include_router(opportunities_router, tags=["Opportunities & Evaluations"])
+api_router.include_router(jobs_router, prefix="/jobs", tags=["Background Jobs"])
 api_router.include_router(awards_router)
 api_router.include_router(documents_router, prefix="/documents", tags=["Document Management"])
 api_router.include_router(agencies_router, prefix="/agencies", tags=["Authority Mapping"])
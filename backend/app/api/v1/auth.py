@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from app.core.database import get_db
+from app.core.async_database import get_async_db
 from app.core.security import create_access_token
 from app.schemas.auth import (
     LoginRequest,
@@ -90,7 +92,7 @@ def login(
 
 
 @router.post("/logout", response_model=MessageResponse)
-def logout(
+async def logout(
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -137,7 +139,7 @@ def reset_password(
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(
+async def get_current_user_info(
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -150,10 +152,10 @@ def get_current_user_info(
 
 
 @router.put("/me", response_model=UserResponse)
-def update_current_user(
+async def update_current_user(
     user_data: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update current authenticated user.
@@ -167,7 +169,7 @@ def update_current_user(
     for key, value in update_data.items():
         setattr(current_user, key, value)
 
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
 
     return current_user
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.async_database import get_async_db
 from app.schemas.company import CompanyCreate, CompanyUpdate, CompanyResponse
 from app.schemas.auth import MessageResponse
-from app.services import company as company_service
-from app.api.deps import get_current_user
+from app.services.async_services import async_company_service
+from app.api.deps import get_current_company, get_current_user
 from app.models.user import User
+from app.models.company import Company
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,9 +16,10 @@ router = APIRouter()
 
 
 @router.get("/me", response_model=CompanyResponse)
-def get_my_company(
+async def get_my_company(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get current user's company profile.
@@ -24,7 +27,6 @@ def get_my_company(
     - Returns company profile if exists
     - Returns 404 if no company profile
     """
-    company = company_service.get_user_company(db, current_user.id)
     if not company:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -34,10 +36,10 @@ def get_my_company(
 
 
 @router.post("/", response_model=CompanyResponse, status_code=status.HTTP_201_CREATED)
-def create_company(
+async def create_company(
     company_data: CompanyCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a company profile for current user.
@@ -46,7 +48,7 @@ def create_company(
     - Returns 400 if company already exists
     - Automatically triggers opportunity discovery after creation
     """
-    company = company_service.create_company(db, company_data, current_user.id)
+    company = await async_company_service.create_company(db, company_data, current_user.id)
 
     # Note: Initial opportunity discovery will happen on next cron job run (every 15 min)
     logger.info(f"Company created: {company.id}. Discovery will run on next scheduled job.")
@@ -55,10 +57,11 @@ def create_company(
 
 
 @router.put("/", response_model=CompanyResponse)
-def update_my_company(
+async def update_my_company(
     company_data: CompanyUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update current user's company profile.
@@ -66,8 +69,6 @@ def update_my_company(
     - Only updates provided fields
     - Returns 404 if no company profile exists
     """
-    # Get user's company
-    company = company_service.get_user_company(db, current_user.id)
     if not company:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -75,14 +76,15 @@ def update_my_company(
         )
 
     # Update company
-    updated_company = company_service.update_company(db, company.id, company_data, current_user.id)
+    updated_company = await async_company_service.update_company(db, company.id, company_data, current_user.id)
     return updated_company
 
 
 @router.delete("/", response_model=MessageResponse)
-def delete_my_company(
+async def delete_my_company(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete current user's company profile.
@@ -90,8 +92,6 @@ def delete_my_company(
     - Permanently deletes company profile
     - User can create a new one afterward
     """
-    # Get user's company
-    company = company_service.get_user_company(db, current_user.id)
     if not company:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -99,14 +99,14 @@ def delete_my_company(
         )
 
     # Delete company
-    company_service.delete_company(db, company.id, current_user.id)
+    await async_company_service.delete_company(db, company.id, current_user.id)
     return MessageResponse(message="Company profile deleted successfully")
 
 
 @router.get("/{company_id}", response_model=CompanyResponse)
-def get_company(
+async def get_company(
     company_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get company by ID (public endpoint for future features).
@@ -114,7 +114,7 @@ def get_company(
     - Returns company profile
     - Returns 404 if not found
     """
-    company = company_service.get_company_by_id(db, company_id)
+    company = await async_company_service.get_company_by_id(db, company_id)
     if not company:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,41 @@
+"""
+API endpoints for background job status
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from uuid import UUID
+from app.api.deps import get_async_db, get_current_company, get_current_user
+from app.models.user import User
+from app.models.company import Company
+from app.schemas.job import JobResponse
+from app.services.async_services import async_job_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: UUID,
+    current_user: User = Depends(get_current_user),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get the status, progress and result of a background job.
+
+    Visible to the user who queued it and to members of its company.
+    """
+    job = await async_job_service.get_job(db, job_id)
+
+    owned = job is not None and (
+        job.user_id == current_user.id
+        or (company is not None and job.company_id == company.id)
+    )
+    if not owned:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job
@@ -3,10 +3,12 @@ API endpoints for opportunities and evaluations
 """
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.api.deps import get_current_user, get_db
+from datetime import datetime
+from app.api.deps import get_async_db, get_current_company, get_current_user
 from app.models.user import User
+from app.models.company import Company
 from app.models.opportunity import Opportunity
 from app.models.evaluation import Evaluation
 from app.schemas.opportunity import (
@@ -14,15 +16,25 @@ from app.schemas.opportunity import (
     OpportunityWithEvaluation,
     OpportunityListResponse,
     OpportunityStatsResponse,
+    RankedFeedResponse,
     EvaluationInDB,
     EvaluationWithOpportunity,
+    EvaluationWithOpportunitySummary,
     EvaluationListResponse,
     EvaluationUpdate,
 )
+from app.schemas.job import JobEnqueuedResponse
+from app.services.jobs import COMPANY_DISCOVERY
 from app.services.opportunity import opportunity_service
-from app.services.company import get_user_company
+from app.core.pagination import InvalidCursor, encode_cursor, next_cursor
 from app.services.match_scoring import match_scoring_service
 from app.services.opportunity_filter import opportunity_filter
+from app.services.async_services import (
+    async_job_service,
+    async_match_scoring_service,
+    async_opportunity_service,
+    async_stats_service,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -38,15 +50,18 @@ async def list_opportunities(
     limit: int = Query(20, ge=1, le=100),
     naics_code: Optional[str] = None,
     active_only: bool = True,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (overrides skip)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     List all opportunities (optionally filtered by NAICS code)
+
+    Supports offset (skip/limit) and keyset (cursor/limit) pagination.
     """
     try:
-        # Get user's company to filter by NAICS codes
-        company = get_user_company(db, current_user.id)
+        # Filter by the user's company NAICS codes
         naics_codes = None
 
         if naics_code:
@@ -55,55 +70,127 @@ async def list_opportunities(
             naics_codes = company.naics_codes
 
         # Get opportunities
-        opportunities = opportunity_service.list_opportunities(
+        opportunities = await async_opportunity_service.list_opportunities(
             db,
             skip=skip,
             limit=limit,
             active_only=active_only,
-            naics_codes=naics_codes
+            naics_codes=naics_codes,
+            summary=True,
+            cursor=cursor
         )
 
         # Get total count
-        query = db.query(Opportunity)
-        if active_only:
-            query = query.filter(Opportunity.status == "active")
-        if naics_codes:
-            query = query.filter(Opportunity.naics_code.in_(naics_codes))
-        total = query.count()
+        total = await async_opportunity_service.count_opportunities(
+            db, active_only=active_only, naics_codes=naics_codes
+        )
 
         return {
             "opportunities": opportunities,
             "total": total,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor(opportunities, limit, "posted_date")
         }
 
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing opportunities: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to list opportunities")
 
 
+@router.get("/opportunities/feed", response_model=RankedFeedResponse)
+async def get_ranked_feed(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    min_fit_score: Optional[float] = Query(None, ge=0, le=100),
+    min_naics_score: Optional[float] = Query(None, ge=0, le=100),
+    min_cert_score: Optional[float] = Query(None, ge=0, le=100),
+    min_size_score: Optional[float] = Query(None, ge=0, le=100),
+    min_geo_score: Optional[float] = Query(None, ge=0, le=100),
+    min_deadline_score: Optional[float] = Query(None, ge=0, le=100),
+    deadline_after: Optional[datetime] = None,
+    deadline_before: Optional[datetime] = None,
+    set_aside: Optional[str] = None,
+    state: Optional[str] = Query(None, min_length=2, max_length=2),
+    active_only: bool = True,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (overrides skip)"),
+    current_user: User = Depends(get_current_user),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Opportunities ranked by match score for the user's company (highest fit first)
+
+    Served from the match-score cache, which is refreshed after every
+    discovery run; opportunities not yet scored are not listed. Supports
+    offset (skip/limit) and keyset (cursor/limit) pagination.
+    """
+    if not company:
+        raise HTTPException(status_code=400, detail="Company profile required")
+
+    filters = {
+        "min_scores": {
+            "fit_score": min_fit_score,
+            "naics_score": min_naics_score,
+            "cert_score": min_cert_score,
+            "size_score": min_size_score,
+            "geo_score": min_geo_score,
+            "deadline_score": min_deadline_score,
+        },
+        "deadline_after": deadline_after,
+        "deadline_before": deadline_before,
+        "set_aside": set_aside,
+        "state": state,
+        "active_only": active_only,
+    }
+
+    try:
+        scores = await async_opportunity_service.list_ranked_opportunities(
+            db, company.id, skip=skip, limit=limit, cursor=cursor, **filters
+        )
+        total = await async_opportunity_service.count_ranked_opportunities(db, company.id, **filters)
+
+        cursor_after = None
+        if scores and len(scores) == limit:
+            cursor_after = encode_cursor(scores[-1].fit_score, scores[-1].opportunity_id)
+
+        return {
+            "opportunities": scores,
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "next_cursor": cursor_after
+        }
+
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error listing ranked feed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to list ranked opportunities")
+
+
 @router.get("/opportunities/{opportunity_id}", response_model=OpportunityWithEvaluation)
 async def get_opportunity(
     opportunity_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get a specific opportunity by ID (with evaluation if exists)
     """
     try:
-        opportunity = opportunity_service.get_opportunity_by_id(db, opportunity_id)
+        opportunity = await async_opportunity_service.get_opportunity_by_id(db, opportunity_id)
         if not opportunity:
             raise HTTPException(status_code=404, detail="Opportunity not found")
 
-        # Get company
-        company = get_user_company(db, current_user.id)
         if not company:
             raise HTTPException(status_code=400, detail="Company profile required")
 
         # Get evaluation if exists
-        evaluation = opportunity_service.get_evaluation_for_opportunity(
+        evaluation = await async_opportunity_service.get_evaluation_for_opportunity(
             db, opportunity_id, company.id
         )
 
@@ -128,52 +215,55 @@ async def list_evaluations(
     limit: int = Query(20, ge=1, le=100),
     recommendation: Optional[str] = Query(None, regex="^(BID|NO_BID|RESEARCH)$"),
     min_fit_score: Optional[float] = Query(None, ge=0, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (overrides skip)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     List evaluations for the current user's company
+
+    Supports offset (skip/limit) and keyset (cursor/limit) pagination.
     """
     try:
-        # Get company
-        company = get_user_company(db, current_user.id)
         if not company:
             raise HTTPException(status_code=400, detail="Company profile required")
 
         # Get evaluations
-        evaluations = opportunity_service.list_evaluations_for_company(
+        evaluations = await async_opportunity_service.list_evaluations_for_company(
             db,
             company.id,
             skip=skip,
             limit=limit,
             recommendation=recommendation,
-            min_fit_score=min_fit_score
+            min_fit_score=min_fit_score,
+            summary=True,
+            cursor=cursor
         )
 
         # Get total count
-        query = db.query(Evaluation).filter(Evaluation.company_id == company.id)
-        if recommendation:
-            query = query.filter(Evaluation.recommendation == recommendation)
-        if min_fit_score is not None:
-            query = query.filter(Evaluation.fit_score >= min_fit_score)
-        total = query.count()
-
-        # Load opportunities for each evaluation
-        results = []
-        for evaluation in evaluations:
-            eval_with_opp = EvaluationWithOpportunity.from_orm(evaluation)
-            eval_with_opp.opportunity = evaluation.opportunity
-            results.append(eval_with_opp)
+        total = await async_opportunity_service.count_evaluations_for_company(
+            db, company.id, recommendation=recommendation, min_fit_score=min_fit_score
+        )
+
+        # Opportunities were joined with the list-view projection
+        results = [
+            EvaluationWithOpportunitySummary.model_validate(evaluation)
+            for evaluation in evaluations
+        ]
 
         return {
             "evaluations": results,
             "total": total,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor(evaluations, limit, "fit_score")
         }
 
     except HTTPException:
         raise
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing evaluations: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to list evaluations")
@@ -183,22 +273,24 @@ async def list_evaluations(
 async def get_evaluation(
     evaluation_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get a specific evaluation by ID
     """
     try:
-        evaluation = opportunity_service.get_evaluation_by_id(db, evaluation_id)
+        evaluation = await async_opportunity_service.get_evaluation_by_id(
+            db, evaluation_id, with_opportunity=True
+        )
         if not evaluation:
             raise HTTPException(status_code=404, detail="Evaluation not found")
 
         # Verify user owns this evaluation
-        company = get_user_company(db, current_user.id)
         if not company or evaluation.company_id != company.id:
             raise HTTPException(status_code=403, detail="Not authorized")
 
-        # Load opportunity
+        # Opportunity was joined above
         result = EvaluationWithOpportunity.from_orm(evaluation)
         result.opportunity = evaluation.opportunity
 
@@ -216,23 +308,23 @@ async def update_evaluation(
     evaluation_id: str,
     update_data: EvaluationUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Update an evaluation (user interaction: save to pipeline, add notes)
     """
     try:
-        evaluation = opportunity_service.get_evaluation_by_id(db, evaluation_id)
+        evaluation = await async_opportunity_service.get_evaluation_by_id(db, evaluation_id)
         if not evaluation:
             raise HTTPException(status_code=404, detail="Evaluation not found")
 
         # Verify user owns this evaluation
-        company = get_user_company(db, current_user.id)
         if not company or evaluation.company_id != company.id:
             raise HTTPException(status_code=403, detail="Not authorized")
 
         # Update evaluation
-        updated = opportunity_service.update_evaluation(
+        updated = await async_opportunity_service.update_evaluation(
             db, evaluation_id, update_data.dict(exclude_unset=True)
         )
 
@@ -250,65 +342,17 @@ async def update_evaluation(
 @router.get("/stats", response_model=OpportunityStatsResponse)
 async def get_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get opportunity and evaluation statistics for the current user's company
     """
     try:
-        # Get company
-        company = get_user_company(db, current_user.id)
         if not company:
             raise HTTPException(status_code=400, detail="Company profile required")
 
-        # Get total opportunities (matching company's NAICS codes)
-        total_opportunities = db.query(Opportunity).filter(
-            Opportunity.naics_code.in_(company.naics_codes)
-        ).count()
-
-        active_opportunities = db.query(Opportunity).filter(
-            Opportunity.naics_code.in_(company.naics_codes),
-            Opportunity.status == "active"
-        ).count()
-
-        # Get evaluation stats
-        total_evaluations = db.query(Evaluation).filter(
-            Evaluation.company_id == company.id
-        ).count()
-
-        bid_recommendations = db.query(Evaluation).filter(
-            Evaluation.company_id == company.id,
-            Evaluation.recommendation == "BID"
-        ).count()
-
-        no_bid_recommendations = db.query(Evaluation).filter(
-            Evaluation.company_id == company.id,
-            Evaluation.recommendation == "NO_BID"
-        ).count()
-
-        research_recommendations = db.query(Evaluation).filter(
-            Evaluation.company_id == company.id,
-            Evaluation.recommendation == "RESEARCH"
-        ).count()
-
-        # Get averages
-        avg_scores = db.query(
-            func.avg(Evaluation.fit_score).label("avg_fit"),
-            func.avg(Evaluation.win_probability).label("avg_win")
-        ).filter(
-            Evaluation.company_id == company.id
-        ).first()
-
-        return {
-            "total_opportunities": total_opportunities,
-            "active_opportunities": active_opportunities,
-            "total_evaluations": total_evaluations,
-            "bid_recommendations": bid_recommendations,
-            "no_bid_recommendations": no_bid_recommendations,
-            "research_recommendations": research_recommendations,
-            "avg_fit_score": float(avg_scores.avg_fit) if avg_scores.avg_fit else None,
-            "avg_win_probability": float(avg_scores.avg_win) if avg_scores.avg_win else None,
-        }
+        return await async_stats_service.get_company_stats(db, company)
 
     except HTTPException:
         raise
@@ -326,48 +370,51 @@ async def list_pipeline(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     status: Optional[str] = Query(None, regex="^(WATCHING|BIDDING|PASSED|WON|LOST)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (overrides skip)"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     List evaluations saved to pipeline (WATCHING, BIDDING, PASSED, WON, LOST)
+
+    Supports offset (skip/limit) and keyset (cursor/limit) pagination.
     """
     try:
-        # Get company
-        company = get_user_company(db, current_user.id)
         if not company:
             raise HTTPException(status_code=400, detail="Company profile required")
 
-        # Build query
-        query = db.query(Evaluation).filter(
-            Evaluation.company_id == company.id,
-            Evaluation.user_saved.isnot(None)
-        )
-
-        if status:
-            query = query.filter(Evaluation.user_saved == status)
+        total = await async_opportunity_service.count_pipeline_for_company(db, company.id, status)
 
-        total = query.count()
-
-        # Get evaluations with pagination
-        evaluations = query.order_by(Evaluation.updated_at.desc()).offset(skip).limit(limit).all()
+        # Most recently evaluated first, opportunities joined in the same query
+        evaluations = await async_opportunity_service.list_pipeline_for_company(
+            db,
+            company.id,
+            skip=skip,
+            limit=limit,
+            status=status,
+            summary=True,
+            cursor=cursor
+        )
 
-        # Load opportunities for each evaluation
-        results = []
-        for evaluation in evaluations:
-            eval_with_opp = EvaluationWithOpportunity.from_orm(evaluation)
-            eval_with_opp.opportunity = evaluation.opportunity
-            results.append(eval_with_opp)
+        # Opportunities were joined with the list-view projection
+        results = [
+            EvaluationWithOpportunitySummary.model_validate(evaluation)
+            for evaluation in evaluations
+        ]
 
         return {
             "evaluations": results,
             "total": total,
             "skip": skip,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor(evaluations, limit, "evaluated_at")
         }
 
     except HTTPException:
         raise
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing pipeline: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to list pipeline")
@@ -376,54 +423,17 @@ async def list_pipeline(
 @router.get("/pipeline/stats")
 async def get_pipeline_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get pipeline statistics for the current user's company
     """
     try:
-        # Get company
-        company = get_user_company(db, current_user.id)
         if not company:
             raise HTTPException(status_code=400, detail="Company profile required")
 
-        # Count by status
-        watching = db.query(Evaluation).filter(
-            Evaluation.company_id == company.id,
-            Evaluation.user_saved == "WATCHING"
-        ).count()
-
-        bidding = db.query(Evaluation).filter(
-            Evaluation.company_id == company.id,
-            Evaluation.user_saved == "BIDDING"
-        ).count()
-
-        passed = db.query(Evaluation).filter(
-            Evaluation.company_id == company.id,
-            Evaluation.user_saved == "PASSED"
-        ).count()
-
-        won = db.query(Evaluation).filter(
-            Evaluation.company_id == company.id,
-            Evaluation.user_saved == "WON"
-        ).count()
-
-        lost = db.query(Evaluation).filter(
-            Evaluation.company_id == company.id,
-            Evaluation.user_saved == "LOST"
-        ).count()
-
-        total = watching + bidding + passed + won + lost
-
-        return {
-            "total": total,
-            "watching": watching,
-            "bidding": bidding,
-            "passed": passed,
-            "won": won,
-            "lost": lost,
-            "win_rate": round(won / (won + lost) * 100, 1) if (won + lost) > 0 else None
-        }
+        return await async_stats_service.get_pipeline_stats(db, company)
 
     except HTTPException:
         raise
@@ -436,7 +446,8 @@ async def get_pipeline_stats(
 async def evaluate_opportunity_lazy(
     opportunity_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Lazy evaluation: Evaluate an opportunity for the user's company on-demand.
@@ -454,17 +465,15 @@ async def evaluate_opportunity_lazy(
 
     try:
         # Get opportunity
-        opportunity = opportunity_service.get_opportunity_by_id(db, opportunity_id)
+        opportunity = await async_opportunity_service.get_opportunity_by_id(db, opportunity_id)
         if not opportunity:
             raise HTTPException(status_code=404, detail="Opportunity not found")
 
-        # Get company
-        company = get_user_company(db, current_user.id)
         if not company:
             raise HTTPException(status_code=400, detail="Company profile required")
 
         # Check for existing evaluation
-        existing_eval = opportunity_service.get_evaluation_for_opportunity(
+        existing_eval = await async_opportunity_service.get_evaluation_for_opportunity(
             db, opportunity_id, company.id
         )
 
@@ -503,7 +512,7 @@ async def evaluate_opportunity_lazy(
 
         # Cache the match scores
         try:
-            match_scoring_service.compute_and_cache(db, opportunity, company)
+            await async_match_scoring_service.compute_and_cache(db, opportunity, company)
         except Exception as e:
             logger.warning(f"Failed to cache match scores: {e}")
 
@@ -529,7 +538,7 @@ async def evaluate_opportunity_lazy(
                 "company_id": company.id,
                 **eval_result
             }
-            saved_eval = opportunity_service.create_evaluation(db, eval_data)
+            saved_eval = await async_opportunity_service.create_evaluation(db, eval_data)
 
             return {
                 "status": "evaluated",
@@ -574,7 +583,8 @@ async def evaluate_opportunity_lazy(
 async def get_match_score(
     opportunity_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get instant rule-based match score for an opportunity (no AI).
@@ -584,17 +594,15 @@ async def get_match_score(
     """
     try:
         # Get opportunity
-        opportunity = opportunity_service.get_opportunity_by_id(db, opportunity_id)
+        opportunity = await async_opportunity_service.get_opportunity_by_id(db, opportunity_id)
         if not opportunity:
             raise HTTPException(status_code=404, detail="Opportunity not found")
 
-        # Get company
-        company = get_user_company(db, current_user.id)
         if not company:
             raise HTTPException(status_code=400, detail="Company profile required")
 
         # Check cache first
-        cached = match_scoring_service.get_cached_score(db, opportunity_id, str(company.id))
+        cached = await async_match_scoring_service.get_cached_score(db, opportunity_id, str(company.id))
 
         if cached:
             return {
@@ -613,7 +621,7 @@ async def get_match_score(
 
         # Cache for future requests
         try:
-            match_scoring_service.compute_and_cache(db, opportunity, company)
+            await async_match_scoring_service.compute_and_cache(db, opportunity, company)
         except Exception as e:
             logger.warning(f"Failed to cache match scores: {e}")
 
@@ -630,168 +638,52 @@ async def get_match_score(
         raise HTTPException(status_code=500, detail="Failed to compute match score")
 
 
-@router.post("/actions/trigger-discovery")
+@router.post(
+    "/actions/trigger-discovery",
+    response_model=JobEnqueuedResponse,
+    status_code=202
+)
 async def trigger_discovery(
     force_refresh: bool = Query(False, description="Force refresh from SAM.gov even if cache is fresh"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    company: Optional[Company] = Depends(get_current_company),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Manually trigger opportunity discovery and evaluation for user's company.
+    Queue opportunity discovery and evaluation for user's company.
+
+    Returns immediately with a job ID; the job worker runs the SAM.gov search
+    and AI evaluations. Poll GET /jobs/{job_id} for progress (discovered /
+    evaluated counts) and the final result.
 
     Uses smart caching - if opportunities for your NAICS codes were fetched
-    within the last 15 minutes, it will use cached data instead of calling SAM.gov.
+    within the last 15 minutes, the job uses cached data instead of calling
+    SAM.gov. Set force_refresh=true to bypass the cache.
 
-    Set force_refresh=true to bypass the cache.
+    Triggering again while a discovery job for the company is queued or
+    running returns that job (coalesced=true) instead of starting another.
     """
-    from app.services.sam_gov import sam_gov_service
-    from app.services.ai_evaluator import ai_evaluator_service
-
-    try:
-        # Get company
-        company = get_user_company(db, current_user.id)
-        if not company:
-            raise HTTPException(status_code=400, detail="Company profile required")
-
-        if not company.naics_codes:
-            raise HTTPException(status_code=400, detail="Company NAICS codes required")
-
-        # Run discovery directly (async)
-        try:
-            discovered_count = 0
-            evaluated_count = 0
-            from_cache = False
-
-            # Use smart search with caching
-            logger.info(f"Smart search for NAICS codes: {company.naics_codes} (force_refresh={force_refresh})")
-            result = await sam_gov_service.search_opportunities_smart(
-                db=db,
-                naics_codes=company.naics_codes,
-                force_refresh=force_refresh,
-                active=True,
-                limit=50
-            )
-
-            from_cache = result.get("from_cache", False)
-            raw_opportunities = result.get("opportunities", [])
-            cached_opportunities = result.get("cached_opportunities")
-
-            if from_cache:
-                logger.info(f"Using {len(cached_opportunities) if cached_opportunities else 0} cached opportunities")
-            else:
-                logger.info(f"Found {len(raw_opportunities)} opportunities from SAM.gov")
-
-            # Process each opportunity
-            for raw_opp in raw_opportunities:
-                try:
-                    # Parse opportunity data
-                    opp_data = sam_gov_service.parse_opportunity(raw_opp)
-
-                    # Create or update opportunity
-                    opportunity = opportunity_service.create_opportunity(db, opp_data)
-                    discovered_count += 1
-
-                    # Check if company's NAICS codes match this opportunity
-                    logger.info(f"Checking opportunity {opportunity.notice_id}: NAICS={opportunity.naics_code}, Company NAICS={company.naics_codes}")
-                    if opportunity.naics_code and opportunity.naics_code in company.naics_codes:
-                        # Check if already evaluated
-                        existing_eval = opportunity_service.get_evaluation_for_opportunity(
-                            db, opportunity.id, company.id
-                        )
-
-                        if not existing_eval:
-                            # Evaluate this opportunity for this company
-                            try:
-                                eval_result = await ai_evaluator_service.evaluate_opportunity(
-                                    opportunity, company
-                                )
-
-                                # Save evaluation
-                                eval_data = {
-                                    "opportunity_id": opportunity.id,
-                                    "company_id": company.id,
-                                    **eval_result
-                                }
-
-                                opportunity_service.create_evaluation(db, eval_data)
-                                evaluated_count += 1
-
-                                logger.info(
-                                    f"Evaluated opportunity {opportunity.notice_id}: "
-                                    f"{eval_result.get('recommendation')}"
-                                )
-
-                            except Exception as e:
-                                logger.error(f"Error evaluating opportunity {opportunity.notice_id}: {str(e)}")
-                                continue
-
-                except Exception as e:
-                    logger.error(f"Error processing opportunity: {str(e)}")
-                    continue
-
-            # If we got cached data or no new discoveries, evaluate existing unevaluated opportunities
-            opportunities_to_evaluate = []
-
-            if from_cache and cached_opportunities:
-                # Use cached opportunities for evaluation
-                opportunities_to_evaluate = cached_opportunities
-                discovered_count = len(cached_opportunities)
-            elif evaluated_count == 0:
-                # No new evaluations from discovery, check existing opportunities
-                logger.info("No new evaluations from discovery, checking existing opportunities...")
-                opportunities_to_evaluate = opportunity_service.list_opportunities(
-                    db,
-                    skip=0,
-                    limit=100,
-                    active_only=True,
-                    naics_codes=company.naics_codes
-                )
-
-            # Evaluate unevaluated opportunities
-            for opp in opportunities_to_evaluate:
-                existing_eval = opportunity_service.get_evaluation_for_opportunity(
-                    db, opp.id, company.id
-                )
-
-                if not existing_eval:
-                    try:
-                        logger.info(f"Evaluating opportunity: {opp.source_id}")
-                        eval_result = await ai_evaluator_service.evaluate_opportunity(
-                            opp, company
-                        )
-
-                        eval_data = {
-                            "opportunity_id": opp.id,
-                            "company_id": company.id,
-                            **eval_result
-                        }
-
-                        opportunity_service.create_evaluation(db, eval_data)
-                        evaluated_count += 1
-
-                        logger.info(f"Evaluated opportunity {opp.source_id}: {eval_result.get('recommendation')}")
-
-                    except Exception as e:
-                        logger.error(f"Error evaluating opportunity {opp.source_id}: {str(e)}")
-                        continue
-
-            return {
-                "message": "Discovery completed successfully",
-                "discovered": discovered_count,
-                "evaluated": evaluated_count,
-                "from_cache": from_cache,
-                "cache_info": f"Data {'from cache' if from_cache else 'fetched from SAM.gov'}"
-            }
+    if not company:
+        raise HTTPException(status_code=400, detail="Company profile required")
 
-        except Exception as task_error:
-            logger.error(f"Discovery task error: {str(task_error)}")
-            return {
-                "message": "Discovery triggered but encountered errors",
-                "error": str(task_error)
-            }
+    if not company.naics_codes:
+        raise HTTPException(status_code=400, detail="Company NAICS codes required")
 
-    except HTTPException:
-        raise
+    try:
+        job, created = await async_job_service.enqueue(
+            db,
+            COMPANY_DISCOVERY,
+            company_id=company.id,
+            user_id=current_user.id,
+            params={"force_refresh": force_refresh}
+        )
     except Exception as e:
         logger.error(f"Error triggering discovery: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to trigger discovery")
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "coalesced": not created,
+        "message": "Discovery queued" if created else f"Discovery already {job.status}"
+    }
@@ -0,0 +1,92 @@
+"""
+Async database layer (AsyncEngine / AsyncSession) for the FastAPI app.
+
+Services stay written against the synchronous Session API. AsyncService
+exposes a service's methods as coroutines that run the same code through
+AsyncSession.run_sync(): the ORM work executes on the session's async
+connection (asyncpg), so the event loop is free while queries are in flight.
+Scripts and cron jobs keep using app.core.database.SessionLocal.
+
+Sessions are created with expire_on_commit=False so ORM objects returned from
+a service stay readable after it commits (no implicit refresh outside
+run_sync). Relationships must be eager-loaded by the service; lazy loads from
+endpoint code raise MissingGreenlet.
+"""
+from typing import Any, AsyncGenerator, Dict
+import functools
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from .config import settings
+from .db_pool import engine_options
+from .query_counter import install_query_counter
+
+# Sync driver -> asyncio driver for the same database
+ASYNC_DRIVERS: Dict[str, str] = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the asyncio equivalent."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Create async engine
+ASYNC_URL = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_URL,
+    **engine_options(ASYNC_URL, async_driver=True)
+)
+install_query_counter(async_engine.sync_engine)
+
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+# Dependency to get an async DB session
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+class AsyncService:
+    """
+    Awaitable view of a synchronous service.
+
+    Every public method `m(db, *args, **kwargs)` of the wrapped service is
+    available as `await async_service.m(async_db, *args, **kwargs)`, running
+    the original implementation via AsyncSession.run_sync().
+
+    Only wrap DB-bound methods this way: run_sync executes on the event loop,
+    so CPU-heavy or non-DB blocking work inside the method still blocks it.
+    """
+
+    def __init__(self, service: Any):
+        self._service = service
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        method = getattr(self._service, name)
+        if not callable(method):
+            raise AttributeError(name)
+
+        @functools.wraps(method)
+        async def call(db: AsyncSession, *args, **kwargs):
+            return await db.run_sync(method, *args, **kwargs)
+
+        # Cache the wrapper for subsequent lookups
+        setattr(self, name, call)
+        return call
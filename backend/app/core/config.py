@@ -14,6 +14,16 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: str = ""  # Empty = DATABASE_URL with the asyncio driver (asyncpg)
+
+    # Connection pool (per engine, per process)
+    DB_POOL_SIZE: int = 5  # Connections kept open
+    DB_MAX_OVERFLOW: int = 10  # Extra connections allowed under burst load
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 3600  # Reconnect connections older than this (seconds)
+    DB_POOL_PRE_PING: bool = True  # Test each connection on checkout
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # PostgreSQL statement_timeout (0 = server default)
+    DB_PGBOUNCER: bool = False  # Behind PgBouncer transaction pooling: no client pool, no prepared statements
 
     # JWT Authentication
     JWT_SECRET: str
@@ -36,6 +46,41 @@ class Settings(BaseSettings):
     SAM_API_KEY: str = ""
     OPENAI_API_KEY: str = ""
 
+    # SAM.gov fetch engine
+    SAM_MAX_CONCURRENCY: int = 8  # Parallel NAICS requests per batch
+    SAM_RATE_LIMIT_PER_SECOND: float = 4.0  # Sustained request rate
+    SAM_RATE_LIMIT_BURST: int = 10  # Requests allowed back-to-back
+    SAM_DAILY_QUOTA: int = 1000  # Requests per 24h (0 = unlimited)
+    SAM_MAX_RETRIES: int = 4  # Retries per request on 429/5xx/network errors
+    SAM_BACKOFF_MAX_SECONDS: float = 60.0
+    SAM_HTTP2: bool = True
+    SAM_PAGE_SIZE: int = 1000  # Records per request (SAM.gov max is 1000)
+
+    # OpenAI evaluation executor (batch evaluations share these limits per run)
+    OPENAI_MAX_CONCURRENCY: int = 8  # Evaluations in flight at once
+    OPENAI_REQUESTS_PER_MINUTE: int = 500  # Account RPM limit for the model
+    OPENAI_TOKENS_PER_MINUTE: int = 300000  # Account TPM limit (prompt + max_tokens are reserved per call)
+    OPENAI_MAX_RETRIES: int = 4  # Retries per evaluation on 429/5xx/connection errors
+    OPENAI_BACKOFF_MAX_SECONDS: float = 60.0
+
+    # AI response cache (ai_response_cache table, keyed by prompt fingerprint)
+    AI_CACHE_TTL_HOURS: int = 168  # 0 = disabled
+
+    # SAM.gov HTTP response cache (SQLite on disk)
+    SAM_HTTP_CACHE_ENABLED: bool = True
+    SAM_HTTP_CACHE_PATH: str = ""  # Empty = <tmpdir>/govai/sam_http_cache.sqlite3
+    SAM_HTTP_CACHE_TTL_SECONDS: int = 900  # Serve without revalidating for this long
+    SAM_HTTP_CACHE_MAX_MB: int = 256  # LRU-evicted beyond this (compressed size)
+
+    # Authenticated user/company cache (per process, invalidated on ORM updates)
+    AUTH_IDENTITY_CACHE_TTL_SECONDS: int = 30  # 0 = always query
+
+    # Background job worker (scripts/run_job_worker.py)
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0  # Idle wait between queue polls
+    JOB_HEARTBEAT_INTERVAL_SECONDS: int = 60  # Running jobs refresh their heartbeat this often
+    JOB_STALE_AFTER_SECONDS: int = 900  # Running job without a heartbeat this long is recovered
+    JOB_MAX_ATTEMPTS: int = 3  # Attempts per job before it is failed
+
     @field_validator('JWT_SECRET')
     @classmethod
     def validate_jwt_secret(cls, v):
@@ -69,6 +114,9 @@ class Settings(BaseSettings):
         if not self.OPENAI_API_KEY:
             warnings.append("OPENAI_API_KEY not set - AI evaluations will fail")
 
+        if self.DB_PGBOUNCER and self.DB_STATEMENT_TIMEOUT_MS:
+            warnings.append("DB_STATEMENT_TIMEOUT_MS is not sent through PgBouncer - set statement_timeout on the database role")
+
         if self.EMAIL_MODE == 'sendgrid' and not self.SENDGRID_API_KEY:
             warnings.append("EMAIL_MODE is sendgrid but SENDGRID_API_KEY not set")
 
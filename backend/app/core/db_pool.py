@@ -0,0 +1,162 @@
+"""
+Connection pool configuration and metrics shared by the sync and async engines.
+
+engine_options() turns the DB_* settings into create_engine() keyword
+arguments: pool sizing, pre-ping policy, a server-side statement timeout and
+an optional PgBouncer mode (transaction pooling: no client-side pool, no
+named server-side prepared statements).
+
+The pool classes are the stock SQLAlchemy pools with checkout timing added,
+so /health/detailed can report how long requests wait for a connection
+alongside the in-use / idle / overflow gauges.
+"""
+from collections import deque
+from typing import Any, Dict
+import threading
+import time
+import uuid
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from .config import settings
+
+# Checkout waits kept for the percentile gauge
+RECENT_WAITS = 1000
+
+
+class PoolMetrics:
+    """Checkout wait statistics for one pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.failures = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._recent = deque(maxlen=RECENT_WAITS)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            if failed:
+                # Pool timeout or connect error
+                self.failures += 1
+                return
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self._recent.append(seconds)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            recent = sorted(self._recent)
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return {
+            "checkouts": self.checkouts,
+            "checkout_failures": self.failures,
+            "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 2) if self.checkouts else None,
+            "wait_p95_ms": round(p95 * 1000, 2),
+            "wait_max_ms": round(self.wait_max * 1000, 2)
+        }
+
+
+class _TimedCheckout:
+    """Pool mixin timing each checkout (queue wait plus any new connect)."""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.record(time.perf_counter() - started, failed=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+def engine_options(url: str, async_driver: bool = False) -> Dict[str, Any]:
+    """
+    create_engine() / create_async_engine() keyword arguments from settings.
+
+    Args:
+        url: Database URL the engine is created for
+        async_driver: True for the asyncpg engine (affects connect args and pool class)
+
+    Returns:
+        Dict of engine keyword arguments
+    """
+    backend = make_url(url).get_backend_name()
+    options: Dict[str, Any] = {"echo": settings.DEBUG}
+
+    if backend == "sqlite":
+        # SQLite picks its own pool; sizing options don't apply
+        return options
+
+    connect_args: Dict[str, Any] = {}
+
+    if settings.DB_PGBOUNCER:
+        # PgBouncer owns pooling; every checkout is a fresh client connection
+        options["poolclass"] = TimedNullPool
+        if async_driver:
+            # Transaction pooling can't keep named prepared statements
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    else:
+        options.update(
+            poolclass=TimedAsyncAdaptedQueuePool if async_driver else TimedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING
+        )
+
+        # Sent as a startup option, which PgBouncer would reject
+        if backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+            timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+            if async_driver:
+                connect_args["server_settings"] = {"statement_timeout": timeout}
+            else:
+                connect_args["options"] = f"-c statement_timeout={timeout}"
+
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+
+def pool_status(pool: Pool) -> Dict:
+    """In-use / idle / overflow gauges and checkout wait statistics for a pool."""
+    status: Dict[str, Any] = {"class": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            timeout_seconds=pool.timeout()
+        )
+
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
@@ -0,0 +1,103 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Lists are ordered by (sort key DESC NULLS LAST, id DESC). A cursor encodes the
+sort key and id of the last row on a page; the next page is everything after
+that pair, which an index on the same columns answers with a single range
+scan no matter how deep the page is.
+
+The (sort, id) row comparison never matches rows with a NULL sort key, and
+OR-ing "sort IS NULL" into it would stop PostgreSQL from using it as an
+index bound. Rows with a non-NULL key and the trailing NULL block are
+therefore fetched by separate range queries (fetch_after_cursor).
+"""
+from typing import Any, List, Optional, Tuple
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+import base64
+import json
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+        raise InvalidCursor("Unknown cursor value")
+    return value
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    """Opaque cursor pointing just past the row with this (sort value, id)."""
+    raw = json.dumps([_encode_value(sort_value), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, UUID]:
+    """
+    Inverse of encode_cursor().
+
+    Raises:
+        InvalidCursor: Cursor is malformed or was not produced by encode_cursor()
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return _decode_value(sort_value), UUID(row_id)
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        raise InvalidCursor(f"Invalid pagination cursor: {e}") from e
+
+
+def order_by_keyset(query: Query, sort_column, id_column) -> Query:
+    """Apply the stable keyset ordering: sort key DESC NULLS LAST, then id DESC."""
+    return query.order_by(sort_column.desc().nulls_last(), id_column.desc())
+
+
+def fetch_after_cursor(query: Query, sort_column, id_column, cursor: str, limit: int) -> List[Any]:
+    """
+    Fetch up to `limit` rows of an order_by_keyset() query after the cursor.
+
+    Each query it runs is a single index range scan: rows after the cursor
+    with a non-NULL sort key, then - when those run out before `limit` - the
+    start of the NULL block.
+
+    Raises:
+        InvalidCursor: Cursor cannot be decoded
+    """
+    sort_value, row_id = decode_cursor(cursor)
+
+    if sort_value is None:
+        # Already inside the trailing NULL block
+        return query.filter(sort_column.is_(None), id_column < row_id).limit(limit).all()
+
+    rows = query.filter(tuple_(sort_column, id_column) < tuple_(sort_value, row_id)).limit(limit).all()
+    if len(rows) < limit:
+        rows += query.filter(sort_column.is_(None)).limit(limit - len(rows)).all()
+    return rows
+
+
+def next_cursor(items: List[Any], limit: int, sort_attr: str) -> Optional[str]:
+    """Cursor for the page after `items`, or None when this was the last page."""
+    if len(items) < limit or not items:
+        return None
+    last = items[-1]
+    return encode_cursor(getattr(last, sort_attr), last.id)
@@ -0,0 +1,68 @@
+"""
+SQL statement counting.
+
+A cursor-execute listener on the engine counts statements into whichever
+QueryCounter is active in the current context. The API middleware opens one
+per request and reports it in the X-DB-Query-Count response header, so list
+endpoints can be checked for N+1 lazy loads (the count must not grow with
+page size).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+
+class QueryCounter:
+    """Statements executed while this counter was active."""
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.keep_statements = keep_statements
+        self.statements: List[str] = []
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        if self.keep_statements:
+            self.statements.append(statement)
+
+
+# Mutable counter (not a plain int) so statements run in worker threads with a
+# copied context still land in the request's counter
+_active_counter: ContextVar[Optional[QueryCounter]] = ContextVar("active_query_counter", default=None)
+
+
+@contextmanager
+def count_queries(keep_statements: bool = False) -> Iterator[QueryCounter]:
+    """
+    Count SQL statements executed inside the block.
+
+    Args:
+        keep_statements: Also keep the SQL text of each statement
+
+    Yields:
+        QueryCounter; read .count after the block
+    """
+    counter = QueryCounter(keep_statements)
+    token = _active_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _active_counter.reset(token)
+
+
+def install_query_counter(engine: Engine) -> None:
+    """Attach the statement-counting listener to an engine (idempotent)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = _active_counter.get()
+    if counter is not None:
+        counter.record(statement)
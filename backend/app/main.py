@@ -6,6 +6,7 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from app.core.config import settings
 from app.core.database import SessionLocal
+from app.core.query_counter import QUERY_COUNT_HEADER, count_queries
 from app.api.v1 import api_router
 import logging
 
@@ -37,6 +38,15 @@ app.add_middleware(
 )
 
 
+# Report SQL statements per request (keeps list endpoints free of N+1 loads)
+@app.middleware("http")
+async def query_count_middleware(request: Request, call_next):
+    with count_queries() as counter:
+        response = await call_next(request)
+    response.headers[QUERY_COUNT_HEADER] = str(counter.count)
+    return response
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -71,7 +81,8 @@ def health_check():
 def detailed_health_check():
     """
     Detailed health check endpoint.
-    Checks database connectivity.
+    Checks database connectivity and reports connection pool, SAM.gov response
+    cache, identity cache and AI response cache counters.
     """
     health_status = {
         "status": "healthy",
@@ -92,6 +103,35 @@ def detailed_health_check():
         health_status["checks"]["database"] = f"error: {str(e)}"
         health_status["status"] = "degraded"
 
+    # Connection pool gauges and checkout waits
+    from app.core.database import engine
+    from app.core.async_database import async_engine
+    from app.core.db_pool import pool_status
+    health_status["db_pool"] = {
+        "sync": pool_status(engine.pool),
+        "async": pool_status(async_engine.sync_engine.pool)
+    }
+
+    # Upstream response cache counters
+    from app.services.sam_gov import sam_gov_service
+    if sam_gov_service.response_cache:
+        health_status["sam_http_cache"] = sam_gov_service.response_cache.stats()
+
+    from app.services.identity_cache import identity_cache
+    if identity_cache.enabled:
+        health_status["identity_cache"] = identity_cache.stats()
+
+    # AI response cache hit rate and token savings
+    from app.services.ai_cache import ai_response_cache
+    if ai_response_cache.enabled:
+        db = SessionLocal()
+        try:
+            health_status["ai_response_cache"] = ai_response_cache.stats(db)
+        except Exception as e:
+            health_status["ai_response_cache"] = {"error": str(e)}
+        finally:
+            db.close()
+
     return health_status
 
 
@@ -1,15 +1,25 @@
 from .user import User
 from .company import Company
 from .opportunity import Opportunity
+from .opportunity_raw_payload import OpportunityRawPayload
 from .evaluation import Evaluation
 from .discovery_run import DiscoveryRun
 from .company_opportunity_score import CompanyOpportunityScore
+from .company_stats import CompanyStats
+from .job import Job
+from .ai_response_cache import AIResponseCacheEntry
+from .company_score_state import CompanyScoreState
 
 __all__ = [
     "User",
     "Company",
     "Opportunity",
+    "OpportunityRawPayload",
     "Evaluation",
     "DiscoveryRun",
-    "CompanyOpportunityScore"
+    "CompanyOpportunityScore",
+    "CompanyStats",
+    "Job",
+    "AIResponseCacheEntry",
+    "CompanyScoreState"
 ]
@@ -0,0 +1,38 @@
+"""AI response cache model: parsed LLM responses keyed by a prompt fingerprint."""
+from sqlalchemy import Column, String, Integer, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+from app.core.database import Base
+
+
+class AIResponseCacheEntry(Base):
+    """
+    One cached completion.
+
+    The key is a SHA-256 of everything that determines the response (model,
+    system prompt, rendered prompt, temperature, max_tokens), so any change
+    to the opportunity text, company profile or prompt template is a miss.
+    Entries expire after AI_CACHE_TTL_HOURS so model drift is picked up.
+    """
+    __tablename__ = "ai_response_cache"
+
+    key = Column(String(64), primary_key=True)
+    kind = Column(String(20), nullable=False)  # 'company' or 'generic'
+    model = Column(String(100), nullable=False)
+
+    response = Column(JSONB, nullable=False)  # Parsed JSON content, without per-call metadata
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    total_tokens = Column(Integer, nullable=False, default=0)
+
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('ix_ai_response_cache_expires_at', 'expires_at'),
+    )
+
+    def __repr__(self):
+        return f"<AIResponseCacheEntry {self.key[:12]} kind={self.kind} hits={self.hit_count}>"
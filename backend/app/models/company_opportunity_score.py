@@ -1,5 +1,5 @@
 """Company opportunity score model for caching match scores."""
-from sqlalchemy import Column, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, Numeric, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -9,6 +9,13 @@ from app.core.database import Base
 class CompanyOpportunityScore(Base):
     """Cache computed match scores between companies and opportunities."""
     __tablename__ = "company_opportunity_scores"
+    __table_args__ = (
+        # Ranked feed: a company's scores in keyset order are one index range scan
+        Index(
+            "ix_company_opportunity_scores_company_fit",
+            "company_id", text("fit_score DESC NULLS LAST"), text("opportunity_id DESC")
+        ),
+    )
 
     company_id = Column(UUID(as_uuid=True), ForeignKey('companies.id', ondelete='CASCADE'), primary_key=True)
     opportunity_id = Column(UUID(as_uuid=True), ForeignKey('opportunities.id', ondelete='CASCADE'), primary_key=True)
@@ -0,0 +1,32 @@
+"""Company score state model: what the cached match scores of a company were computed from."""
+from sqlalchemy import Column, String, DateTime, ForeignKey, ARRAY, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+class CompanyScoreState(Base):
+    """
+    Refresh bookkeeping for one company's rows in company_opportunity_scores.
+
+    profile_hash fingerprints the profile fields match scoring reads, so an
+    edit to anything else (name, address) does not trigger a rescore.
+    refreshed_at is the start of the last refresh; opportunities updated
+    after it have not been scored for this company yet.
+
+    dirty_scores lists the sub-scores (naics, cert, size, geo) a profile
+    edit invalidated; profile_hash already reflects the edit, and the
+    score_recompute job refreshes just those columns and fit_score.
+    """
+    __tablename__ = "company_score_states"
+
+    company_id = Column(UUID(as_uuid=True), ForeignKey('companies.id', ondelete='CASCADE'), primary_key=True)
+    profile_hash = Column(String(64), nullable=False)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
+    dirty_scores = Column(ARRAY(Text), default=list, nullable=False)
+
+    # Relationships
+    company = relationship("Company")
+
+    def __repr__(self):
+        return f"<CompanyScoreState company={self.company_id} refreshed_at={self.refreshed_at}>"
@@ -0,0 +1,58 @@
+"""Company stats model: per-company dashboard counters kept up to date incrementally."""
+from sqlalchemy import Column, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+
+
+class CompanyStats(Base):
+    """
+    Dashboard counters for one company.
+
+    Maintained by StatsService: evaluation and opportunity writes apply deltas,
+    and a full refresh recomputes the row from the source tables. Averages are
+    kept as sum/count pairs so they can be updated incrementally.
+    """
+    __tablename__ = "company_stats"
+
+    company_id = Column(UUID(as_uuid=True), ForeignKey('companies.id', ondelete='CASCADE'), primary_key=True)
+
+    # Opportunities matching the company's NAICS codes
+    total_opportunities = Column(Integer, nullable=False, default=0)
+    active_opportunities = Column(Integer, nullable=False, default=0)
+
+    # Evaluations by recommendation
+    total_evaluations = Column(Integer, nullable=False, default=0)
+    bid_recommendations = Column(Integer, nullable=False, default=0)
+    no_bid_recommendations = Column(Integer, nullable=False, default=0)
+    research_recommendations = Column(Integer, nullable=False, default=0)
+
+    # Running sums for averages (NULL scores are not counted, like AVG)
+    fit_score_sum = Column(BigInteger, nullable=False, default=0)
+    fit_score_count = Column(Integer, nullable=False, default=0)
+    win_probability_sum = Column(BigInteger, nullable=False, default=0)
+    win_probability_count = Column(Integer, nullable=False, default=0)
+
+    # Pipeline (Evaluation.user_saved) counts
+    pipeline_watching = Column(Integer, nullable=False, default=0)
+    pipeline_bidding = Column(Integer, nullable=False, default=0)
+    pipeline_passed = Column(Integer, nullable=False, default=0)
+    pipeline_won = Column(Integer, nullable=False, default=0)
+    pipeline_lost = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    company = relationship("Company")
+
+    @property
+    def avg_fit_score(self):
+        return self.fit_score_sum / self.fit_score_count if self.fit_score_count else None
+
+    @property
+    def avg_win_probability(self):
+        return self.win_probability_sum / self.win_probability_count if self.win_probability_count else None
+
+    def __repr__(self):
+        return f"<CompanyStats company={self.company_id} evaluations={self.total_evaluations}>"
@@ -30,6 +30,10 @@ class DiscoveryRun(Base):
     opportunities_unchanged = Column(Integer, default=0)
     evaluations_created = Column(Integer, default=0)
 
+    # Fetch engine metrics
+    api_retries = Column(Integer, default=0)
+    naics_stats = Column(JSONB, nullable=True)  # {naics_code: {latency_ms, retries, api_calls, count, error}}
+
     # Errors
     error_message = Column(Text, nullable=True)
     error_details = Column(JSONB, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey, ARRAY
+from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey, ARRAY, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -8,6 +8,11 @@ from app.core.database import Base
 
 class Evaluation(Base):
     __tablename__ = "evaluations"
+    __table_args__ = (
+        # Keyset pagination of evaluation lists and the pipeline
+        Index("ix_evaluations_company_fit_id", "company_id", text("fit_score DESC NULLS LAST"), text("id DESC")),
+        Index("ix_evaluations_company_evaluated_id", "company_id", text("evaluated_at DESC NULLS LAST"), text("id DESC")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -29,6 +34,10 @@ class Evaluation(Base):
     weaknesses = Column(ARRAY(Text), nullable=True)  # List of weaknesses
     executive_summary = Column(Text, nullable=True)  # Brief summary
 
+    # User interaction
+    user_saved = Column(String(20), nullable=True, index=True)  # WATCHING, BIDDING, PASSED, WON, LOST
+    user_notes = Column(Text, nullable=True)
+
     # Timestamp
     evaluated_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=True)
 
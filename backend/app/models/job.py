@@ -0,0 +1,69 @@
+"""Job model: DB-backed queue for work run outside the HTTP request (scripts/run_job_worker.py)."""
+from sqlalchemy import Column, String, Integer, DateTime, Text, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import uuid
+from app.core.database import Base
+
+# Statuses in which a job still holds its (kind, company) slot
+ACTIVE_JOB_STATUSES = ("queued", "running")
+
+
+class Job(Base):
+    """
+    One unit of background work.
+
+    Workers claim queued jobs with SELECT ... FOR UPDATE SKIP LOCKED. At most
+    one queued and one running job exist per (kind, company_id) - enforced by
+    partial unique indexes - so duplicate triggers coalesce onto the same job.
+    A queued job is not claimed while its (kind, company) has a running one.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(50), nullable=False)
+    company_id = Column(UUID(as_uuid=True), ForeignKey('companies.id', ondelete='CASCADE'), nullable=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+
+    status = Column(String(20), nullable=False, default='queued')
+    # Status values: 'queued', 'running', 'succeeded', 'failed'
+
+    params = Column(JSONB, nullable=False, default=dict)
+    progress = Column(JSONB, nullable=False, default=dict)  # Handler-defined counters, e.g. {discovered, evaluated}
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String(100), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    company = relationship("Company")
+
+    __table_args__ = (
+        Index(
+            'uq_jobs_queued_kind_company',
+            'kind', 'company_id',
+            unique=True,
+            postgresql_where=text("status = 'queued'")
+        ),
+        Index(
+            'uq_jobs_running_kind_company',
+            'kind', 'company_id',
+            unique=True,
+            postgresql_where=text("status = 'running'")
+        ),
+        Index('ix_jobs_status_created_at', 'status', 'created_at'),
+    )
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ACTIVE_JOB_STATUSES
+
+    def __repr__(self):
+        return f"<Job {self.id} kind={self.kind} status={self.status}>"
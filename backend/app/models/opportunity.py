@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, DateTime, Text, Numeric, Boolean, Integer
+from sqlalchemy import Column, String, DateTime, Text, Numeric, Boolean, Integer, UniqueConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import query_expression, relationship
 from datetime import datetime
 import uuid
 from app.core.database import Base
@@ -8,6 +8,14 @@ from app.core.database import Base
 
 class Opportunity(Base):
     __tablename__ = "opportunities"
+    __table_args__ = (
+        # Conflict target for the bulk upsert in OpportunityService
+        UniqueConstraint("source", "source_id", name="uq_opportunities_source_source_id"),
+        # Keyset pagination of list_opportunities
+        Index("ix_opportunities_status_posted_id", "status", text("posted_date DESC NULLS LAST"), text("id DESC")),
+        # Changed-since scans of the post-discovery score refresh
+        Index("ix_opportunities_updated_at", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -19,6 +27,8 @@ class Opportunity(Base):
     # Basic information
     title = Column(Text, nullable=False)
     description = Column(Text, nullable=True)
+    # Truncated description, populated only by list queries (with_expression)
+    description_preview = query_expression()
     notice_type = Column(String(50), nullable=True)  # Solicitation, Award, Pre-solicitation
     agency = Column(String(255), nullable=True)  # e.g., "Department of Defense"
     sub_agency = Column(String(255), nullable=True)  # e.g., "Department of the Navy"
@@ -58,8 +68,11 @@ class Opportunity(Base):
     evaluation_status = Column(String(20), nullable=True, index=True, default="pending")  # pending, evaluated, skipped
     generic_evaluation = Column(JSONB, nullable=True)  # AI evaluation results (opportunity quality, complexity, etc.)
 
-    # Raw data from SAM.gov (for debugging/future use)
-    raw_data = Column(JSONB, nullable=True)
+    # NAICS description extracted from the raw SAM.gov record
+    naics_description = Column(String(255), nullable=True)
+
+    # SHA-256 of the normalized content fields, used to skip unchanged upserts
+    content_hash = Column(String(64), nullable=True, index=True)
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=True)
@@ -67,6 +80,30 @@ class Opportunity(Base):
 
     # Relationships
     evaluations = relationship("Evaluation", back_populates="opportunity", cascade="all, delete-orphan")
+    # Raw SAM.gov record lives in a side table and is only loaded on access
+    raw_payload = relationship(
+        "OpportunityRawPayload",
+        back_populates="opportunity",
+        uselist=False,
+        lazy="select",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    @property
+    def raw_data(self):
+        """Raw data from SAM.gov (for debugging/future use), loaded lazily"""
+        return self.raw_payload.data if self.raw_payload else None
+
+    @raw_data.setter
+    def raw_data(self, value):
+        if value is None:
+            self.raw_payload = None
+            return
+        if self.raw_payload is None:
+            from app.models.opportunity_raw_payload import OpportunityRawPayload
+            self.raw_payload = OpportunityRawPayload()
+        self.raw_payload.data = value
 
     # Aliases for backward compatibility with existing code
     @property
@@ -126,12 +163,5 @@ class Opportunity(Base):
     def type(self):
         return self.notice_type
 
-    @property
-    def naics_description(self):
-        """Return NAICS description from raw_data if available"""
-        if self.raw_data and isinstance(self.raw_data, dict):
-            return self.raw_data.get('classificationCode') or self.raw_data.get('naicsDescription')
-        return None
-
     def __repr__(self):
         return f"<Opportunity {self.source_id}: {self.title[:50] if self.title else 'No title'}>"
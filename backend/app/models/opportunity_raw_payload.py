@@ -0,0 +1,46 @@
+"""Raw SAM.gov payloads, kept out of the opportunities table."""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import Any, Optional, Tuple
+import json
+import zlib
+from app.core.database import Base
+
+
+class OpportunityRawPayload(Base):
+    """zlib-compressed JSON of the SAM.gov record an opportunity was parsed from."""
+    __tablename__ = "opportunity_raw_payloads"
+
+    opportunity_id = Column(UUID(as_uuid=True), ForeignKey('opportunities.id', ondelete='CASCADE'), primary_key=True)
+    payload = Column(LargeBinary, nullable=False)  # zlib(JSON)
+    size = Column(Integer, nullable=False)  # Uncompressed bytes
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    opportunity = relationship("Opportunity", back_populates="raw_payload")
+
+    @staticmethod
+    def encode(data: Any) -> Tuple[bytes, int]:
+        """Serialize and compress a raw record. Returns (payload, uncompressed size)."""
+        encoded = json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+        return zlib.compress(encoded), len(encoded)
+
+    @staticmethod
+    def decode(payload: Optional[bytes]) -> Any:
+        """Inverse of encode()."""
+        if payload is None:
+            return None
+        return json.loads(zlib.decompress(payload))
+
+    @property
+    def data(self) -> Any:
+        return self.decode(self.payload)
+
+    @data.setter
+    def data(self, value: Any) -> None:
+        self.payload, self.size = self.encode(value)
+
+    def __repr__(self):
+        return f"<OpportunityRawPayload opp={self.opportunity_id} size={self.size}>"
@@ -13,15 +13,20 @@ from .opportunity import (
     OpportunityCreate,
     OpportunityUpdate,
     OpportunityInDB,
+    OpportunitySummary,
     OpportunityWithEvaluation,
     OpportunityListResponse,
     OpportunityStatsResponse,
+    RankedOpportunity,
+    RankedFeedResponse,
     EvaluationCreate,
     EvaluationUpdate,
     EvaluationInDB,
     EvaluationWithOpportunity,
+    EvaluationWithOpportunitySummary,
     EvaluationListResponse,
 )
+from .job import JobResponse, JobEnqueuedResponse
 
 __all__ = [
     "UserCreate",
@@ -41,12 +46,18 @@ __all__ = [
     "OpportunityCreate",
     "OpportunityUpdate",
     "OpportunityInDB",
+    "OpportunitySummary",
     "OpportunityWithEvaluation",
     "OpportunityListResponse",
     "OpportunityStatsResponse",
+    "RankedOpportunity",
+    "RankedFeedResponse",
     "EvaluationCreate",
     "EvaluationUpdate",
     "EvaluationInDB",
     "EvaluationWithOpportunity",
+    "EvaluationWithOpportunitySummary",
     "EvaluationListResponse",
+    "JobResponse",
+    "JobEnqueuedResponse",
 ]
@@ -0,0 +1,32 @@
+"""
+Pydantic schemas for background jobs
+"""
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any
+from datetime import datetime
+from uuid import UUID
+
+
+class JobResponse(BaseModel):
+    """Status of a background job (GET /jobs/{id})"""
+    id: UUID
+    kind: str
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    progress: Dict[str, Any] = Field(default_factory=dict, description="Handler counters, e.g. discovered/evaluated")
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class JobEnqueuedResponse(BaseModel):
+    """Returned when a job is queued (202 Accepted)"""
+    job_id: UUID
+    status: str
+    coalesced: bool = Field(..., description="True if an already queued/running job was returned")
+    message: str
@@ -1,7 +1,7 @@
 """
 Pydantic schemas for Opportunity and Evaluation models
 """
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import AliasChoices, BaseModel, Field, field_validator, model_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from decimal import Decimal
@@ -88,6 +88,51 @@ class OpportunityInDB(OpportunityBase):
         from_attributes = True
 
 
+class OpportunitySummary(BaseModel):
+    """
+    Slim opportunity schema for list endpoints.
+
+    Reads only the columns in OPPORTUNITY_SUMMARY_COLUMNS so it can be built
+    from load_only() entities without triggering lazy loads.
+    """
+    id: str
+    source: str = "sam.gov"
+    source_id: str
+    solicitation_number: Optional[str] = None
+    title: str
+    description: Optional[str] = Field(
+        None,
+        validation_alias=AliasChoices("description_preview", "description"),
+        description="Description (truncated)"
+    )
+    notice_type: Optional[str] = None
+    agency: Optional[str] = None
+    sub_agency: Optional[str] = None
+    naics_code: Optional[str] = None
+    set_aside_type: Optional[str] = None
+    pop_city: Optional[str] = None
+    pop_state: Optional[str] = None
+    posted_date: Optional[datetime] = None
+    response_deadline: Optional[datetime] = None
+    estimated_value_low: Optional[Decimal] = None
+    estimated_value_high: Optional[Decimal] = None
+    status: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    # Frontend compatibility fields
+    department: Optional[str] = None
+    contract_value: Optional[Decimal] = None
+
+    @field_validator('id', mode='before')
+    @classmethod
+    def convert_uuid_to_str(cls, v: Any) -> Optional[str]:
+        if isinstance(v, UUID):
+            return str(v)
+        return v
+
+    class Config:
+        from_attributes = True
+
+
 class OpportunityWithEvaluation(OpportunityInDB):
     """Schema for opportunity with its evaluation for a company"""
     evaluation: Optional["EvaluationInDB"] = None
@@ -122,6 +167,8 @@ class EvaluationUpdate(BaseModel):
     win_probability: Optional[int] = None
     recommendation: Optional[str] = None
     reasoning: Optional[str] = None
+    user_saved: Optional[str] = Field(None, pattern="^(WATCHING|BIDDING|PASSED|WON|LOST)$", description="Pipeline status")
+    user_notes: Optional[str] = Field(None, description="User notes")
 
 
 class EvaluationInDB(EvaluationBase):
@@ -130,6 +177,8 @@ class EvaluationInDB(EvaluationBase):
     opportunity_id: str
     company_id: str
     evaluated_at: Optional[datetime] = None
+    user_saved: Optional[str] = Field(None, description="Pipeline status")
+    user_notes: Optional[str] = Field(None, description="User notes")
 
     @field_validator('id', 'opportunity_id', 'company_id', mode='before')
     @classmethod
@@ -161,22 +210,56 @@ class EvaluationWithOpportunity(EvaluationInDB):
         from_attributes = True
 
 
+class EvaluationWithOpportunitySummary(EvaluationInDB):
+    """Schema for evaluation list entries with a slim opportunity"""
+    opportunity: OpportunitySummary
+
+    class Config:
+        from_attributes = True
+
+
 # Response schemas
 
 class OpportunityListResponse(BaseModel):
     """Response schema for listing opportunities"""
-    opportunities: List[OpportunityInDB]
+    opportunities: List[OpportunitySummary]
+    total: int
+    skip: int
+    limit: int
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (keyset pagination)")
+
+
+class RankedOpportunity(BaseModel):
+    """Opportunity with its cached match scores for the current company"""
+    opportunity: OpportunitySummary
+    fit_score: Optional[float] = Field(None, description="Weighted match score (0-100)")
+    naics_score: Optional[float] = Field(None, description="NAICS code match (0-100)")
+    cert_score: Optional[float] = Field(None, description="Certification/set-aside match (0-100)")
+    size_score: Optional[float] = Field(None, description="Contract size fit (0-100)")
+    geo_score: Optional[float] = Field(None, description="Geographic fit (0-100)")
+    deadline_score: Optional[float] = Field(None, description="Time to respond (0-100)")
+    computed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class RankedFeedResponse(BaseModel):
+    """Response schema for the fit-ranked opportunity feed"""
+    opportunities: List[RankedOpportunity]
     total: int
     skip: int
     limit: int
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (keyset pagination)")
 
 
 class EvaluationListResponse(BaseModel):
     """Response schema for listing evaluations"""
-    evaluations: List[EvaluationWithOpportunity]
+    evaluations: List[EvaluationWithOpportunitySummary]
     total: int
     skip: int
     limit: int
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (keyset pagination)")
 
 
 class OpportunityStatsResponse(BaseModel):
@@ -0,0 +1,257 @@
+"""
+Persistent cache of AI evaluation responses (ai_response_cache table).
+
+Entries are keyed on a fingerprint of the full request - model, system
+prompt, rendered user prompt, temperature and max_tokens - so a re-evaluation
+of unchanged opportunity text and company profile (a re-upsert that resets
+evaluation_status, two companies with identical profiles) is served from the
+database at zero token cost, and any change to the inputs or prompt template
+is simply a different key. Entries expire after the TTL.
+
+The evaluator is called outside any request session, so each lookup/store
+uses its own short-lived session. The evaluator is async: it calls
+lookup_async()/store_async(), which run the blocking DB work in a worker
+thread so the event loop (API requests, concurrent evaluations) keeps
+running. Hit counters are written by a background thread; a lookup is one
+SELECT. Cache failures are logged and treated as misses; they never fail an
+evaluation.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+import asyncio
+import hashlib
+import json
+import threading
+import logging
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.ai_response_cache import AIResponseCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def _now_utc():
+    """Get current UTC time as timezone-naive datetime for consistency."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class AIResponseCache:
+    """DB-backed TTL cache of parsed LLM responses with hit/token-savings counters."""
+
+    def __init__(self, ttl_seconds: float, session_factory: Callable[[], Session] = SessionLocal):
+        """
+        Args:
+            ttl_seconds: Entry lifetime; 0 disables the cache
+            session_factory: Creates the sessions used for lookups and stores
+        """
+        self.ttl_seconds = ttl_seconds
+        self.session_factory = session_factory
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.tokens_saved = 0
+        self._lock = threading.Lock()
+        self._hit_writer: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        """SHA-256 fingerprint of everything that determines the completion."""
+        payload = json.dumps(
+            [model, system_prompt, prompt, temperature, max_tokens],
+            ensure_ascii=False,
+            separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """
+        Cached response for a key, if present and not expired.
+
+        Args:
+            key: make_key() fingerprint
+
+        Returns:
+            Dict with 'response' (parsed JSON) and 'total_tokens', or None
+        """
+        if not self.enabled:
+            return None
+
+        db = self.session_factory()
+        try:
+            now = _now_utc()
+            entry = db.query(AIResponseCacheEntry.response, AIResponseCacheEntry.total_tokens).filter(
+                AIResponseCacheEntry.key == key,
+                AIResponseCacheEntry.expires_at > now
+            ).first()
+
+            if entry is None:
+                self._count(hit=False)
+                return None
+
+            self._record_hit(key, now)
+            self._count(hit=True, tokens=entry.total_tokens)
+            return {"response": entry.response, "total_tokens": entry.total_tokens}
+        except Exception as e:
+            db.rollback()
+            self._count(error=True)
+            logger.warning(f"AI response cache lookup failed: {e}")
+            return None
+        finally:
+            db.close()
+
+    async def lookup_async(self, key: str) -> Optional[Dict]:
+        """lookup() in a worker thread, for callers on the event loop."""
+        return await asyncio.to_thread(self.lookup, key)
+
+    async def store_async(self, key: str, kind: str, model: str, response: Dict, usage) -> None:
+        """store() in a worker thread, for callers on the event loop."""
+        await asyncio.to_thread(self.store, key, kind, model, response, usage)
+
+    def store(self, key: str, kind: str, model: str, response: Dict, usage) -> None:
+        """
+        Save (or replace) a parsed response.
+
+        Args:
+            key: make_key() fingerprint
+            kind: 'company' or 'generic'
+            model: Model that produced the response
+            response: Parsed JSON content (no per-call metadata)
+            usage: OpenAI usage object (prompt/completion/total tokens)
+        """
+        if not self.enabled:
+            return
+
+        now = _now_utc()
+        values = {
+            "key": key,
+            "kind": kind,
+            "model": model,
+            "response": response,
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+            "total_tokens": getattr(usage, "total_tokens", 0) or 0,
+            "hit_count": 0,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=self.ttl_seconds),
+            "last_hit_at": None,
+        }
+
+        db = self.session_factory()
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                # Concurrent misses on the same key: last writer wins
+                stmt = pg_insert(AIResponseCacheEntry.__table__).values(values)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["key"],
+                    set_={column: stmt.excluded[column] for column in values if column != "key"}
+                )
+                db.execute(stmt)
+            else:
+                db.merge(AIResponseCacheEntry(**values))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._count(error=True)
+            logger.warning(f"AI response cache store failed: {e}")
+        finally:
+            db.close()
+
+    def purge_expired(self, db: Session) -> int:
+        """
+        Delete expired entries.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of entries deleted
+        """
+        deleted = db.query(AIResponseCacheEntry).filter(
+            AIResponseCacheEntry.expires_at <= _now_utc()
+        ).delete(synchronize_session=False)
+        db.commit()
+
+        logger.info(f"Purged {deleted} expired AI response cache entries")
+        return deleted
+
+    def _record_hit(self, key: str, now: datetime) -> None:
+        """Queue the entry's hit counter update; lookups don't wait for it."""
+        with self._lock:
+            if self._hit_writer is None:
+                self._hit_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-cache-hits")
+        self._hit_writer.submit(self._write_hit, key, now)
+
+    def _write_hit(self, key: str, now: datetime) -> None:
+        db = self.session_factory()
+        try:
+            db.query(AIResponseCacheEntry).filter(AIResponseCacheEntry.key == key).update(
+                {
+                    AIResponseCacheEntry.hit_count: AIResponseCacheEntry.hit_count + 1,
+                    AIResponseCacheEntry.last_hit_at: now
+                },
+                synchronize_session=False
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"AI response cache hit update failed: {e}")
+        finally:
+            db.close()
+
+    def _count(self, hit: bool = False, tokens: int = 0, error: bool = False) -> None:
+        with self._lock:
+            if error:
+                self.errors += 1
+            elif hit:
+                self.hits += 1
+                self.tokens_saved += tokens
+            else:
+                self.misses += 1
+
+    def stats(self, db: Optional[Session] = None) -> Dict:
+        """
+        Hit rate and token savings.
+
+        'process' counts lookups made by this process since start; 'stored'
+        aggregates the table (every hit across all processes, lifetime of
+        the live entries) when a session is given.
+        """
+        lookups = self.hits + self.misses
+        stats = {
+            "ttl_seconds": self.ttl_seconds,
+            "process": {
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "tokens_saved": self.tokens_saved,
+            }
+        }
+
+        if db is not None:
+            entries, hits, tokens_saved = db.query(
+                func.count(),
+                func.coalesce(func.sum(AIResponseCacheEntry.hit_count), 0),
+                func.coalesce(func.sum(AIResponseCacheEntry.hit_count * AIResponseCacheEntry.total_tokens), 0)
+            ).one()
+            stats["stored"] = {
+                "entries": entries,
+                "hits": int(hits),
+                "tokens_saved": int(tokens_saved),
+            }
+
+        return stats
+
+
+# Singleton instance
+ai_response_cache = AIResponseCache(ttl_seconds=settings.AI_CACHE_TTL_HOURS * 3600)
@@ -1,11 +1,20 @@
 """
 AI-powered opportunity evaluation service using OpenAI GPT-4
+
+Completions are cached in the ai_response_cache table keyed by a fingerprint
+of the full request, so unchanged inputs are never sent to OpenAI twice.
+
+Free-text prompt sections (description, capabilities statement) are cleaned
+and cut to token budgets (app.services.prompt_budget), and max_tokens is
+sized to the prompt.
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from openai import AsyncOpenAI
 from app.core.config import settings
 from app.models.opportunity import Opportunity
 from app.models.company import Company
+from app.services.ai_cache import ai_response_cache
+from app.services.prompt_budget import budget_section, completion_budget, token_counter
 import logging
 import json
 import time
@@ -13,6 +22,27 @@ import time
 logger = logging.getLogger(__name__)
 
 
+# Lower temperature for more consistent evaluations
+EVALUATION_TEMPERATURE = 0.3
+
+# Completion budget ceilings per company / generic evaluation
+EVALUATION_MAX_TOKENS = 2000
+GENERIC_EVALUATION_MAX_TOKENS = 1500
+
+# Completion budget = base + ratio * prompt tokens, capped at the ceiling.
+# A full company evaluation (skeleton, reasoning, 4-6 items per list) measures
+# 500-900 tokens; its lists grow with the requirements in the description.
+EVALUATION_COMPLETION_BASE = 700
+EVALUATION_COMPLETION_RATIO = 0.25
+GENERIC_COMPLETION_BASE = 600
+GENERIC_COMPLETION_RATIO = 0.2
+
+# Token budgets for free-text prompt sections
+DESCRIPTION_TOKEN_BUDGET = 1200
+CAPABILITIES_TOKEN_BUDGET = 500
+GENERIC_DESCRIPTION_TOKEN_BUDGET = 1000
+
+
 class AIEvaluatorService:
     """Service for evaluating opportunities using AI"""
 
@@ -27,14 +57,20 @@ class AIEvaluatorService:
     async def evaluate_opportunity(
         self,
         opportunity: Opportunity,
-        company: Company
+        company: Company,
+        cache_checked: bool = False
     ) -> Dict:
         """
         Evaluate an opportunity for a company using AI
 
+        Served from the response cache when the same prompt was answered
+        before (tokens_used is then 0 and cache_hit is True).
+
         Args:
             opportunity: The opportunity to evaluate
             company: The company profile
+            cache_checked: The caller already missed in the cache (see
+                cached_evaluation); skip the lookup but still store the result
 
         Returns:
             Dict with evaluation results (fit_score, win_probability, recommendation, etc.)
@@ -43,41 +79,30 @@ class AIEvaluatorService:
 
         try:
             # Build the evaluation prompt
-            prompt = self._build_evaluation_prompt(opportunity, company)
-
-            # Call OpenAI API
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt()
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,  # Lower temperature for more consistent evaluations
-                max_tokens=2000,
-                response_format={"type": "json_object"}  # Force JSON response
+            system_prompt, prompt, max_tokens = self._evaluation_request(opportunity, company)
+
+            evaluation_data, tokens_used, cache_hit = await self._complete_json(
+                "company",
+                system_prompt,
+                prompt,
+                max_tokens,
+                ceiling=EVALUATION_MAX_TOKENS,
+                lookup=not cache_checked
             )
 
-            # Parse response
-            content = response.choices[0].message.content
-            evaluation_data = json.loads(content)
-
             # Calculate evaluation time
             evaluation_time = time.time() - start_time
 
             # Add metadata
             evaluation_data["model_version"] = self.model
-            evaluation_data["tokens_used"] = response.usage.total_tokens
+            evaluation_data["tokens_used"] = tokens_used
+            evaluation_data["cache_hit"] = cache_hit
             evaluation_data["evaluation_time_seconds"] = round(evaluation_time, 2)
 
             logger.info(
                 f"Evaluated opportunity {opportunity.notice_id} for company {company.id}: "
                 f"{evaluation_data.get('recommendation')} (fit: {evaluation_data.get('fit_score')}%)"
+                f"{' [cached]' if cache_hit else ''}"
             )
 
             return evaluation_data
@@ -89,6 +114,135 @@ class AIEvaluatorService:
             logger.error(f"Error evaluating opportunity: {str(e)}")
             raise
 
+    async def cached_evaluation(self, opportunity: Opportunity, company: Company) -> Optional[Dict]:
+        """
+        Company evaluation from the response cache only (no API call)
+
+        Lets batch callers serve hits before taking rate-limit capacity.
+
+        Returns:
+            Evaluation dict as from evaluate_opportunity, or None on a miss
+        """
+        cached = await ai_response_cache.lookup_async(self._cache_key(*self._evaluation_request(opportunity, company)))
+        if cached is None:
+            return None
+
+        evaluation_data = dict(cached["response"])
+        evaluation_data["model_version"] = self.model
+        evaluation_data["tokens_used"] = 0
+        evaluation_data["cache_hit"] = True
+        evaluation_data["evaluation_time_seconds"] = 0.0
+        return evaluation_data
+
+    def _cache_key(self, system_prompt: str, prompt: str, max_tokens: int) -> str:
+        return ai_response_cache.make_key(self.model, system_prompt, prompt, EVALUATION_TEMPERATURE, max_tokens)
+
+    def _evaluation_request(self, opportunity: Opportunity, company: Company) -> Tuple[str, str, int]:
+        """System prompt, user prompt and completion budget for a company evaluation"""
+        system_prompt = self._get_system_prompt()
+        prompt = self._build_evaluation_prompt(opportunity, company)
+        max_tokens = completion_budget(
+            self.count_tokens(system_prompt) + self.count_tokens(prompt),
+            EVALUATION_COMPLETION_BASE,
+            EVALUATION_COMPLETION_RATIO,
+            EVALUATION_MAX_TOKENS
+        )
+        return system_prompt, prompt, max_tokens
+
+    def _generic_request(self, opportunity: Opportunity) -> Tuple[str, str, int]:
+        """System prompt, user prompt and completion budget for a generic evaluation"""
+        system_prompt = self._get_generic_system_prompt()
+        prompt = self._build_generic_evaluation_prompt(opportunity)
+        max_tokens = completion_budget(
+            self.count_tokens(system_prompt) + self.count_tokens(prompt),
+            GENERIC_COMPLETION_BASE,
+            GENERIC_COMPLETION_RATIO,
+            GENERIC_EVALUATION_MAX_TOKENS
+        )
+        return system_prompt, prompt, max_tokens
+
+    def count_tokens(self, text: str) -> int:
+        """Tokens in `text` for this service's model (local tokenizer, no API call)"""
+        return token_counter(self.model).count(text)
+
+    async def _complete_json(
+        self,
+        kind: str,
+        system_prompt: str,
+        prompt: str,
+        max_tokens: int,
+        ceiling: Optional[int] = None,
+        lookup: bool = True
+    ) -> Tuple[Dict, int, bool]:
+        """
+        JSON-mode chat completion through the response cache.
+
+        Args:
+            kind: Cache entry kind ('company' or 'generic')
+            system_prompt: System message
+            prompt: User message
+            max_tokens: Completion budget (part of the cache key)
+            ceiling: Budget for one retry if the response is cut off at max_tokens
+            lookup: Check the cache before calling the API
+
+        Returns:
+            Tuple of (parsed JSON, tokens spent, served from cache)
+
+        Raises:
+            json.JSONDecodeError: Model returned invalid JSON (not cached)
+        """
+        key = self._cache_key(system_prompt, prompt, max_tokens)
+
+        if lookup:
+            cached = await ai_response_cache.lookup_async(key)
+            if cached is not None:
+                return dict(cached["response"]), 0, True
+
+        # Call OpenAI API
+        response = await self._create_completion(system_prompt, prompt, max_tokens)
+        tokens_used = response.usage.total_tokens
+
+        # Truncated JSON won't parse; retry once with the full budget
+        if response.choices[0].finish_reason == "length" and ceiling and ceiling > max_tokens:
+            logger.warning(f"{kind} evaluation hit max_tokens={max_tokens}, retrying with {ceiling}")
+            response = await self._create_completion(system_prompt, prompt, ceiling)
+            tokens_used += response.usage.total_tokens
+
+        # Parse response
+        content = response.choices[0].message.content
+        data = json.loads(content)
+
+        await ai_response_cache.store_async(key, kind, self.model, data, response.usage)
+        return dict(data), tokens_used, False
+
+    async def _create_completion(self, system_prompt: str, prompt: str, max_tokens: int):
+        return await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=EVALUATION_TEMPERATURE,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}  # Force JSON response
+        )
+
+    def estimate_tokens(self, opportunity: Opportunity, company: Company) -> int:
+        """
+        Tokens evaluate_opportunity() may consume, as counted by OpenAI rate limits
+
+        OpenAI reserves prompt tokens plus max_tokens against the
+        tokens-per-minute limit when a request is accepted.
+        """
+        system_prompt, prompt, max_tokens = self._evaluation_request(opportunity, company)
+        return self.count_tokens(system_prompt) + self.count_tokens(prompt) + max_tokens
+
     def _get_system_prompt(self) -> str:
         """Get the system prompt for the AI evaluator"""
         return """You are an expert government contracting advisor helping small businesses evaluate opportunities.
@@ -161,13 +315,19 @@ Recommendation guidelines:
         else:
             company_value_range = "Not specified"
 
+        counter = token_counter(self.model)
+        description = budget_section(counter, opportunity.description, DESCRIPTION_TOKEN_BUDGET, "Not provided")
+        capabilities = budget_section(
+            counter, company.capabilities, CAPABILITIES_TOKEN_BUDGET, "No capabilities statement provided"
+        )
+
         # Build the prompt
         prompt = f"""Please evaluate this government contracting opportunity for my company.
 
 OPPORTUNITY DETAILS:
 - Notice ID: {opportunity.notice_id}
 - Title: {opportunity.title}
-- Description: {opportunity.description or 'Not provided'}
+- Description: {description}
 - Department: {opportunity.department or 'Unknown'}
 - Office: {opportunity.office or 'Unknown'}
 - NAICS Code: {opportunity.naics_code} - {opportunity.naics_description or 'Unknown'}
@@ -184,7 +344,7 @@ COMPANY PROFILE:
 - Geographic Preferences: {company_geography}
 - Contract Value Range: {company_value_range}
 - Capabilities Statement:
-{company.capabilities or 'No capabilities statement provided'}
+{capabilities}
 
 Please provide your evaluation in the specified JSON format."""
 
@@ -207,33 +367,22 @@ Please provide your evaluation in the specified JSON format."""
         start_time = time.time()
 
         try:
-            prompt = self._build_generic_evaluation_prompt(opportunity)
-
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_generic_system_prompt()
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=1500,
-                response_format={"type": "json_object"}
+            system_prompt, prompt, max_tokens = self._generic_request(opportunity)
+
+            evaluation_data, tokens_used, cache_hit = await self._complete_json(
+                "generic",
+                system_prompt,
+                prompt,
+                max_tokens,
+                ceiling=GENERIC_EVALUATION_MAX_TOKENS
             )
 
-            content = response.choices[0].message.content
-            evaluation_data = json.loads(content)
-
             evaluation_time = time.time() - start_time
 
             # Add metadata
             evaluation_data["model_version"] = self.model
-            evaluation_data["tokens_used"] = response.usage.total_tokens
+            evaluation_data["tokens_used"] = tokens_used
+            evaluation_data["cache_hit"] = cache_hit
             evaluation_data["evaluation_time_seconds"] = round(evaluation_time, 2)
             evaluation_data["evaluated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
@@ -288,10 +437,9 @@ Quality scoring:
 
     def _build_generic_evaluation_prompt(self, opportunity: Opportunity) -> str:
         """Build prompt for generic opportunity evaluation"""
-        description = opportunity.description or 'Not provided'
-        # Truncate very long descriptions
-        if len(description) > 3000:
-            description = description[:3000] + "... [truncated]"
+        description = budget_section(
+            token_counter(self.model), opportunity.description, GENERIC_DESCRIPTION_TOKEN_BUDGET, "Not provided"
+        )
 
         return f"""Please evaluate this government contracting opportunity.
 
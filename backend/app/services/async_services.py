@@ -0,0 +1,21 @@
+"""
+Awaitable variants of the DB-bound services for AsyncSession callers.
+
+Each wraps the synchronous singleton with AsyncService, so
+`await async_opportunity_service.list_opportunities(db, ...)` runs
+OpportunityService.list_opportunities on the AsyncSession via run_sync().
+Auth functions that hash passwords or send email are CPU/network-bound and
+stay on the sync Session in threadpool endpoints instead.
+"""
+from app.core.async_database import AsyncService
+from app.services import company as company_service
+from app.services.jobs import job_service
+from app.services.match_scoring import match_scoring_service
+from app.services.opportunity import opportunity_service
+from app.services.stats import stats_service
+
+async_opportunity_service = AsyncService(opportunity_service)
+async_match_scoring_service = AsyncService(match_scoring_service)
+async_stats_service = AsyncService(stats_service)
+async_company_service = AsyncService(company_service)
+async_job_service = AsyncService(job_service)
@@ -4,6 +4,9 @@ from fastapi import HTTPException, status
 from app.models.company import Company
 from app.models.user import User
 from app.schemas.company import CompanyCreate, CompanyUpdate
+from app.services.jobs import SCORE_RECOMPUTE, job_service
+from app.services.score_refresh import score_refresh_service, scoring_profile
+from app.services.stats import stats_service
 
 
 def get_company_by_id(db: Session, company_id: str) -> Optional[Company]:
@@ -83,12 +86,25 @@ def update_company(db: Session, company_id: str, company_data: CompanyUpdate, us
 
     # Update fields (only update provided fields)
     update_data = company_data.dict(exclude_unset=True)
+    naics_changed = 'naics_codes' in update_data and update_data['naics_codes'] != company.naics_codes
+    profile_before = scoring_profile(company)
     for field, value in update_data.items():
         setattr(company, field, value)
 
+    # Opportunity counters depend on the NAICS codes
+    if naics_changed:
+        stats_service.refresh_company(db, company)
+
+    # Cached match scores: only the sub-scores of the changed fields go stale
+    dirty_scores = score_refresh_service.invalidate(db, company, profile_before)
+
     db.commit()
     db.refresh(company)
 
+    if dirty_scores:
+        # A running recompute may have read dirty_scores already: queue a follow-up
+        job_service.enqueue(db, SCORE_RECOMPUTE, company_id=company.id, user_id=user_id, coalesce_running=False)
+
     return company
 
 
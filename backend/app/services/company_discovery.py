@@ -0,0 +1,133 @@
+"""
+On-demand discovery and evaluation for one company (the trigger-discovery job).
+
+Runs in the job worker, not the API: a SAM.gov smart search for the company's
+NAICS codes (served from the database when fresh), one batch upsert of the
+fetched records, match scores of the records it wrote for this company
+(other companies get them at the scheduled refresh), then
+concurrent AI evaluation (EvaluationExecutor) of matching opportunities the
+company has no evaluation for yet, saved in one batch.
+Progress counters are written to the job row as it goes.
+"""
+from typing import Callable, Dict, Optional
+from sqlalchemy.orm import Session
+from app.models.company import Company
+from app.services.evaluation_executor import EvaluationExecutor, EvaluationOutcome
+from app.services.opportunity import opportunity_service
+from app.services.sam_gov import sam_gov_service
+from app.services.score_refresh import score_refresh_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+# SAM.gov records requested per NAICS code
+SEARCH_LIMIT = 50
+
+# Cap on AI evaluations per run (cost control)
+MAX_EVALUATIONS = 100
+
+# progress(**counters) - persists counters for GET /jobs/{id}
+ProgressCallback = Callable[..., None]
+
+
+class CompanyDiscoveryService:
+    """Discover and evaluate opportunities for a single company."""
+
+    async def run(
+        self,
+        db: Session,
+        company: Company,
+        force_refresh: bool = False,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict:
+        """
+        Fetch opportunities for the company's NAICS codes and evaluate new matches.
+
+        Args:
+            db: Database session
+            company: Company to discover for (must have NAICS codes)
+            force_refresh: Bypass the 15-minute opportunity cache
+            progress: Called with updated counters after each step
+
+        Returns:
+            Dict with discovered, evaluated, evaluation_errors, ai_cache_hits,
+            scores_written, from_cache and upsert counts
+        """
+        report = progress or (lambda **counters: None)
+        counters = {"stage": "fetching", "discovered": 0, "evaluated": 0, "evaluation_errors": 0}
+        report(**counters)
+
+        logger.info(f"Smart search for NAICS codes: {company.naics_codes} (force_refresh={force_refresh})")
+        result = await sam_gov_service.search_opportunities_smart(
+            db=db,
+            naics_codes=company.naics_codes,
+            force_refresh=force_refresh,
+            active=True,
+            limit=SEARCH_LIMIT
+        )
+
+        from_cache = result.get("from_cache", False)
+        upsert = None
+
+        if from_cache:
+            cached = result.get("cached_opportunities") or []
+            counters["discovered"] = len(cached)
+            logger.info(f"Using {len(cached)} cached opportunities")
+        else:
+            raw_opportunities = result.get("opportunities", [])
+            logger.info(f"Found {len(raw_opportunities)} opportunities from SAM.gov")
+
+            # One upsert (single commit) for the whole result set
+            rows, parse_errors = sam_gov_service.parse_page(raw_opportunities)
+            upsert = opportunity_service.upsert_opportunities_batch(db, rows)
+            upsert.errors += parse_errors
+            counters["discovered"] = len(raw_opportunities)
+
+        # This company's scores for what the run wrote; the scheduled
+        # discovery refreshes every other company
+        scores = score_refresh_service.score_opportunities(
+            db, company, upsert.written_ids if upsert else []
+        )
+
+        # Evaluate active, open matches this company hasn't seen - covers both
+        # freshly upserted records and earlier discoveries
+        to_evaluate = opportunity_service.get_opportunities_needing_evaluation(
+            db, company.id, limit=MAX_EVALUATIONS
+        )
+        counters.update(stage="evaluating", to_evaluate=len(to_evaluate))
+        report(**counters)
+
+        counters["cache_hits"] = 0
+
+        def on_result(outcome: EvaluationOutcome) -> None:
+            counters["evaluated" if outcome.ok else "evaluation_errors"] += 1
+            if outcome.ok and outcome.result.get("cache_hit"):
+                counters["cache_hits"] += 1
+            report(**counters)
+
+        outcomes = await EvaluationExecutor().evaluate_many(
+            [(opportunity, company) for opportunity in to_evaluate],
+            on_result=on_result
+        )
+
+        # One transaction for all results
+        opportunity_service.create_evaluations_batch(
+            db, [outcome.to_evaluation_data() for outcome in outcomes if outcome.ok]
+        )
+
+        counters["stage"] = "done"
+        report(**counters)
+
+        return {
+            "discovered": counters["discovered"],
+            "evaluated": counters["evaluated"],
+            "evaluation_errors": counters["evaluation_errors"],
+            "ai_cache_hits": counters["cache_hits"],
+            "scores_written": scores["scores_written"],
+            "from_cache": from_cache,
+            "upsert": upsert.to_dict() if upsert else None
+        }
+
+
+# Singleton instance
+company_discovery_service = CompanyDiscoveryService()
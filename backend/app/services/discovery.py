@@ -77,6 +77,8 @@ class DiscoveryService:
         run.opportunities_updated = results.get('updated', 0)
         run.opportunities_unchanged = results.get('unchanged', 0)
         run.evaluations_created = results.get('evaluations', 0)
+        run.api_retries = results.get('retries', 0)
+        run.naics_stats = results.get('naics_stats')
         db.commit()
         logger.info(
             f"Completed discovery run {run.id}: "
@@ -142,6 +144,8 @@ class DiscoveryService:
         run.opportunities_new = results.get('new', 0)
         run.opportunities_updated = results.get('updated', 0)
         run.opportunities_unchanged = results.get('unchanged', 0)
+        run.api_retries = results.get('retries', 0)
+        run.naics_stats = results.get('naics_stats')
         run.error_message = error
         db.commit()
         logger.warning(f"Partial discovery run {run.id}: {error}")
@@ -163,6 +167,31 @@ class DiscoveryService:
             DiscoveryRun.completed_at.desc()
         ).first()
 
+    def get_api_calls_since(self, db: Session, since: datetime) -> int:
+        """
+        Get the number of SAM.gov API calls made by runs started since a time.
+
+        Used to seed the daily quota of the fetch engine's rate limiter.
+
+        Args:
+            db: Database session
+            since: Only count runs started at or after this time
+
+        Returns:
+            Total API calls made
+        """
+        from sqlalchemy import func
+
+        if since.tzinfo:
+            since = since.replace(tzinfo=None)
+
+        total = db.query(
+            func.coalesce(func.sum(DiscoveryRun.api_calls_made), 0)
+        ).filter(
+            DiscoveryRun.started_at >= since
+        ).scalar()
+        return int(total or 0)
+
     def get_last_run(self, db: Session) -> Optional[DiscoveryRun]:
         """
         Get the most recent discovery run (any status).
@@ -0,0 +1,177 @@
+"""
+Concurrent AI evaluation of many (opportunity, company) pairs.
+
+EvaluationExecutor runs ai_evaluator_service.evaluate_opportunity for a batch
+with a bounded number of calls in flight, so a batch takes about as long as
+its slowest few calls instead of the sum of all of them. Two token buckets
+keep the batch inside the account's OpenAI limits: one for requests per
+minute and one for tokens per minute (prompt estimate plus max_tokens, which
+is what OpenAI reserves per request). 429s pause both buckets for every
+worker; 429/5xx/connection errors are retried with exponential backoff and
+jitter. Pairs already in the AI response cache are answered before taking
+any rate-limit capacity.
+
+The executor does not save evaluations; callers persist the results in one
+batch (OpportunityService.create_evaluations_batch). Create an executor per
+run, inside the event loop that awaits it.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import random
+import time
+import logging
+
+import openai
+
+from app.core.config import settings
+from app.models.company import Company
+from app.models.opportunity import Opportunity
+from app.services.ai_evaluator import ai_evaluator_service
+from app.services.rate_limiter import TokenBucketLimiter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EvaluationOutcome:
+    """Result (or final error) of evaluating one opportunity for one company."""
+    opportunity: Opportunity
+    company: Company
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.result is not None
+
+    def to_evaluation_data(self) -> Dict:
+        """Fields for OpportunityService.create_evaluations_batch"""
+        return {
+            "opportunity_id": self.opportunity.id,
+            "company_id": self.company.id,
+            **self.result
+        }
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, openai.RateLimitError):
+        # Billing quota errors are also 429s but won't clear by waiting
+        return getattr(error, "code", None) != "insufficient_quota"
+    return isinstance(error, (openai.APIConnectionError, openai.InternalServerError))
+
+
+class EvaluationExecutor:
+    """Bounded-concurrency, rate-limited runner for company evaluations."""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        evaluator=None
+    ):
+        """
+        Args:
+            max_concurrency: Evaluations in flight (default OPENAI_MAX_CONCURRENCY)
+            requests_per_minute: RPM limit (default OPENAI_REQUESTS_PER_MINUTE)
+            tokens_per_minute: TPM limit (default OPENAI_TOKENS_PER_MINUTE)
+            max_retries: Retries per evaluation (default OPENAI_MAX_RETRIES)
+            evaluator: Service providing evaluate_opportunity, cached_evaluation
+                and estimate_tokens
+        """
+        rpm = requests_per_minute or settings.OPENAI_REQUESTS_PER_MINUTE
+        tpm = tokens_per_minute or settings.OPENAI_TOKENS_PER_MINUTE
+
+        self.evaluator = evaluator or ai_evaluator_service
+        self.max_retries = settings.OPENAI_MAX_RETRIES if max_retries is None else max_retries
+        self._semaphore = asyncio.Semaphore(max_concurrency or settings.OPENAI_MAX_CONCURRENCY)
+        # Buckets hold one minute's allowance, refilled continuously
+        self._requests = TokenBucketLimiter(rate=rpm / 60, burst=rpm)
+        self._tokens = TokenBucketLimiter(rate=tpm / 60, burst=tpm)
+
+    async def evaluate_many(
+        self,
+        pairs: Iterable[Tuple[Opportunity, Company]],
+        on_result: Optional[Callable[[EvaluationOutcome], None]] = None
+    ) -> List[EvaluationOutcome]:
+        """
+        Evaluate every (opportunity, company) pair concurrently.
+
+        Args:
+            pairs: Opportunities with the company to evaluate each for
+            on_result: Called with each outcome as it completes (progress reporting)
+
+        Returns:
+            EvaluationOutcome per pair, in input order; failures carry `error`
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return []
+
+        started = time.monotonic()
+
+        async def run(opportunity: Opportunity, company: Company) -> EvaluationOutcome:
+            outcome = await self._evaluate_one(opportunity, company)
+            if on_result:
+                on_result(outcome)
+            return outcome
+
+        outcomes = await asyncio.gather(*(run(opportunity, company) for opportunity, company in pairs))
+
+        failed = sum(1 for outcome in outcomes if not outcome.ok)
+        logger.info(
+            f"Evaluated {len(outcomes) - failed}/{len(outcomes)} opportunities "
+            f"in {time.monotonic() - started:.1f}s ({failed} failed)"
+        )
+        return outcomes
+
+    async def _evaluate_one(self, opportunity: Opportunity, company: Company) -> EvaluationOutcome:
+        outcome = EvaluationOutcome(opportunity=opportunity, company=company)
+
+        # Response cache hits cost no API capacity
+        outcome.result = await self.evaluator.cached_evaluation(opportunity, company)
+        if outcome.result is not None:
+            return outcome
+
+        estimated_tokens = self.evaluator.estimate_tokens(opportunity, company)
+
+        async with self._semaphore:
+            while True:
+                await self._requests.acquire()
+                await self._tokens.acquire(estimated_tokens)
+                outcome.attempts += 1
+
+                try:
+                    outcome.result = await self.evaluator.evaluate_opportunity(
+                        opportunity, company, cache_checked=True
+                    )
+                    return outcome
+                except Exception as e:
+                    if not _is_retryable(e) or outcome.attempts > self.max_retries:
+                        outcome.error = str(e)
+                        logger.error(f"Error evaluating opportunity {opportunity.id} for company {company.id}: {e}")
+                        return outcome
+
+                    delay = self._backoff_delay(outcome.attempts - 1, e)
+                    if isinstance(e, openai.RateLimitError):
+                        self._requests.pause(delay)
+                        self._tokens.pause(delay)
+                    logger.warning(f"OpenAI {type(e).__name__} for opportunity {opportunity.id}, retrying in {delay:.1f}s")
+
+                await asyncio.sleep(delay)
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Seconds to wait before retry `attempt`, honouring Retry-After if present."""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), settings.OPENAI_BACKOFF_MAX_SECONDS)
+            except ValueError:
+                pass
+
+        delay = min(2 ** attempt, settings.OPENAI_BACKOFF_MAX_SECONDS)
+        return delay + random.uniform(0, 1)
@@ -0,0 +1,254 @@
+"""
+On-disk HTTP response cache for upstream API calls (SAM.gov).
+
+Responses are stored zlib-compressed in a local SQLite file keyed on the
+normalized request (URL + sorted query params, credentials stripped). Entries
+younger than the TTL are served without touching the network; older entries
+are revalidated with If-None-Match / If-Modified-Since when the upstream sent
+an ETag or Last-Modified header. Total size is bounded with LRU eviction.
+"""
+from typing import Dict, Optional
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Query params that never affect the response body
+IGNORED_PARAMS = {"api_key"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class CachedResponse:
+    """A cached upstream response."""
+    key: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        return time.time() - self.stored_at < ttl_seconds
+
+    def json(self):
+        return json.loads(self.body)
+
+    @property
+    def conditional_headers(self) -> Dict[str, str]:
+        """Validators to send when revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPResponseCache:
+    """
+    SQLite-backed response cache with TTL freshness and size-bounded LRU eviction.
+
+    Safe to share between threads and asyncio tasks; every operation is a
+    short local SQLite statement guarded by a lock.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int):
+        """
+        Args:
+            path: SQLite file location (created if missing)
+            ttl_seconds: Age below which entries are served without a request
+            max_bytes: Compressed size budget; least recently used entries are
+                evicted beyond it
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_responses_accessed_at ON responses (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Stable cache key for a GET request; credentials and param order don't matter."""
+        normalized = sorted(
+            (str(k), str(v))
+            for k, v in (params or {}).items()
+            if k not in IGNORED_PARAMS and v is not None
+        )
+        raw = json.dumps([url, normalized], separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, url: str, params: Optional[Dict] = None) -> Optional[CachedResponse]:
+        """
+        Find the stored response for a request, fresh or stale.
+
+        Counts a hit when the entry is still within the TTL, otherwise a miss
+        (a stale entry is still returned so the caller can revalidate it).
+        """
+        key = self.make_key(url, params)
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                entry = CachedResponse(
+                    key=key,
+                    body=zlib.decompress(row[0]),
+                    etag=row[1],
+                    last_modified=row[2],
+                    stored_at=row[3]
+                )
+                if entry.is_fresh(self.ttl_seconds):
+                    self.hits += 1
+                    conn.execute(
+                        "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                        (time.time(), key)
+                    )
+                    conn.commit()
+                else:
+                    self.misses += 1
+                return entry
+        except (sqlite3.Error, zlib.error) as e:
+            logger.warning(f"HTTP cache lookup failed: {e}")
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        url: str,
+        params: Optional[Dict],
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """Save a response body and its validators, then evict down to the size budget."""
+        key = self.make_key(url, params)
+        compressed = zlib.compress(body, 6)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO responses
+                        (key, url, body, size, etag, last_modified, stored_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, url, compressed, len(compressed), etag, last_modified, now, now)
+                )
+                self._evict(conn)
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"HTTP cache store failed: {e}")
+
+    def mark_revalidated(self, entry: CachedResponse) -> None:
+        """Restart an entry's TTL after the upstream answered 304 Not Modified."""
+        self.revalidated += 1
+        now = time.time()
+        entry.stored_at = now
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                    (now, now, entry.key)
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"HTTP cache revalidation update failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        evict = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evict.append((key,))
+            total -= size
+
+        conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+        self.evictions += len(evict)
+        logger.debug(f"HTTP cache evicted {len(evict)} entries")
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        entries, size = 0, 0
+        try:
+            with self._lock:
+                entries, size = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"HTTP cache stats failed: {e}")
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+def default_cache_path(filename: str) -> str:
+    """Location used when no explicit cache path is configured."""
+    return os.path.join(tempfile.gettempdir(), "govai", filename)
@@ -0,0 +1,194 @@
+"""
+Short-TTL in-process cache of authenticated identities (user + company).
+
+Entries are keyed on the JWT subject (user ID) and hold plain column
+snapshots, never live ORM instances, so nothing is shared between sessions.
+A hit is rebuilt into detached instances and attached to the request session
+without any SQL; they behave like freshly loaded rows (lazy loads, updates
+and refresh all work).
+
+Entries are dropped whenever a User or Company row is updated or deleted
+through the ORM: at flush in this process, and again after the commit so a
+concurrent request cannot re-cache the pre-commit row. Other worker processes
+only see the change once their entry expires, so keep the TTL short.
+"""
+from typing import Dict, Optional, Tuple
+from dataclasses import dataclass
+import copy
+import threading
+import time
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached, object_session
+from sqlalchemy.orm.util import identity_key
+
+from app.core.config import settings
+from app.models.user import User
+from app.models.company import Company
+
+# Session.info key collecting (model, id) pairs to drop once the transaction commits
+_PENDING_KEY = "identity_cache_pending"
+
+
+@dataclass
+class CurrentIdentity:
+    """The authenticated user and their company (None until a profile exists)."""
+    user: User
+    company: Optional[Company]
+
+
+def _snapshot(instance) -> Dict:
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(instance).mapper.column_attrs}
+
+
+def _attach(db: Session, model, values: Dict):
+    # Reuse the session's instance if it already has this row; otherwise attach
+    # a rebuilt detached copy (no SQL, and many-to-one lazy loads such as
+    # user.company resolve from the identity map)
+    existing = db.identity_map.get(identity_key(model, values["id"]))
+    if existing is not None:
+        return existing
+    instance = model(**copy.deepcopy(values))
+    make_transient_to_detached(instance)
+    db.add(instance)
+    return instance
+
+
+class IdentityCache:
+    """
+    Thread-safe TTL cache of user/company column snapshots keyed on user ID.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000):
+        """
+        Args:
+            ttl_seconds: Entry lifetime; 0 disables the cache
+            max_entries: Size bound; expired then oldest entries are dropped beyond it
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[float, Dict, Optional[Dict]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def load(self, db: Session, user_id: str) -> Optional[CurrentIdentity]:
+        """
+        Resolve a user and their company, from the cache or one joined query.
+
+        Args:
+            db: Request database session (cached rows are attached to it);
+                from AsyncSession callers, the sync session inside run_sync()
+            user_id: JWT subject
+
+        Returns:
+            CurrentIdentity, or None if the user does not exist
+        """
+        key = str(user_id)
+
+        if self.enabled:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and entry[0] > time.monotonic():
+                    self.hits += 1
+                else:
+                    entry = None
+                    self.misses += 1
+
+            if entry:
+                _, user_values, company_values = entry
+                company = _attach(db, Company, company_values) if company_values else None
+                return CurrentIdentity(user=_attach(db, User, user_values), company=company)
+
+        user = db.query(User).options(joinedload(User.company)).filter(User.id == user_id).first()
+        if user is None:
+            return None
+
+        if self.enabled:
+            company_values = _snapshot(user.company) if user.company else None
+            self._put(key, _snapshot(user), company_values)
+
+        return CurrentIdentity(user=user, company=user.company)
+
+    def _put(self, key: str, user_values: Dict, company_values: Optional[Dict]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                while len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (now + self.ttl_seconds, user_values, company_values)
+
+    def invalidate_user(self, user_id) -> None:
+        """Drop a user's entry."""
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def invalidate_company(self, company_id) -> None:
+        """Drop every entry that includes this company."""
+        with self._lock:
+            stale = [
+                key for key, (_, user_values, _) in self._entries.items()
+                if user_values.get("company_id") == company_id
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+# Singleton instance
+identity_cache = IdentityCache(ttl_seconds=settings.AUTH_IDENTITY_CACHE_TTL_SECONDS)
+
+
+# Invalidation
+
+def _invalidate(model, row_id) -> None:
+    if model is User:
+        identity_cache.invalidate_user(row_id)
+    else:
+        identity_cache.invalidate_company(row_id)
+
+
+def _on_row_changed(mapper, connection, target) -> None:
+    model = mapper.class_
+    _invalidate(model, target.id)
+
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING_KEY, []).append((model, target.id))
+
+
+for _model in (User, Company):
+    event.listen(_model, "after_update", _on_row_changed)
+    event.listen(_model, "after_delete", _on_row_changed)
+
+
+# Registered on Session itself so sync sessions and the sync sessions behind
+# AsyncSession both report commits
+@event.listens_for(Session, "after_commit")
+def _after_commit(session) -> None:
+    for model, row_id in session.info.pop(_PENDING_KEY, []):
+        _invalidate(model, row_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,269 @@
+"""
+DB-backed background job queue.
+
+The API enqueues a row in `jobs` and returns its ID; scripts/run_job_worker.py
+claims queued rows with SELECT ... FOR UPDATE SKIP LOCKED (so several workers
+never pick the same job), runs the handler registered for the job's kind and
+records progress, result or error on the row for GET /jobs/{id}.
+
+At most one queued and one running job exist per (kind, company), and a
+queued job waits while its (kind, company) has a running one. Enqueueing
+while a job is active returns that job instead of creating another; kinds
+whose running job may already have read its input (score_recompute) coalesce
+only onto a queued job, so a trigger during a run queues a follow-up.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import exists, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+from app.models.job import Job, ACTIVE_JOB_STATUSES
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Job kinds
+COMPANY_DISCOVERY = "company_discovery"
+SCORE_RECOMPUTE = "score_recompute"
+
+
+def _now_utc():
+    """Get current UTC time as timezone-naive datetime for consistency."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class JobService:
+    """Enqueue, claim and record the outcome of background jobs."""
+
+    def enqueue(
+        self,
+        db: Session,
+        kind: str,
+        company_id=None,
+        user_id=None,
+        params: Optional[Dict] = None,
+        coalesce_running: bool = True
+    ) -> Tuple[Job, bool]:
+        """
+        Queue a job, coalescing onto an active job for the same kind and company.
+
+        A coalesced trigger that asks for more than the queued job (e.g.
+        force_refresh=true) upgrades the job's params while it is still queued.
+
+        Args:
+            db: Database session
+            kind: Job kind (selects the worker handler)
+            company_id: Company the job runs for
+            user_id: User who triggered it
+            params: Handler parameters
+            coalesce_running: Reuse a running job too; False queues a follow-up
+                behind it (for handlers that may have read their input already)
+
+        Returns:
+            (job, created) - created is False when an active job was reused
+        """
+        params = params or {}
+        statuses = ACTIVE_JOB_STATUSES if coalesce_running else ('queued',)
+
+        existing = self.get_active_job(db, kind, company_id, statuses)
+        if existing is None:
+            job = Job(kind=kind, company_id=company_id, user_id=user_id, params=params, progress={})
+            db.add(job)
+            try:
+                db.commit()
+                db.refresh(job)
+                logger.info(f"Queued job {job.id} ({kind}) for company {company_id}")
+                return job, True
+            except IntegrityError:
+                # A concurrent trigger inserted the active job first
+                db.rollback()
+                existing = self.get_active_job(db, kind, company_id, statuses)
+                if existing is None:
+                    raise
+
+        if existing.status == 'queued':
+            upgraded = {
+                key: value for key, value in params.items()
+                if value and not existing.params.get(key)
+            }
+            if upgraded:
+                existing.params = {**existing.params, **upgraded}
+                db.commit()
+
+        logger.info(f"Coalesced {kind} trigger for company {company_id} onto job {existing.id}")
+        return existing, False
+
+    def get_job(self, db: Session, job_id) -> Optional[Job]:
+        """Get a job by ID"""
+        return db.query(Job).filter(Job.id == job_id).first()
+
+    def get_active_job(
+        self,
+        db: Session,
+        kind: str,
+        company_id,
+        statuses: Iterable[str] = ACTIVE_JOB_STATUSES
+    ) -> Optional[Job]:
+        """The queued or running job for a kind and company, if any (the queued one first)"""
+        return db.query(Job).filter(
+            Job.kind == kind,
+            Job.company_id == company_id,
+            Job.status.in_(list(statuses))
+        ).order_by(Job.status).first()
+
+    # Worker side
+
+    def claim_next(self, db: Session, worker_id: str, kinds: Optional[Iterable[str]] = None) -> Optional[Job]:
+        """
+        Claim the oldest queued job and mark it running.
+
+        Jobs whose (kind, company) already has a running job wait for it.
+
+        Args:
+            db: Database session
+            worker_id: Identifier recorded on the job (host:pid)
+            kinds: Only claim these kinds (default: any)
+
+        Returns:
+            The claimed Job, or None if the queue is empty
+        """
+        running = aliased(Job)
+        query = db.query(Job).filter(
+            Job.status == 'queued',
+            ~exists().where(
+                running.kind == Job.kind,
+                running.company_id == Job.company_id,
+                running.status == 'running'
+            )
+        )
+        if kinds:
+            query = query.filter(Job.kind.in_(list(kinds)))
+
+        job = query.order_by(Job.created_at).with_for_update(skip_locked=True).first()
+        if job is None:
+            db.rollback()  # Release the snapshot
+            return None
+
+        now = _now_utc()
+        job.status = 'running'
+        job.worker_id = worker_id
+        job.attempts += 1
+        job.started_at = now
+        job.heartbeat_at = now
+        job.error = None
+        db.commit()
+
+        logger.info(f"Worker {worker_id} claimed job {job.id} ({job.kind}, attempt {job.attempts})")
+        return job
+
+    def update_progress(self, db: Session, job: Job, **counters) -> None:
+        """Merge counters into job.progress and refresh the heartbeat (commits)"""
+        job.progress = {**(job.progress or {}), **counters}
+        job.heartbeat_at = _now_utc()
+        db.commit()
+
+    def heartbeat(self, db: Session, job_id, worker_id: str) -> bool:
+        """
+        Refresh the heartbeat of a job running on this worker (commits).
+
+        Touches only heartbeat_at, so it can run from another session while
+        the job's own session records progress.
+
+        Args:
+            db: Database session
+            job_id: Running job
+            worker_id: Worker the job was claimed by
+
+        Returns:
+            False once the job is no longer running on this worker
+        """
+        touched = db.query(Job).filter(
+            Job.id == job_id,
+            Job.status == 'running',
+            Job.worker_id == worker_id
+        ).update({Job.heartbeat_at: _now_utc()}, synchronize_session=False)
+        db.commit()
+        return bool(touched)
+
+    def complete(self, db: Session, job: Job, result: Optional[Dict] = None) -> None:
+        """Mark a running job succeeded"""
+        job.status = 'succeeded'
+        job.result = result
+        job.finished_at = _now_utc()
+        db.commit()
+        logger.info(f"Job {job.id} succeeded")
+
+    def fail(self, db: Session, job: Job, error: str) -> None:
+        """Mark a running job failed"""
+        job.status = 'failed'
+        job.error = error
+        job.finished_at = _now_utc()
+        db.commit()
+        logger.error(f"Job {job.id} failed: {error}")
+
+    def requeue_stale(self, db: Session, stale_after_seconds: int, max_attempts: int) -> int:
+        """
+        Recover running jobs whose worker stopped sending heartbeats.
+
+        Jobs with attempts left go back to the queue - unless a follow-up job
+        for the same kind and company is already queued, which does the work
+        instead; the rest are failed.
+
+        Args:
+            db: Database session
+            stale_after_seconds: Heartbeat age after which a worker is presumed dead
+            max_attempts: Attempts allowed per job
+
+        Returns:
+            Number of jobs recovered
+        """
+        cutoff = _now_utc() - timedelta(seconds=stale_after_seconds)
+        stale = db.query(Job).filter(
+            Job.status == 'running',
+            or_(Job.heartbeat_at < cutoff, Job.heartbeat_at.is_(None))
+        ).with_for_update(skip_locked=True).all()
+
+        for job in stale:
+            follow_up = self.get_active_job(db, job.kind, job.company_id, ('queued',)) if job.company_id else None
+            if follow_up is not None:
+                job.status = 'failed'
+                job.error = f"Worker stopped responding; superseded by queued job {follow_up.id}"
+                job.finished_at = _now_utc()
+                logger.warning(f"Failed stale job {job.id}, superseded by queued job {follow_up.id}")
+            elif job.attempts < max_attempts:
+                job.status = 'queued'
+                job.worker_id = None
+                logger.warning(f"Requeued stale job {job.id} (attempt {job.attempts} of {max_attempts})")
+            else:
+                job.status = 'failed'
+                job.error = f"Worker stopped responding (after {job.attempts} attempts)"
+                job.finished_at = _now_utc()
+                logger.error(f"Failed stale job {job.id} after {job.attempts} attempts")
+
+        db.commit()
+        return len(stale)
+
+    def cleanup_old_jobs(self, db: Session, days: int = 30) -> int:
+        """
+        Delete finished jobs older than the given number of days.
+
+        Args:
+            db: Database session
+            days: Keep finished jobs this many days
+
+        Returns:
+            Number of jobs deleted
+        """
+        cutoff = _now_utc() - timedelta(days=days)
+        deleted = db.query(Job).filter(
+            Job.status.notin_(ACTIVE_JOB_STATUSES),
+            Job.finished_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+
+        logger.info(f"Deleted {deleted} finished jobs older than {days} days")
+        return deleted
+
+
+# Singleton instance
+job_service = JobService()
@@ -1,10 +1,17 @@
 """
 Match scoring service for computing company-opportunity fit scores.
 Uses rule-based logic (no AI) for fast, cheap scoring.
+
+compute_score() scores one pair; compute_matrix() scores every
+(opportunity, company) pair of two lists in one vectorized NumPy pass with
+identical results (scripts/benchmark_scoring.py checks and times both).
 """
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Union
 from decimal import Decimal
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.models.opportunity import Opportunity
 from app.models.company import Company
@@ -13,6 +20,87 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Sub-scores in column order of ScoreMatrix / CompanyOpportunityScore
+SUB_SCORES = ('naics', 'cert', 'size', 'geo', 'deadline')
+
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+# Score rows per INSERT ... ON CONFLICT statement (9 parameters per row)
+SCORE_UPSERT_CHUNK_SIZE = 1000
+
+
+def company_certifications(company: Company) -> List[str]:
+    """Certifications held (set-asides the company qualifies for)."""
+    return getattr(company, 'certifications', None) or getattr(company, 'set_asides', []) or []
+
+
+def _opportunity_value(opportunity: Opportunity) -> Optional[float]:
+    """Opportunity value used for size fit, or None."""
+    if getattr(opportunity, 'estimated_value_high', None):
+        return float(opportunity.estimated_value_high)
+    if getattr(opportunity, 'contract_value', None):
+        return float(opportunity.contract_value)
+    return None
+
+
+@dataclass
+class ScoreMatrix:
+    """
+    Match scores for every (opportunity, company) pair of two lists.
+
+    Each score array has shape (len(opportunities), len(companies)); row i is
+    opportunities[i], column j is companies[j].
+    """
+    opportunities: Sequence[Opportunity]
+    companies: Sequence[Company]
+    fit: np.ndarray
+    naics: np.ndarray
+    cert: np.ndarray
+    size: np.ndarray
+    geo: np.ndarray
+    deadline: np.ndarray
+
+    def score(self, i: int, j: int) -> Dict[str, float]:
+        """Scores for one pair, in the compute_score() format."""
+        scores = {'fit_score': float(self.fit[i, j])}
+        for name in SUB_SCORES:
+            scores[f'{name}_score'] = float(getattr(self, name)[i, j])
+        return scores
+
+    def pairs(self):
+        """Yield (opportunity, company, scores) for every pair."""
+        for i, opportunity in enumerate(self.opportunities):
+            for j, company in enumerate(self.companies):
+                yield opportunity, company, self.score(i, j)
+
+    def to_rows(self, computed_at: datetime, mask: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        company_opportunity_scores rows for every pair.
+
+        Args:
+            computed_at: Timestamp stored with each row
+            mask: Optional boolean array of the same shape; only True pairs are returned
+        """
+        company_ids = [company.id for company in self.companies]
+        columns = [('fit_score', self.fit.tolist())] + [
+            (f'{name}_score', getattr(self, name).tolist()) for name in SUB_SCORES
+        ]
+
+        rows = []
+        for i, opportunity in enumerate(self.opportunities):
+            for j, company_id in enumerate(company_ids):
+                if mask is not None and not mask[i, j]:
+                    continue
+                row = {
+                    'company_id': company_id,
+                    'opportunity_id': opportunity.id,
+                    'computed_at': computed_at
+                }
+                for column, values in columns:
+                    row[column] = Decimal(str(values[i][j]))
+                rows.append(row)
+        return rows
+
 
 class MatchScoringService:
     """
@@ -44,10 +132,36 @@ class MatchScoringService:
         "Enterprise ($50M+)": (50_000_000, float('inf'))
     }
 
+    # Set-aside -> certifications that qualify (empty = open to any small business)
+    CERT_MAP = {
+        "8(a)": ["8(a)"],
+        "8AN": ["8(a)"],
+        "WOSB": ["WOSB", "EDWOSB"],
+        "EDWOSB": ["EDWOSB"],
+        "SDVOSB": ["SDVOSB"],
+        "VOSB": ["VOSB", "SDVOSB"],
+        "HUBZone": ["HUBZone"],
+        "HUBZ": ["HUBZone"],
+        "SBA": ["8(a)", "HUBZone", "WOSB", "EDWOSB", "SDVOSB"],
+        "Small Business": [],
+        "SB": [],
+    }
+
+    # Neighboring states for geographic fit (simplified)
+    NEIGHBORING_STATES = {
+        'VA': ['MD', 'DC', 'NC', 'WV', 'KY', 'TN'],
+        'MD': ['VA', 'DC', 'PA', 'DE', 'WV'],
+        'DC': ['VA', 'MD'],
+        'CA': ['OR', 'NV', 'AZ'],
+        'TX': ['NM', 'OK', 'AR', 'LA'],
+        # Add more as needed
+    }
+
     def compute_score(
         self,
         opportunity: Opportunity,
-        company: Company
+        company: Company,
+        now: Optional[datetime] = None
     ) -> Dict[str, float]:
         """
         Compute all match scores between an opportunity and company.
@@ -55,6 +169,7 @@ class MatchScoringService:
         Args:
             opportunity: Opportunity to score
             company: Company to match against
+            now: Reference time for the deadline score (default: utcnow)
 
         Returns:
             Dict with individual scores and overall fit_score
@@ -63,7 +178,7 @@ class MatchScoringService:
         cert_score = self._compute_cert_score(opportunity, company)
         size_score = self._compute_size_score(opportunity, company)
         geo_score = self._compute_geo_score(opportunity, company)
-        deadline_score = self._compute_deadline_score(opportunity)
+        deadline_score = self._compute_deadline_score(opportunity, now)
 
         # Compute weighted average
         fit_score = (
@@ -83,6 +198,214 @@ class MatchScoringService:
             'deadline_score': round(deadline_score, 2)
         }
 
+    def compute_matrix(
+        self,
+        opportunities: Sequence[Opportunity],
+        companies: Sequence[Company],
+        now: Optional[datetime] = None
+    ) -> ScoreMatrix:
+        """
+        Compute match scores for every (opportunity, company) pair at once.
+
+        Opportunities and companies are encoded as arrays (NAICS code/prefix
+        ids, set-aside and certification bitmasks, contract values and value
+        bands, state ids, days to deadline) and each sub-score is evaluated
+        for the whole matrix with array operations. Results are identical to
+        compute_score() for every pair.
+
+        Args:
+            opportunities: Opportunities to score (rows)
+            companies: Companies to match against (columns)
+            now: Reference time for the deadline score (default: utcnow)
+
+        Returns:
+            ScoreMatrix with arrays of shape (len(opportunities), len(companies))
+        """
+        now = now or datetime.utcnow()
+        scores = self.compute_sub_scores(opportunities, companies, SUB_SCORES, now=now)
+
+        return ScoreMatrix(
+            opportunities=opportunities,
+            companies=companies,
+            fit=self.combine_fit(scores),
+            **scores
+        )
+
+    def compute_sub_scores(
+        self,
+        opportunities: Sequence[Opportunity],
+        companies: Sequence[Company],
+        sub_scores: Iterable[str],
+        now: Optional[datetime] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute only the given sub-scores for every (opportunity, company) pair.
+
+        Args:
+            opportunities: Opportunities to score (rows)
+            companies: Companies to match against (columns)
+            sub_scores: Names from SUB_SCORES
+            now: Reference time for the deadline score (default: utcnow)
+
+        Returns:
+            Dict of sub-score name -> array of shape (len(opportunities), len(companies))
+        """
+        shape = (len(opportunities), len(companies))
+        scores = {}
+        for name in sub_scores:
+            if not all(shape):
+                scores[name] = np.zeros(shape)
+            elif name == 'deadline':
+                vector = self.deadline_scores(opportunities, now or datetime.utcnow())
+                scores[name] = np.array(np.broadcast_to(vector[:, None], shape))
+            else:
+                scores[name] = getattr(self, f'_{name}_matrix')(opportunities, companies)
+        return scores
+
+    def combine_fit(self, scores: Dict[str, Union[float, np.ndarray]]) -> Union[float, np.ndarray]:
+        """
+        Weighted fit score from all five sub-scores (scalars or arrays).
+
+        Same operation order as compute_score, so floats match bit for bit.
+        """
+        fit = (
+            scores['naics'] * self.WEIGHTS['naics'] +
+            scores['cert'] * self.WEIGHTS['cert'] +
+            scores['size'] * self.WEIGHTS['size'] +
+            scores['geo'] * self.WEIGHTS['geo'] +
+            scores['deadline'] * self.WEIGHTS['deadline']
+        )
+        return np.round(fit, 2)
+
+    def _naics_matrix(self, opportunities: Sequence[Opportunity], companies: Sequence[Company]) -> np.ndarray:
+        """NAICS sub-score for all pairs (see _compute_naics_score)."""
+        company_naics = [company.naics_codes or [] for company in companies]
+        opp_naics = [opportunity.naics_code for opportunity in opportunities]
+
+        def level(length: Optional[int]) -> np.ndarray:
+            # Company x key indicator matrix, gathered at each opportunity's key
+            vocab = {}
+            ids = [vocab.setdefault(code[:length], len(vocab)) for code in opp_naics if code]
+            held = np.zeros((len(companies), len(vocab) + 1), dtype=bool)  # last column: no key
+            for j, codes in enumerate(company_naics):
+                for code in codes:
+                    key = vocab.get(code[:length])
+                    if key is not None:
+                        held[j, key] = True
+            columns = np.full(len(opp_naics), len(vocab))
+            columns[[i for i, code in enumerate(opp_naics) if code]] = ids
+            return held[:, columns].T
+
+        scores = np.select([level(None), level(4), level(2)], [100.0, 75.0, 50.0], default=25.0)
+
+        no_data = np.array([not code for code in opp_naics])[:, None] | \
+            np.array([not codes for codes in company_naics])[None, :]
+        scores[no_data] = 50.0
+        return scores
+
+    def _cert_matrix(self, opportunities: Sequence[Opportunity], companies: Sequence[Company]) -> np.ndarray:
+        """Certification sub-score for all pairs (see _compute_cert_score)."""
+        bits = {}
+        for certs in self.CERT_MAP.values():
+            for cert in certs:
+                bits.setdefault(cert, 1 << len(bits))
+
+        required = np.zeros(len(opportunities), dtype=np.int64)
+        for i, opportunity in enumerate(opportunities):
+            set_aside = opportunity.set_aside_type or getattr(opportunity, 'set_aside', None)
+            if set_aside and set_aside.upper() not in ['NONE', 'N/A', '']:
+                for cert in self.CERT_MAP.get(set_aside, []):
+                    required[i] |= bits[cert]
+
+        held = np.zeros(len(companies), dtype=np.int64)
+        for j, company in enumerate(companies):
+            for cert in company_certifications(company):
+                held[j] |= bits.get(cert, 0)
+
+        qualifies = (required[:, None] & held[None, :]) != 0
+        return np.where(required[:, None] == 0, 75.0, np.where(qualifies, 100.0, 25.0))
+
+    def _size_matrix(self, opportunities: Sequence[Opportunity], companies: Sequence[Company]) -> np.ndarray:
+        """Contract size sub-score for all pairs (see _compute_size_score)."""
+        values = np.array([_opportunity_value(opportunity) or 0.0 for opportunity in opportunities])[:, None]
+
+        bands = [self.VALUE_RANGES.get(getattr(company, 'contract_value_range', None)) for company in companies]
+        has_band = np.array([band is not None for band in bands])[None, :]
+        low = np.array([band[0] if band else 0.0 for band in bands], dtype=float)[None, :]
+        high = np.array([band[1] if band else 0.0 for band in bands], dtype=float)[None, :]
+
+        scores = np.select(
+            [
+                (low <= values) & (values <= high),
+                (low / 2 <= values) & (values <= high * 2),
+                (low / 5 <= values) & (values <= high * 5),
+            ],
+            [100.0, 75.0, 50.0],
+            default=25.0
+        )
+        scores[(values == 0) | ~has_band] = 75.0
+        return scores
+
+    def _geo_matrix(self, opportunities: Sequence[Opportunity], companies: Sequence[Company]) -> np.ndarray:
+        """Geographic sub-score for all pairs (see _compute_geo_score)."""
+        states = {}
+        opp_states = []
+        for opportunity in opportunities:
+            state = opportunity.pop_state or getattr(opportunity, 'place_of_performance_state', None)
+            opp_states.append(states.setdefault(state.upper(), len(states)) if state else -1)
+        opp_states = np.array(opp_states)
+
+        # Company x state: preferred / neighboring (last column: no state)
+        preferred = np.zeros((len(companies), len(states) + 1), dtype=bool)
+        neighboring = np.zeros_like(preferred)
+        anywhere = np.zeros(len(companies), dtype=bool)
+        for j, company in enumerate(companies):
+            company_geo = company.geographic_preferences or []
+            if not company_geo or "Nationwide" in company_geo:
+                anywhere[j] = True
+                continue
+            for geo in company_geo:
+                geo_upper = geo.upper()
+                if geo_upper in states:
+                    preferred[j, states[geo_upper]] = True
+                for neighbor in self.NEIGHBORING_STATES.get(geo_upper, []):
+                    if neighbor in states:
+                        neighboring[j, states[neighbor]] = True
+
+        scores = np.where(
+            preferred[:, opp_states].T, 100.0,
+            np.where(neighboring[:, opp_states].T, 75.0, 50.0)
+        )
+        scores[opp_states == -1, :] = 75.0
+        scores[:, anywhere] = 100.0
+        return scores
+
+    def deadline_scores(self, opportunities: Sequence[Opportunity], now: datetime) -> np.ndarray:
+        """
+        Deadline sub-score per opportunity (see _compute_deadline_score).
+
+        The only sub-score that depends on the time and not on the company.
+        """
+        deadlines = np.array(
+            [
+                opportunity.response_deadline.replace(tzinfo=None) if opportunity.response_deadline else None
+                for opportunity in opportunities
+            ],
+            dtype='datetime64[us]'
+        )
+        has_deadline = ~np.isnat(deadlines)
+
+        # Whole days, floored like timedelta.days
+        delta = (deadlines - np.datetime64(now, 'us')).astype(np.int64)
+        days_until = np.floor_divide(delta, _MICROSECONDS_PER_DAY)
+
+        scores = np.select(
+            [days_until < 0, days_until < 7, days_until < 14, days_until < 30, days_until < 60],
+            [0.0, 25.0, 50.0, 75.0, 100.0],
+            default=90.0
+        )
+        return np.where(has_deadline, scores, 50.0)
+
     def _compute_naics_score(self, opportunity: Opportunity, company: Company) -> float:
         """Score NAICS code match (0-100)."""
         company_naics = company.naics_codes or []
@@ -118,24 +441,9 @@ class MatchScoringService:
         if not set_aside or set_aside.upper() in ['NONE', 'N/A', '']:
             return 75.0  # No set-aside = neutral (open competition)
 
-        company_certs = company.certifications or getattr(company, 'set_asides', []) or []
-
-        # Map set-aside to required certs
-        cert_map = {
-            "8(a)": ["8(a)"],
-            "8AN": ["8(a)"],
-            "WOSB": ["WOSB", "EDWOSB"],
-            "EDWOSB": ["EDWOSB"],
-            "SDVOSB": ["SDVOSB"],
-            "VOSB": ["VOSB", "SDVOSB"],
-            "HUBZone": ["HUBZone"],
-            "HUBZ": ["HUBZone"],
-            "SBA": ["8(a)", "HUBZone", "WOSB", "EDWOSB", "SDVOSB"],
-            "Small Business": [],
-            "SB": [],
-        }
+        company_certs = company_certifications(company)
 
-        required_certs = cert_map.get(set_aside, [])
+        required_certs = self.CERT_MAP.get(set_aside, [])
 
         if not required_certs:
             return 75.0  # Unknown or open set-aside
@@ -149,11 +457,7 @@ class MatchScoringService:
     def _compute_size_score(self, opportunity: Opportunity, company: Company) -> float:
         """Score contract size fit (0-100)."""
         # Get opportunity value
-        opp_value = None
-        if hasattr(opportunity, 'estimated_value_high') and opportunity.estimated_value_high:
-            opp_value = float(opportunity.estimated_value_high)
-        elif hasattr(opportunity, 'contract_value') and opportunity.contract_value:
-            opp_value = float(opportunity.contract_value)
+        opp_value = _opportunity_value(opportunity)
 
         if not opp_value:
             return 75.0  # No value = neutral
@@ -199,25 +503,16 @@ class MatchScoringService:
             if geo.upper() == opp_state_upper:
                 return 100.0
 
-        # Check neighboring states (simplified)
-        neighboring = {
-            'VA': ['MD', 'DC', 'NC', 'WV', 'KY', 'TN'],
-            'MD': ['VA', 'DC', 'PA', 'DE', 'WV'],
-            'DC': ['VA', 'MD'],
-            'CA': ['OR', 'NV', 'AZ'],
-            'TX': ['NM', 'OK', 'AR', 'LA'],
-            # Add more as needed
-        }
-
+        # Check neighboring states
         for geo in company_geo:
             geo_upper = geo.upper()
-            if geo_upper in neighboring:
-                if opp_state_upper in neighboring[geo_upper]:
+            if geo_upper in self.NEIGHBORING_STATES:
+                if opp_state_upper in self.NEIGHBORING_STATES[geo_upper]:
                     return 75.0  # Neighboring state
 
         return 50.0  # Different region
 
-    def _compute_deadline_score(self, opportunity: Opportunity) -> float:
+    def _compute_deadline_score(self, opportunity: Opportunity, now: Optional[datetime] = None) -> float:
         """Score time to deadline (0-100)."""
         if not opportunity.response_deadline:
             return 50.0  # No deadline = neutral
@@ -226,7 +521,7 @@ class MatchScoringService:
         if deadline.tzinfo:
             deadline = deadline.replace(tzinfo=None)
 
-        days_until = (deadline - datetime.utcnow()).days
+        days_until = (deadline - (now or datetime.utcnow())).days
 
         if days_until < 0:
             return 0.0  # Expired
@@ -314,18 +609,103 @@ class MatchScoringService:
         Returns:
             Number of scores computed
         """
-        count = 0
-        for opp in opportunities:
-            try:
-                self.compute_and_cache(db, opp, company)
-                count += 1
-            except Exception as e:
-                logger.error(f"Error computing score for opp {opp.id}: {e}")
-                continue
+        count = self.compute_and_cache_many(db, opportunities, [company])
 
         logger.info(f"Computed {count} match scores for company {company.id}")
         return count
 
+    def compute_and_cache_many(
+        self,
+        db: Session,
+        opportunities: Sequence[Opportunity],
+        companies: Sequence[Company],
+        now: Optional[datetime] = None
+    ) -> int:
+        """
+        Score every (opportunity, company) pair and cache all scores in one transaction.
+
+        Args:
+            db: Database session
+            opportunities: Opportunities to score
+            companies: Companies to match against
+            now: Reference time for the deadline score (default: utcnow)
+
+        Returns:
+            Number of scores written
+        """
+        now = now or datetime.utcnow()
+        matrix = self.compute_matrix(opportunities, companies, now=now)
+        return self.save_scores(db, matrix.to_rows(computed_at=now))
+
+    def save_scores(
+        self,
+        db: Session,
+        rows: List[Dict],
+        chunk_size: int = SCORE_UPSERT_CHUNK_SIZE
+    ) -> int:
+        """
+        Insert or replace cached scores in bulk.
+
+        On PostgreSQL each chunk is one INSERT ... ON CONFLICT (company_id,
+        opportunity_id) DO UPDATE; other databases fall back to the ORM. All
+        chunks share one transaction and a single commit.
+
+        Args:
+            db: Database session
+            rows: Dicts with company_id, opportunity_id, the score columns and computed_at
+            chunk_size: Rows per INSERT statement
+
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+
+        try:
+            written = self.write_scores(db, rows, chunk_size)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error saving {len(rows)} match scores: {e}")
+            db.rollback()
+            raise
+
+        return written
+
+    def write_scores(
+        self,
+        db: Session,
+        rows: List[Dict],
+        chunk_size: int = SCORE_UPSERT_CHUNK_SIZE
+    ) -> int:
+        """
+        Upsert score rows in the caller's transaction (no commit); see save_scores.
+
+        Returns:
+            Number of rows written
+        """
+        # A single ON CONFLICT statement cannot touch the same row twice
+        rows = list({(row['company_id'], row['opportunity_id']): row for row in rows}.values())
+        if not rows:
+            return 0
+
+        if db.get_bind().dialect.name == 'postgresql':
+            table = CompanyOpportunityScore.__table__
+            for i in range(0, len(rows), chunk_size):
+                stmt = pg_insert(table).values(rows[i:i + chunk_size])
+                db.execute(stmt.on_conflict_do_update(
+                    index_elements=[table.c.company_id, table.c.opportunity_id],
+                    set_={
+                        column: stmt.excluded[column]
+                        for column in rows[0]
+                        if column not in ('company_id', 'opportunity_id')
+                    }
+                ))
+        else:
+            for row in rows:
+                db.merge(CompanyOpportunityScore(**row))
+
+        return len(rows)
+
     def get_cached_score(
         self,
         db: Session,
@@ -2,16 +2,157 @@
 Opportunity and Evaluation CRUD service
 """
 from typing import List, Optional, Dict, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from sqlalchemy.orm import Session, contains_eager, joinedload, load_only, selectinload, with_expression
+from sqlalchemy import and_, or_, desc, func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.models.opportunity import Opportunity
+from app.models.opportunity_raw_payload import OpportunityRawPayload
 from app.models.evaluation import Evaluation
 from app.models.company import Company
-from datetime import datetime, timedelta
+from app.models.company_opportunity_score import CompanyOpportunityScore
+from app.core.pagination import fetch_after_cursor, order_by_keyset
+from app.services.stats import (
+    OpportunityChanges,
+    evaluation_snapshot,
+    opportunity_count_key,
+    stats_service,
+)
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import hashlib
+import json
+import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT ... ON CONFLICT statement (stays well under PostgreSQL's
+# 65535 bind parameter limit)
+UPSERT_CHUNK_SIZE = 1000
+
+# Evaluation fields accepted from AI results on create / from callers on update
+EVALUATION_CREATE_FIELDS = {
+    'opportunity_id', 'company_id', 'fit_score', 'win_probability',
+    'recommendation', 'confidence', 'reasoning', 'strengths',
+    'weaknesses', 'executive_summary', 'evaluated_at'
+}
+EVALUATION_UPDATE_FIELDS = {
+    'fit_score', 'win_probability', 'recommendation', 'confidence',
+    'reasoning', 'strengths', 'weaknesses', 'executive_summary',
+    'user_saved', 'user_notes'
+}
+
+# Parser output keys that map onto differently named model columns
+OPPORTUNITY_FIELD_ALIASES = {
+    'notice_id': 'source_id',
+    'issuing_agency': 'agency',
+    'issuing_sub_agency': 'sub_agency',
+    'issuing_office': 'office',
+}
+
+# Columns never overwritten when an existing opportunity is updated
+OPPORTUNITY_PRESERVED_ON_UPDATE = {
+    'id', 'source', 'source_id', 'created_at',
+    'evaluation_status', 'generic_evaluation'
+}
+
+# Columns loaded for list views (see OpportunitySummary); the full
+# description, contacts, attachments and generic_evaluation are left unloaded
+OPPORTUNITY_SUMMARY_COLUMNS = (
+    Opportunity.id, Opportunity.source, Opportunity.source_id,
+    Opportunity.solicitation_number, Opportunity.title, Opportunity.notice_type,
+    Opportunity.agency, Opportunity.sub_agency, Opportunity.naics_code,
+    Opportunity.set_aside_type, Opportunity.pop_city, Opportunity.pop_state,
+    Opportunity.posted_date, Opportunity.response_deadline,
+    Opportunity.estimated_value_low, Opportunity.estimated_value_high,
+    Opportunity.status, Opportunity.updated_at
+)
+
+# Characters of description returned to list views
+DESCRIPTION_PREVIEW_CHARS = 300
+
+# Score columns the ranked feed can filter on (minimum value)
+FEED_SCORE_COLUMNS = ('fit_score', 'naics_score', 'cert_score', 'size_score', 'geo_score', 'deadline_score')
+
+
+def opportunity_summary_options(path=None) -> List:
+    """
+    Loader options restricting Opportunity to the list-view projection.
+
+    Args:
+        path: Relationship loader to chain onto (e.g. joinedload(Evaluation.opportunity)),
+            or None when querying Opportunity directly
+    """
+    options = [
+        load_only(*OPPORTUNITY_SUMMARY_COLUMNS),
+        with_expression(
+            Opportunity.description_preview,
+            func.substr(Opportunity.description, 1, DESCRIPTION_PREVIEW_CHARS)
+        )
+    ]
+    if path is None:
+        return options
+    return [path.options(*options)]
+
+# Columns excluded from the content fingerprint (identity, bookkeeping,
+# and the raw payload, which carries volatile upstream metadata)
+OPPORTUNITY_UNHASHED_FIELDS = {
+    'id', 'source', 'source_id', 'raw_data', 'content_hash',
+    'evaluation_status', 'generic_evaluation', 'created_at', 'updated_at'
+}
+
+
+OPPORTUNITY_COLUMNS = frozenset(Opportunity.__table__.columns.keys())
+OPPORTUNITY_HASHED_FIELDS = tuple(sorted(OPPORTUNITY_COLUMNS - OPPORTUNITY_UNHASHED_FIELDS))
+
+# Row keys accepted by the upsert: table columns plus the raw payload, which
+# is written to the opportunity_raw_payloads side table
+OPPORTUNITY_ROW_FIELDS = OPPORTUNITY_COLUMNS | {'raw_data'}
+
+
+def to_opportunity_row(opp_data: Dict) -> Dict:
+    """Map a parsed opportunity dict onto Opportunity column names (plus raw_data)."""
+    row = {key: value for key, value in opp_data.items() if key in OPPORTUNITY_ROW_FIELDS}
+
+    for alias, column in OPPORTUNITY_FIELD_ALIASES.items():
+        if alias in opp_data and column not in row:
+            row[column] = opp_data[alias]
+
+    row.setdefault('source', 'sam.gov')
+    return row
+
+
+def _normalize_for_hash(value):
+    if type(value) is str:
+        return value
+    if isinstance(value, datetime):
+        if value.tzinfo:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.replace(microsecond=0).isoformat()
+    if isinstance(value, (Decimal, float)):
+        return format(Decimal(str(value)).normalize(), 'f')
+    return value
+
+
+def compute_content_hash(opp_data: Dict) -> str:
+    """
+    Stable SHA-256 fingerprint of an opportunity's content fields.
+
+    Values are normalized (UTC datetimes without microseconds, canonical
+    numbers, sorted JSON keys) so the same SAM.gov record always hashes the
+    same, letting unchanged records be skipped with one comparison.
+    """
+    row = to_opportunity_row(opp_data)
+    payload = {}
+    for key in OPPORTUNITY_HASHED_FIELDS:
+        value = row.get(key)
+        if value is not None:
+            payload[key] = _normalize_for_hash(value)
+    # Keys are already in sorted order
+    encoded = json.dumps(payload, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
 
 class UpsertResult:
     """Result of batch upsert operation."""
@@ -20,6 +161,17 @@ class UpsertResult:
         self.updated = 0
         self.unchanged = 0
         self.errors = 0
+        # Ids of the inserted and updated opportunities (not in to_dict)
+        self.written_ids: List = []
+
+    def merge(self, other: 'UpsertResult') -> 'UpsertResult':
+        """Add another result's counts into this one."""
+        self.new += other.new
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.errors += other.errors
+        self.written_ids += other.written_ids
+        return self
 
     def to_dict(self) -> Dict:
         return {
@@ -45,17 +197,26 @@ class OpportunityService:
         Returns:
             Created Opportunity instance
         """
+        row = self._to_opportunity_row(opportunity_data)
+
         # Check if opportunity already exists
         existing = db.query(Opportunity).filter(
-            Opportunity.source_id == opportunity_data.get("source_id")
+            Opportunity.source_id == row.get("source_id")
         ).first()
 
         if existing:
-            logger.info(f"Opportunity {opportunity_data.get('notice_id')} already exists, updating...")
-            return self.update_opportunity(db, existing.id, opportunity_data)
-
-        opportunity = Opportunity(**opportunity_data)
+            if existing.content_hash == row['content_hash']:
+                logger.debug(f"Opportunity {existing.source_id} unchanged, skipping update")
+                return existing
+            logger.info(f"Opportunity {row.get('source_id')} already exists, updating...")
+            return self.update_opportunity(db, existing.id, row)
+
+        row.setdefault('evaluation_status', 'pending')
+        opportunity = Opportunity(**row)
         db.add(opportunity)
+        stats_service.apply_opportunity_changes(
+            db, Counter({opportunity_count_key(opportunity.naics_code, opportunity.status or 'active'): 1})
+        )
         db.commit()
         db.refresh(opportunity)
 
@@ -78,11 +239,17 @@ class OpportunityService:
         if not opportunity:
             raise ValueError(f"Opportunity {opportunity_id} not found")
 
+        before = opportunity_count_key(opportunity.naics_code, opportunity.status)
+
         # Update fields
         for key, value in opportunity_data.items():
             if hasattr(opportunity, key):
                 setattr(opportunity, key, value)
 
+        after = opportunity_count_key(opportunity.naics_code, opportunity.status)
+        if before != after:
+            stats_service.apply_opportunity_changes(db, Counter({before: -1, after: 1}))
+
         opportunity.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(opportunity)
@@ -105,25 +272,62 @@ class OpportunityService:
         limit: int = 100,
         active_only: bool = True,
         naics_codes: Optional[List[str]] = None,
-        deadline_after: Optional[datetime] = None
+        deadline_after: Optional[datetime] = None,
+        summary: bool = False,
+        cursor: Optional[str] = None
     ) -> List[Opportunity]:
         """
         List opportunities with optional filters
 
+        Ordered by posted_date (newest first, undated last), then id. Pass the
+        previous page's cursor for keyset pagination; `skip` is ignored then.
+
         Args:
             db: Database session
-            skip: Number of records to skip (pagination)
+            skip: Number of records to skip (offset pagination)
             limit: Max number of records to return
             active_only: Only return active opportunities
             naics_codes: Filter by NAICS codes
             deadline_after: Only opportunities with deadline after this date
+            summary: Load only the list-view columns (for OpportunitySummary)
+            cursor: Keyset cursor from next_cursor(..., 'posted_date')
 
         Returns:
             List of Opportunity instances
+
+        Raises:
+            InvalidCursor: Cursor cannot be decoded
         """
+        query = self._opportunities_query(db, active_only, naics_codes, deadline_after)
+        if summary:
+            query = query.options(*opportunity_summary_options())
+
+        # Order by most recent first
+        query = order_by_keyset(query, Opportunity.posted_date, Opportunity.id)
+
+        if cursor:
+            return fetch_after_cursor(query, Opportunity.posted_date, Opportunity.id, cursor, limit)
+        return query.offset(skip).limit(limit).all()
+
+    def count_opportunities(
+        self,
+        db: Session,
+        active_only: bool = True,
+        naics_codes: Optional[List[str]] = None,
+        deadline_after: Optional[datetime] = None
+    ) -> int:
+        """Number of opportunities matching the list_opportunities() filters"""
+        return self._opportunities_query(db, active_only, naics_codes, deadline_after).count()
+
+    def _opportunities_query(
+        self,
+        db: Session,
+        active_only: bool,
+        naics_codes: Optional[List[str]],
+        deadline_after: Optional[datetime]
+    ):
         query = db.query(Opportunity)
 
-        # Apply filters
         if active_only:
             query = query.filter(Opportunity.status == "active")
 
@@ -133,11 +337,119 @@ class OpportunityService:
         if deadline_after:
             query = query.filter(Opportunity.response_deadline >= deadline_after)
 
-        # Order by most recent first
-        query = query.order_by(desc(Opportunity.posted_date))
+        return query
 
+    def list_ranked_opportunities(
+        self,
+        db: Session,
+        company_id: str,
+        skip: int = 0,
+        limit: int = 20,
+        min_scores: Optional[Dict[str, float]] = None,
+        deadline_after: Optional[datetime] = None,
+        deadline_before: Optional[datetime] = None,
+        set_aside: Optional[str] = None,
+        state: Optional[str] = None,
+        active_only: bool = True,
+        cursor: Optional[str] = None
+    ) -> List[CompanyOpportunityScore]:
+        """
+        Opportunities ranked by cached match score for a company
+
+        Reads company_opportunity_scores (kept current by the post-discovery
+        score refresh) joined to the list-view opportunity columns. Ordered by
+        fit_score (highest first), then opportunity_id, which the
+        (company_id, fit_score DESC, opportunity_id DESC) index answers as a
+        range scan. Pass the previous page's cursor for keyset pagination;
+        `skip` is ignored then.
+
+        Args:
+            db: Database session
+            company_id: Company ID
+            skip: Number of records to skip (offset pagination)
+            limit: Max number of records to return
+            min_scores: Minimum per score column (keys from FEED_SCORE_COLUMNS)
+            deadline_after: Only opportunities with deadline on/after this time
+            deadline_before: Only opportunities with deadline on/before this time
+            set_aside: Set-aside type
+            state: Place of performance state
+            active_only: Only return active opportunities
+            cursor: Keyset cursor from encode_cursor(fit_score, opportunity_id)
+
+        Returns:
+            CompanyOpportunityScore instances with .opportunity loaded (summary columns)
+
+        Raises:
+            InvalidCursor: Cursor cannot be decoded
+            ValueError: Unknown score column in min_scores
+        """
+        query = self._ranked_query(
+            db, company_id, min_scores, deadline_after, deadline_before, set_aside, state, active_only
+        )
+        query = query.options(*opportunity_summary_options(contains_eager(CompanyOpportunityScore.opportunity)))
+
+        query = order_by_keyset(query, CompanyOpportunityScore.fit_score, CompanyOpportunityScore.opportunity_id)
+
+        if cursor:
+            return fetch_after_cursor(
+                query, CompanyOpportunityScore.fit_score, CompanyOpportunityScore.opportunity_id, cursor, limit
+            )
         return query.offset(skip).limit(limit).all()
 
+    def count_ranked_opportunities(
+        self,
+        db: Session,
+        company_id: str,
+        min_scores: Optional[Dict[str, float]] = None,
+        deadline_after: Optional[datetime] = None,
+        deadline_before: Optional[datetime] = None,
+        set_aside: Optional[str] = None,
+        state: Optional[str] = None,
+        active_only: bool = True
+    ) -> int:
+        """Number of opportunities matching the list_ranked_opportunities() filters"""
+        return self._ranked_query(
+            db, company_id, min_scores, deadline_after, deadline_before, set_aside, state, active_only
+        ).count()
+
+    def _ranked_query(
+        self,
+        db: Session,
+        company_id: str,
+        min_scores: Optional[Dict[str, float]],
+        deadline_after: Optional[datetime],
+        deadline_before: Optional[datetime],
+        set_aside: Optional[str],
+        state: Optional[str],
+        active_only: bool
+    ):
+        query = db.query(CompanyOpportunityScore).join(CompanyOpportunityScore.opportunity).filter(
+            CompanyOpportunityScore.company_id == company_id
+        )
+
+        for column, minimum in (min_scores or {}).items():
+            if column not in FEED_SCORE_COLUMNS:
+                raise ValueError(f"Unknown score column: {column}")
+            if minimum is not None:
+                query = query.filter(getattr(CompanyOpportunityScore, column) >= minimum)
+
+        if active_only:
+            query = query.filter(Opportunity.status == "active")
+
+        if deadline_after:
+            query = query.filter(Opportunity.response_deadline >= deadline_after)
+
+        if deadline_before:
+            query = query.filter(Opportunity.response_deadline <= deadline_before)
+
+        if set_aside:
+            query = query.filter(Opportunity.set_aside_type == set_aside)
+
+        if state:
+            query = query.filter(Opportunity.pop_state == state.upper())
+
+        return query
+
     def create_evaluation(self, db: Session, evaluation_data: Dict) -> Evaluation:
         """
         Create a new evaluation
@@ -165,15 +477,13 @@ class OpportunityService:
             return self.update_evaluation(db, existing.id, evaluation_data)
 
         # Filter evaluation_data to only include valid Evaluation model fields
-        valid_fields = {
-            'opportunity_id', 'company_id', 'fit_score', 'win_probability',
-            'recommendation', 'confidence', 'reasoning', 'strengths',
-            'weaknesses', 'executive_summary', 'evaluated_at'
-        }
-        filtered_data = {k: v for k, v in evaluation_data.items() if k in valid_fields}
+        filtered_data = {k: v for k, v in evaluation_data.items() if k in EVALUATION_CREATE_FIELDS}
 
         evaluation = Evaluation(**filtered_data)
         db.add(evaluation)
+        stats_service.apply_evaluation_change(
+            db, evaluation.company_id, None, evaluation_snapshot(evaluation)
+        )
         db.commit()
         db.refresh(evaluation)
 
@@ -183,6 +493,69 @@ class OpportunityService:
         )
         return evaluation
 
+    def create_evaluations_batch(self, db: Session, evaluations_data: List[Dict]) -> List[Evaluation]:
+        """
+        Create (or update existing) evaluations in one transaction
+
+        Existing (opportunity, company) evaluations are found with a single
+        query and updated in place, like create_evaluation(); the rest are
+        inserted. Dashboard counters are adjusted and everything is committed
+        once.
+
+        Args:
+            db: Database session
+            evaluations_data: Dicts with evaluation fields (opportunity_id and company_id required)
+
+        Returns:
+            Created or updated Evaluation instances, in input order
+        """
+        if not evaluations_data:
+            return []
+
+        pairs = {(data["opportunity_id"], data["company_id"]) for data in evaluations_data}
+        existing = {
+            (evaluation.opportunity_id, evaluation.company_id): evaluation
+            for evaluation in db.query(Evaluation).filter(
+                tuple_(Evaluation.opportunity_id, Evaluation.company_id).in_(list(pairs))
+            )
+        }
+
+        now = datetime.utcnow()
+        evaluations = []
+        try:
+            for data in evaluations_data:
+                key = (data["opportunity_id"], data["company_id"])
+                evaluation = existing.get(key)
+
+                if evaluation is None:
+                    evaluation = Evaluation(
+                        **{k: v for k, v in data.items() if k in EVALUATION_CREATE_FIELDS}
+                    )
+                    db.add(evaluation)
+                    existing[key] = evaluation
+                    before = None
+                else:
+                    before = evaluation_snapshot(evaluation)
+                    for k, v in data.items():
+                        if k in EVALUATION_UPDATE_FIELDS:
+                            setattr(evaluation, k, v)
+
+                if evaluation.evaluated_at is None or before is not None:
+                    evaluation.evaluated_at = now
+                stats_service.apply_evaluation_change(
+                    db, evaluation.company_id, before, evaluation_snapshot(evaluation)
+                )
+                evaluations.append(evaluation)
+
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error saving evaluation batch: {e}")
+            db.rollback()
+            raise
+
+        logger.info(f"Saved {len(evaluations)} evaluations in one batch")
+        return evaluations
+
     def update_evaluation(self, db: Session, evaluation_id: str, evaluation_data: Dict) -> Evaluation:
         """
         Update an existing evaluation
@@ -199,15 +572,16 @@ class OpportunityService:
         if not evaluation:
             raise ValueError(f"Evaluation {evaluation_id} not found")
 
+        before = evaluation_snapshot(evaluation)
+
         # Filter to valid fields and update
-        valid_fields = {
-            'fit_score', 'win_probability', 'recommendation', 'confidence',
-            'reasoning', 'strengths', 'weaknesses', 'executive_summary'
-        }
         for key, value in evaluation_data.items():
-            if key in valid_fields and hasattr(evaluation, key):
+            if key in EVALUATION_UPDATE_FIELDS and hasattr(evaluation, key):
                 setattr(evaluation, key, value)
 
+        stats_service.apply_evaluation_change(
+            db, evaluation.company_id, before, evaluation_snapshot(evaluation)
+        )
         evaluation.evaluated_at = datetime.utcnow()
         db.commit()
         db.refresh(evaluation)
@@ -215,9 +589,17 @@ class OpportunityService:
         logger.info(f"Updated evaluation {evaluation.id}")
         return evaluation
 
-    def get_evaluation_by_id(self, db: Session, evaluation_id: str) -> Optional[Evaluation]:
-        """Get evaluation by ID"""
-        return db.query(Evaluation).filter(Evaluation.id == evaluation_id).first()
+    def get_evaluation_by_id(
+        self,
+        db: Session,
+        evaluation_id: str,
+        with_opportunity: bool = False
+    ) -> Optional[Evaluation]:
+        """Get evaluation by ID (optionally joining its opportunity)"""
+        query = db.query(Evaluation)
+        if with_opportunity:
+            query = query.options(joinedload(Evaluation.opportunity))
+        return query.filter(Evaluation.id == evaluation_id).first()
 
     def get_evaluation_for_opportunity(
         self,
@@ -240,11 +622,16 @@ class OpportunityService:
         skip: int = 0,
         limit: int = 100,
         recommendation: Optional[str] = None,
-        min_fit_score: Optional[float] = None
+        min_fit_score: Optional[float] = None,
+        summary: bool = False,
+        cursor: Optional[str] = None
     ) -> List[Evaluation]:
         """
         List evaluations for a company
 
+        Ordered by fit_score (highest first, unscored last), then id. Pass the
+        previous page's cursor for keyset pagination; `skip` is ignored then.
+
         Args:
             db: Database session
             company_id: Company ID
@@ -252,24 +639,125 @@ class OpportunityService:
             limit: Max number of records to return
             recommendation: Filter by recommendation (BID, NO_BID, RESEARCH)
             min_fit_score: Minimum fit score
+            summary: Join each opportunity, loading only the list-view columns
+                (otherwise full opportunities are loaded in one extra SELECT ... IN)
+            cursor: Keyset cursor from next_cursor(..., 'fit_score')
 
         Returns:
-            List of Evaluation instances
+            List of Evaluation instances with .opportunity already loaded
+
+        Raises:
+            InvalidCursor: Cursor cannot be decoded
         """
+        query = self._evaluations_query(db, company_id, recommendation, min_fit_score)
+        query = query.options(*self._evaluation_opportunity_options(summary))
+
+        # Order by fit score descending
+        query = order_by_keyset(query, Evaluation.fit_score, Evaluation.id)
+
+        if cursor:
+            return fetch_after_cursor(query, Evaluation.fit_score, Evaluation.id, cursor, limit)
+        return query.offset(skip).limit(limit).all()
+
+    def count_evaluations_for_company(
+        self,
+        db: Session,
+        company_id: str,
+        recommendation: Optional[str] = None,
+        min_fit_score: Optional[float] = None
+    ) -> int:
+        """Number of evaluations matching the list_evaluations_for_company() filters"""
+        return self._evaluations_query(db, company_id, recommendation, min_fit_score).count()
+
+    def _evaluations_query(
+        self,
+        db: Session,
+        company_id: str,
+        recommendation: Optional[str],
+        min_fit_score: Optional[float]
+    ):
         query = db.query(Evaluation).filter(Evaluation.company_id == company_id)
 
-        # Apply filters
         if recommendation:
             query = query.filter(Evaluation.recommendation == recommendation)
 
         if min_fit_score is not None:
             query = query.filter(Evaluation.fit_score >= min_fit_score)
 
-        # Order by fit score descending
-        query = query.order_by(desc(Evaluation.fit_score))
+        return query
+
+    def count_pipeline_for_company(self, db: Session, company_id: str, status: Optional[str] = None) -> int:
+        """Number of evaluations in a company's pipeline (optionally one status)"""
+        return self.pipeline_query(db, company_id, status).count()
+
+    def pipeline_query(self, db: Session, company_id: str, status: Optional[str] = None):
+        """
+        Query for a company's pipeline (evaluations with a user_saved status).
+
+        Args:
+            db: Database session
+            company_id: Company ID
+            status: Restrict to one status (WATCHING, BIDDING, PASSED, WON, LOST)
+
+        Returns:
+            Unordered Evaluation query, suitable for count()
+        """
+        query = db.query(Evaluation).filter(
+            Evaluation.company_id == company_id,
+            Evaluation.user_saved.isnot(None)
+        )
+        if status:
+            query = query.filter(Evaluation.user_saved == status)
+        return query
+
+    def list_pipeline_for_company(
+        self,
+        db: Session,
+        company_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[str] = None,
+        summary: bool = False,
+        cursor: Optional[str] = None
+    ) -> List[Evaluation]:
+        """
+        List a company's pipeline, most recently evaluated first
 
+        Args:
+            db: Database session
+            company_id: Company ID
+            skip: Number of records to skip (pagination)
+            limit: Max number of records to return
+            status: Restrict to one pipeline status
+            summary: Join each opportunity, loading only the list-view columns
+            cursor: Keyset cursor from next_cursor(..., 'evaluated_at')
+
+        Returns:
+            List of Evaluation instances with .opportunity already loaded
+
+        Raises:
+            InvalidCursor: Cursor cannot be decoded
+        """
+        query = order_by_keyset(
+            self.pipeline_query(db, company_id, status).options(
+                *self._evaluation_opportunity_options(summary)
+            ),
+            Evaluation.evaluated_at,
+            Evaluation.id
+        )
+
+        if cursor:
+            return fetch_after_cursor(query, Evaluation.evaluated_at, Evaluation.id, cursor, limit)
         return query.offset(skip).limit(limit).all()
 
+    @staticmethod
+    def _evaluation_opportunity_options(summary: bool) -> list:
+        # Many-to-one, so the summary join adds no rows; full opportunities are
+        # selectin-loaded to keep the wide columns out of the paginated query
+        if summary:
+            return opportunity_summary_options(joinedload(Evaluation.opportunity))
+        return [selectinload(Evaluation.opportunity)]
+
     def get_opportunities_needing_evaluation(
         self,
         db: Session,
@@ -329,22 +817,30 @@ class OpportunityService:
 
         db.commit()
         logger.info(f"Deleted {count} old opportunities (older than {days_old} days)")
+
+        # Bulk delete (evaluations cascade) - recompute counters from scratch
+        if count:
+            stats_service.refresh_all(db)
         return count
 
     def upsert_opportunities_batch(
         self,
         db: Session,
-        opportunities_data: List[Dict]
+        opportunities_data: List[Dict],
+        chunk_size: int = UPSERT_CHUNK_SIZE
     ) -> UpsertResult:
         """
         Efficiently upsert a batch of opportunities with deduplication.
 
-        Uses source_id (SAM.gov notice ID) for deduplication.
-        Only updates records if data has actually changed.
+        Uses (source, source_id) for deduplication. On PostgreSQL each chunk
+        is written with a single INSERT ... ON CONFLICT DO UPDATE whose WHERE
+        clause skips rows whose content_hash has not changed, so no ORM
+        objects are loaded. Other databases fall back to the ORM path.
 
         Args:
             db: Database session
             opportunities_data: List of dicts with opportunity fields
+            chunk_size: Rows per INSERT statement
 
         Returns:
             UpsertResult with counts of new, updated, unchanged, errors
@@ -354,57 +850,40 @@ class OpportunityService:
         if not opportunities_data:
             return result
 
-        # Extract all source_ids from incoming data
-        source_ids = [
-            opp.get('source_id') or opp.get('notice_id')
-            for opp in opportunities_data
-            if opp.get('source_id') or opp.get('notice_id')
-        ]
-
-        # Fetch all existing opportunities with these source_ids in one query
-        existing_opps = {
-            opp.source_id: opp
-            for opp in db.query(Opportunity).filter(
-                Opportunity.source_id.in_(source_ids)
-            ).all()
-        }
-
+        # Map to model columns and deduplicate (last occurrence wins) - a
+        # single ON CONFLICT statement cannot touch the same row twice
+        rows_by_key: Dict[Tuple[str, str], Dict] = {}
         for opp_data in opportunities_data:
-            try:
-                source_id = opp_data.get('source_id') or opp_data.get('notice_id')
-                if not source_id:
-                    result.errors += 1
-                    continue
-
-                existing = existing_opps.get(source_id)
-
-                if existing:
-                    # Check if data has changed
-                    if self._has_opportunity_changed(existing, opp_data):
-                        # Update existing record
-                        for key, value in opp_data.items():
-                            if hasattr(existing, key) and key not in ('id', 'created_at'):
-                                setattr(existing, key, value)
-                        existing.updated_at = datetime.utcnow()
-                        result.updated += 1
-                    else:
-                        result.unchanged += 1
-                else:
-                    # Create new opportunity
-                    # Ensure evaluation_status is set for new opportunities
-                    if 'evaluation_status' not in opp_data:
-                        opp_data['evaluation_status'] = 'pending'
-                    opportunity = Opportunity(**opp_data)
-                    db.add(opportunity)
-                    result.new += 1
-
-            except Exception as e:
-                logger.error(f"Error upserting opportunity {opp_data.get('source_id')}: {e}")
+            row = self._to_opportunity_row(opp_data)
+            if not row.get('source_id'):
                 result.errors += 1
                 continue
 
-        # Commit all changes at once
+            key = (row['source'], row['source_id'])
+            if key in rows_by_key:
+                result.unchanged += 1  # Duplicate within this batch
+            rows_by_key[key] = row
+
+        rows = list(rows_by_key.values())
+
         try:
+            changes: OpportunityChanges = Counter()
+            if db.get_bind().dialect.name == 'postgresql':
+                # One statement per key set: a row must not have the columns
+                # it doesn't carry set to NULL by another row's keys
+                by_columns: Dict[frozenset, List[Dict]] = defaultdict(list)
+                for row in rows:
+                    by_columns[frozenset(row) - {'raw_data'}].append(row)
+                for group in by_columns.values():
+                    for i in range(0, len(group), chunk_size):
+                        self._upsert_chunk_postgres(db, group[i:i + chunk_size], result, changes)
+            else:
+                self._upsert_rows_orm(db, rows, result, changes)
+
+            # Keep per-company dashboard counters in step, same transaction
+            stats_service.apply_opportunity_changes(db, changes)
+
+            # Commit all changes at once
             db.commit()
         except Exception as e:
             logger.error(f"Error committing batch upsert: {e}")
@@ -417,41 +896,185 @@ class OpportunityService:
         )
         return result
 
-    def _has_opportunity_changed(self, existing: Opportunity, new_data: Dict) -> bool:
+    def _to_opportunity_row(self, opp_data: Dict) -> Dict:
+        """Map to model columns, fingerprinting the content if the parser didn't."""
+        row = to_opportunity_row(opp_data)
+        if not row.get('content_hash'):
+            row['content_hash'] = compute_content_hash(row)
+        return row
+
+    def _upsert_chunk_postgres(
+        self,
+        db: Session,
+        rows: List[Dict],
+        result: UpsertResult,
+        changes: OpportunityChanges
+    ) -> None:
         """
-        Check if any relevant fields have changed.
+        Upsert one chunk with INSERT ... ON CONFLICT (source, source_id) DO UPDATE.
 
-        Args:
-            existing: Existing Opportunity from database
-            new_data: New data dict from API
+        Rows whose content_hash is unchanged are skipped by the WHERE clause
+        and not returned, and RETURNING (xmax = 0) is true only for freshly
+        inserted rows, which gives exact new/updated/unchanged counts from one
+        round trip. Raw payloads of the written rows are then upserted into
+        the side table in a second statement.
 
-        Returns:
-            True if data has changed, False otherwise
-        """
-        # Fields to compare for changes
-        fields_to_check = [
-            'title', 'description', 'response_deadline', 'status',
-            'set_aside_type', 'estimated_value_low', 'estimated_value_high',
-            'pop_city', 'pop_state', 'pop_zip', 'pop_country',
-            'attachments'
-        ]
+        All rows must carry the same columns: DO UPDATE sets every one of
+        them, so a column missing from a row would be overwritten with NULL.
 
-        for field in fields_to_check:
-            if field not in new_data:
-                continue
+        `changes` accumulates (naics_code, is_active) count deltas for the
+        company stats counters; the prior NAICS/status of existing rows is
+        read first so updates that move an opportunity are counted.
+        """
+        table = Opportunity.__table__
+        now = datetime.utcnow()
+
+        previous = {
+            source_id: (naics_code, status)
+            for source_id, naics_code, status in db.execute(
+                select(table.c.source_id, table.c.naics_code, table.c.status).where(
+                    tuple_(table.c.source, table.c.source_id).in_(
+                        [(row['source'], row['source_id']) for row in rows]
+                    )
+                )
+            )
+        }
+
+        columns = set(rows[0]) - {'raw_data'}
+        columns |= {'id', 'evaluation_status', 'created_at', 'updated_at'}
+
+        values = []
+        for row in rows:
+            value = {column: row.get(column) for column in columns}
+            value['id'] = uuid.uuid4()
+            value['evaluation_status'] = row.get('evaluation_status') or 'pending'
+            value['created_at'] = now
+            value['updated_at'] = now
+            values.append(value)
+
+        stmt = pg_insert(table).values(values)
+        excluded = stmt.excluded
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.source, table.c.source_id],
+            set_={
+                column: excluded[column]
+                for column in columns
+                if column not in OPPORTUNITY_PRESERVED_ON_UPDATE
+            },
+            where=table.c.content_hash.is_distinct_from(excluded.content_hash)
+        ).returning(
+            table.c.id,
+            table.c.source_id,
+            literal_column("(xmax = 0)").label("inserted")
+        )
+
+        written = db.execute(stmt).fetchall()
+        inserted = sum(1 for row in written if row.inserted)
 
-            existing_value = getattr(existing, field, None)
-            new_value = new_data.get(field)
+        result.new += inserted
+        result.updated += len(written) - inserted
+        result.unchanged += len(rows) - len(written)
+        result.written_ids += [row.id for row in written]
 
-            # Handle datetime comparison
-            if isinstance(existing_value, datetime) and isinstance(new_value, datetime):
-                # Compare without microseconds
-                if existing_value.replace(microsecond=0) != new_value.replace(microsecond=0):
-                    return True
-            elif existing_value != new_value:
-                return True
+        rows_by_source_id = {row['source_id']: row for row in rows}
+        for written_row in written:
+            row = rows_by_source_id[written_row.source_id]
+            if written_row.inserted:
+                changes[opportunity_count_key(row.get('naics_code'), row.get('status', 'active'))] += 1
+                continue
+            old_naics, old_status = previous.get(written_row.source_id, (None, None))
+            before = opportunity_count_key(old_naics, old_status)
+            after = opportunity_count_key(row.get('naics_code', old_naics), row.get('status', old_status))
+            if before != after:
+                changes[before] -= 1
+                changes[after] += 1
+
+        # Raw payloads only for rows actually written; unchanged rows keep theirs
+        raw_by_source_id = {row['source_id']: row.get('raw_data') for row in rows}
+        payloads = []
+        for written_row in written:
+            raw = raw_by_source_id.get(written_row.source_id)
+            if raw is None:
+                continue
+            payload, size = OpportunityRawPayload.encode(raw)
+            payloads.append({
+                'opportunity_id': written_row.id,
+                'payload': payload,
+                'size': size,
+                'updated_at': now
+            })
+
+        if payloads:
+            payload_stmt = pg_insert(OpportunityRawPayload.__table__).values(payloads)
+            db.execute(payload_stmt.on_conflict_do_update(
+                index_elements=['opportunity_id'],
+                set_={
+                    'payload': payload_stmt.excluded.payload,
+                    'size': payload_stmt.excluded.size,
+                    'updated_at': payload_stmt.excluded.updated_at
+                }
+            ))
+
+    def _upsert_rows_orm(
+        self,
+        db: Session,
+        rows: List[Dict],
+        result: UpsertResult,
+        changes: OpportunityChanges
+    ) -> None:
+        """Portable upsert path: compare stored content hashes, then write via the ORM."""
+        # Fetch stored hashes for these source_ids in one query (no full rows)
+        existing_hashes = dict(
+            db.query(Opportunity.source_id, Opportunity.content_hash).filter(
+                Opportunity.source_id.in_([row['source_id'] for row in rows])
+            ).all()
+        )
+        changed_ids = [
+            row['source_id'] for row in rows
+            if row['source_id'] in existing_hashes
+            and existing_hashes[row['source_id']] != row['content_hash']
+        ]
+        existing_opps = {
+            opp.source_id: opp
+            for opp in db.query(Opportunity).filter(
+                Opportunity.source_id.in_(changed_ids)
+            ).all()
+        } if changed_ids else {}
+
+        for row in rows:
+            try:
+                if row['source_id'] in existing_hashes:
+                    existing = existing_opps.get(row['source_id'])
+                    if existing is not None:
+                        before = opportunity_count_key(existing.naics_code, existing.status)
+                        # Update existing record
+                        for key, value in row.items():
+                            if key not in OPPORTUNITY_PRESERVED_ON_UPDATE:
+                                setattr(existing, key, value)
+                        existing.updated_at = datetime.utcnow()
+                        after = opportunity_count_key(existing.naics_code, existing.status)
+                        if before != after:
+                            changes[before] -= 1
+                            changes[after] += 1
+                        result.updated += 1
+                        result.written_ids.append(existing.id)
+                    else:
+                        result.unchanged += 1
+                else:
+                    # Create new opportunity
+                    # Ensure evaluation_status is set for new opportunities
+                    row.setdefault('evaluation_status', 'pending')
+                    row.setdefault('id', uuid.uuid4())
+                    db.add(Opportunity(**row))
+                    changes[opportunity_count_key(row.get('naics_code'), row.get('status', 'active'))] += 1
+                    result.new += 1
+                    result.written_ids.append(row['id'])
 
-        return False
+            except Exception as e:
+                logger.error(f"Error upserting opportunity {row.get('source_id')}: {e}")
+                result.errors += 1
+                continue
 
     def get_opportunities_pending_evaluation(
         self,
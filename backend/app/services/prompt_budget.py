@@ -0,0 +1,222 @@
+"""
+Token budgeting for AI evaluator prompts.
+
+SAM.gov descriptions arrive as HTML and often end in pages of FAR/DFARS
+clause listings; capability statements run to 500 words. Free-text prompt
+sections are cleaned (HTML and entities removed, clause listings,
+clause-incorporation sentences and repeated lines dropped, whitespace
+collapsed) and then cut to a per-section token budget, counted
+locally with tiktoken. The completion budget (max_tokens) is computed from
+the prompt size instead of a fixed ceiling.
+
+tiktoken is optional: without it (or without its cached encoding files)
+counts fall back to a characters-per-token estimate.
+"""
+from functools import lru_cache
+from typing import Optional
+import html
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# tiktoken import (optional)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+    logger.warning("tiktoken not installed. Prompt token counts are estimated from length.")
+
+# Fallback estimate (OpenAI averages ~4 characters per English token)
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_MARKER = " ... [truncated]"
+
+# Lines at least this long are dropped when repeated verbatim
+MIN_DEDUP_LINE_LENGTH = 40
+
+# A line starting with a clause number is a clause listing entry only up to
+# this length; longer ones carry requirements and are kept
+MAX_CLAUSE_LINE_LENGTH = 160
+
+# Block-level tags that separate lines once markup is removed
+_BLOCK_TAGS = re.compile(r"<\s*(?:br|/p|p|/div|div|/li|li|/tr|tr|/h[1-6]|h[1-6])\b[^>]*>", re.IGNORECASE)
+_TAGS = re.compile(r"<[^>]+>")
+_INLINE_SPACE = re.compile(r"[ \t\f\v ]+")
+_BLANK_LINES = re.compile(r"\n{2,}")
+
+# A line citing a FAR (52.xxx-x) or DFARS (252.xxx-xxxx) clause, e.g.
+# "52.212-4 Contract Terms and Conditions--Commercial Items (NOV 2023)"
+_CLAUSE_LINE = re.compile(
+    r"^[\s\-*•(]*(?:(?:FAR|DFARS|clause)\s*)?(?:2?52)\.\d{3}-\d{1,4}\b",
+    re.IGNORECASE
+)
+# Standard clause-incorporation sentences (FAR 52.252-2 and similar)
+_CLAUSE_BOILERPLATE = re.compile(
+    r"incorporated?\s+(?:herein\s+)?by\s+reference|full\s+text\s+of\s+a\s+clause\s+may\s+be\s+accessed",
+    re.IGNORECASE
+)
+# Sentence boundary: end punctuation, whitespace, then a capital or opening bracket
+# (a clause number's "52.212-4" has no whitespace after its period)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z(\[\"'])")
+
+
+class TokenCounter:
+    """Counts and truncates text in the tokens of a given OpenAI model."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.encoding = None
+        if TIKTOKEN_AVAILABLE:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self.encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                # Encoding files are fetched once and cached; offline first use fails
+                logger.warning(f"tiktoken encoding for {model} unavailable ({e}). Estimating token counts.")
+
+    @property
+    def exact(self) -> bool:
+        return self.encoding is not None
+
+    def count(self, text: str) -> int:
+        """Tokens in `text`."""
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Keep the first `max_tokens` tokens of `text`.
+
+        Args:
+            text: Text to cut
+            max_tokens: Token budget including the truncation marker
+
+        Returns:
+            `text` unchanged if within budget, else its head plus TRUNCATION_MARKER
+        """
+        if self.count(text) <= max_tokens:
+            return text
+
+        keep = max(max_tokens - self.count(TRUNCATION_MARKER), 0)
+        if self.encoding is not None:
+            head = self.encoding.decode(self.encoding.encode(text, disallowed_special=())[:keep])
+        else:
+            head = text[:keep * CHARS_PER_TOKEN]
+
+        # Don't end mid-word
+        cut = head.rfind(" ")
+        if cut > len(head) * 0.8:
+            head = head[:cut]
+        return head.rstrip() + TRUNCATION_MARKER
+
+
+@lru_cache(maxsize=8)
+def token_counter(model: str) -> TokenCounter:
+    """Shared TokenCounter per model (loading an encoding is not free)."""
+    return TokenCounter(model)
+
+
+def clean_text(text: Optional[str]) -> str:
+    """
+    Normalize free text for a prompt.
+
+    Converts HTML to plain text, drops short FAR/DFARS clause listing lines
+    and incorporation-by-reference sentences (leaving a one-line note of how
+    many were omitted), drops repeated lines and collapses whitespace. The
+    rest of a line containing a boilerplate sentence is kept: plain-text
+    descriptions are often one paragraph.
+
+    Args:
+        text: Raw description or statement (HTML allowed)
+
+    Returns:
+        Cleaned text ('' for empty input)
+    """
+    if not text:
+        return ""
+
+    text = _BLOCK_TAGS.sub("\n", text)
+    text = _TAGS.sub(" ", text)
+    text = html.unescape(text)
+
+    lines = []
+    seen = set()
+    omitted = 0
+    marker_at = None
+    for line in text.splitlines():
+        line = _INLINE_SPACE.sub(" ", line).strip()
+        if not line:
+            if lines and lines[-1]:
+                lines.append("")
+            continue
+        dropped = 0
+        if _CLAUSE_LINE.match(line) and len(line) <= MAX_CLAUSE_LINE_LENGTH:
+            dropped, line = 1, ""
+        elif _CLAUSE_BOILERPLATE.search(line):
+            sentences = _SENTENCE_END.split(line)
+            kept = [sentence for sentence in sentences if not _CLAUSE_BOILERPLATE.search(sentence)]
+            dropped, line = len(sentences) - len(kept), " ".join(kept)
+        if dropped:
+            # One note where the clause listing was
+            if marker_at is None:
+                marker_at = len(lines)
+                lines.append("")
+            omitted += dropped
+            if not line:
+                continue
+        # Repeated sentences (pasted instructions, amendment restatements)
+        if len(line) >= MIN_DEDUP_LINE_LENGTH:
+            if line in seen:
+                continue
+            seen.add(line)
+        lines.append(line)
+
+    if marker_at is not None:
+        lines[marker_at] = f"[{omitted} FAR/DFARS clause lines/sentences omitted]"
+
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def budget_section(counter: TokenCounter, text: Optional[str], max_tokens: int, empty: str) -> str:
+    """
+    Cleaned text cut to a token budget.
+
+    Args:
+        counter: TokenCounter for the target model
+        text: Raw section text
+        max_tokens: Token budget for the section
+        empty: Placeholder when nothing is left
+
+    Returns:
+        Text ready to paste into the prompt
+    """
+    cleaned = clean_text(text)
+    if not cleaned:
+        return empty
+    return counter.truncate(cleaned, max_tokens)
+
+
+def completion_budget(prompt_tokens: int, base: int, per_prompt_token: float, ceiling: int) -> int:
+    """
+    max_tokens for a JSON response sized to its prompt.
+
+    The response lists requirements, strengths and risks drawn from the
+    opportunity text, so it grows with the prompt; `base` covers the fixed
+    JSON skeleton and short reasoning.
+
+    Args:
+        prompt_tokens: Tokens in system + user messages
+        base: Tokens for a minimal complete response
+        per_prompt_token: Extra completion tokens per prompt token
+        ceiling: Upper bound (the previous fixed max_tokens)
+
+    Returns:
+        Completion token budget
+    """
+    return min(ceiling, base + int(prompt_tokens * per_prompt_token))
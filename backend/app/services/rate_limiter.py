@@ -0,0 +1,102 @@
+"""
+Token-bucket rate limiter for outbound API calls (SAM.gov, OpenAI).
+"""
+from typing import Optional
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaExhausted(Exception):
+    """Raised when the daily request quota has been used up."""
+
+
+class TokenBucketLimiter:
+    """
+    Async token-bucket limiter with an optional daily quota.
+
+    The bucket refills at `rate` tokens per second up to `burst` tokens, so a
+    short burst of requests goes out immediately while sustained traffic is
+    smoothed to `rate`. `daily_quota` is a hard cap on total acquisitions;
+    once reached, acquire() raises QuotaExhausted instead of waiting.
+
+    Instances must be created inside the event loop that uses them.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        daily_quota: Optional[int] = None,
+        used_today: int = 0
+    ):
+        """
+        Args:
+            rate: Sustained requests per second
+            burst: Maximum requests allowed back-to-back
+            daily_quota: Maximum requests per day (None = unlimited)
+            used_today: Requests already spent against the daily quota
+        """
+        self.rate = rate
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.used = used_today
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def remaining_quota(self) -> Optional[int]:
+        """Requests left in the daily quota, or None if unlimited."""
+        if self.daily_quota is None:
+            return None
+        return max(self.daily_quota - self.used, 0)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop handing out tokens for `seconds` (e.g. after an HTTP 429).
+
+        Applies to every caller sharing this limiter, so concurrent workers
+        back off together instead of hammering the upstream one by one.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+        self._updated = self._paused_until
+
+    async def acquire(self, amount: float = 1) -> None:
+        """
+        Wait until a request may be sent. Raises QuotaExhausted at the daily cap.
+
+        Args:
+            amount: Tokens to take (e.g. estimated LLM tokens for a
+                tokens-per-minute bucket); capped at `burst`. Counts as one
+                request against the daily quota.
+        """
+        amount = min(float(amount), float(self.burst))
+        async with self._lock:
+            while True:
+                if self.daily_quota is not None and self.used >= self.daily_quota:
+                    raise QuotaExhausted(
+                        f"Daily rate limit quota of {self.daily_quota} requests exhausted"
+                    )
+
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    self.used += 1
+                    return
+
+                await asyncio.sleep((amount - self._tokens) / self.rate)
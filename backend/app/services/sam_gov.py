@@ -1,10 +1,17 @@
 """
 SAM.gov API integration service for discovering government contract opportunities
 """
-from typing import List, Dict, Optional, Tuple
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 import httpx
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from app.core.config import settings
+from app.services.rate_limiter import TokenBucketLimiter, QuotaExhausted
+from app.services.http_cache import CachedResponse, HTTPResponseCache, default_cache_path
+from app.services.opportunity import compute_content_hash
+import asyncio
+import random
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,6 +20,63 @@ logger = logging.getLogger(__name__)
 DEFAULT_CACHE_MINUTES = 15
 
 
+@lru_cache(maxsize=8192)
+def _parse_sam_date(date_str: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a SAM.gov date string to datetime, memoized.
+
+    A page repeats the same handful of posted/deadline strings many times,
+    and datetimes are immutable, so results are safely shared.
+    """
+    if not date_str:
+        return None
+
+    # SAM.gov typically uses format: "YYYY-MM-DDTHH:MM:SS-05:00" or "MM/DD/YYYY"
+    try:
+        # Try ISO format first
+        if "T" in date_str:
+            return datetime.fromisoformat(date_str.replace("Z", "+00:00").split(".")[0])
+        # Try MM/DD/YYYY format
+        elif "/" in date_str:
+            return datetime.strptime(date_str, "%m/%d/%Y")
+        # Try YYYY-MM-DD format
+        elif "-" in date_str and len(date_str) == 10:
+            return datetime.strptime(date_str, "%Y-%m-%d")
+    except Exception as e:
+        logger.warning(f"Could not parse date '{date_str}': {str(e)}")
+
+    return None
+
+
+class FetchStats:
+    """Metrics collected while a batch fetch runs."""
+    def __init__(self):
+        self.naics_stats: Dict[str, Dict] = {}
+        self.errors: List[str] = []
+        self.quota_exhausted = False
+
+    @property
+    def api_calls(self) -> int:
+        return sum(s["api_calls"] for s in self.naics_stats.values())
+
+    @property
+    def retries(self) -> int:
+        return sum(s["retries"] for s in self.naics_stats.values())
+
+    @property
+    def cache_hits(self) -> int:
+        return sum(s["cache_hits"] for s in self.naics_stats.values())
+
+    def to_dict(self) -> Dict:
+        return {
+            'api_calls': self.api_calls,
+            'retries': self.retries,
+            'cache_hits': self.cache_hits,
+            'naics_stats': self.naics_stats,
+            'errors': self.errors if self.errors else None
+        }
+
+
 class SAMGovService:
     """Service for interacting with SAM.gov API"""
 
@@ -23,6 +87,14 @@ class SAMGovService:
         if not self.api_key:
             logger.warning("SAM.gov API key not configured. Using public access (limited rate).")
 
+        self.response_cache: Optional[HTTPResponseCache] = None
+        if settings.SAM_HTTP_CACHE_ENABLED:
+            self.response_cache = HTTPResponseCache(
+                path=settings.SAM_HTTP_CACHE_PATH or default_cache_path("sam_http_cache.sqlite3"),
+                ttl_seconds=settings.SAM_HTTP_CACHE_TTL_SECONDS,
+                max_bytes=settings.SAM_HTTP_CACHE_MAX_MB * 1024 * 1024
+            )
+
     def check_cache_freshness(
         self,
         db,
@@ -193,10 +265,8 @@ class SAMGovService:
             try:
                 async with httpx.AsyncClient(timeout=30.0) as client:
                     logger.info(f"Fetching opportunities for NAICS {naics_code} from SAM.gov...")
-                    response = await client.get(self.BASE_URL, params=params)
-                    api_calls += 1
-                    response.raise_for_status()
-                    data = response.json()
+                    data, called = await self._cached_get(client, params)
+                    api_calls += called
 
                     opportunities = data.get("opportunitiesData", [])
                     count = data.get("totalRecords", 0)
@@ -236,113 +306,448 @@ class SAMGovService:
             "api_calls": api_calls
         }
 
-    async def search_opportunities_batch(
+    def _build_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client shared by every request in a batch."""
+        http2 = settings.SAM_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("h2 package not installed - using HTTP/1.1 for SAM.gov")
+                http2 = False
+
+        limits = httpx.Limits(
+            max_connections=settings.SAM_MAX_CONCURRENCY,
+            max_keepalive_connections=settings.SAM_MAX_CONCURRENCY
+        )
+        return httpx.AsyncClient(timeout=30.0, http2=http2, limits=limits)
+
+    def _backoff_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Seconds to wait before retry `attempt`, honouring Retry-After if present."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), settings.SAM_BACKOFF_MAX_SECONDS)
+
+        delay = min(2 ** attempt, settings.SAM_BACKOFF_MAX_SECONDS)
+        return delay + random.uniform(0, 1)
+
+    async def _cached_get(self, client: httpx.AsyncClient, params: Dict) -> Tuple[Dict, int]:
+        """
+        GET one SAM.gov search page through the response cache (no retries).
+
+        Returns:
+            Tuple of (parsed JSON, number of upstream requests made: 0 or 1)
+        """
+        cached = self.response_cache.lookup(self.BASE_URL, params) if self.response_cache else None
+        if cached and cached.is_fresh(self.response_cache.ttl_seconds):
+            return cached.json(), 0
+
+        headers = cached.conditional_headers if cached else {}
+        response = await client.get(self.BASE_URL, params=params, headers=headers)
+        return self._read_response(response, params, cached), 1
+
+    def _read_response(
         self,
-        naics_codes: List[str],
-        posted_from: Optional[datetime] = None,
-        posted_to: Optional[datetime] = None,
-        limit: int = 1000
+        response: httpx.Response,
+        params: Dict,
+        cached: Optional[CachedResponse] = None
     ) -> Dict:
-        """
-        Fetch opportunities for multiple NAICS codes efficiently.
+        """Decode a search response, serving 304s from the cache and storing 200s."""
+        if response.status_code == 304 and cached is not None:
+            self.response_cache.mark_revalidated(cached)
+            return cached.json()
+
+        response.raise_for_status()
+        data = response.json()
+        if self.response_cache:
+            self.response_cache.store(
+                self.BASE_URL,
+                params,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+        return data
 
-        This is the optimized method for discovery runs - makes one call
-        per NAICS code but handles pagination and deduplication.
+    async def _fetch_with_retry(
+        self,
+        client: httpx.AsyncClient,
+        limiter: TokenBucketLimiter,
+        params: Dict,
+        stats: Dict
+    ) -> Dict:
+        """
+        GET one SAM.gov search page, retrying 429, 5xx and network errors.
 
         Args:
-            naics_codes: List of NAICS codes to search
-            posted_from: Only fetch opportunities posted after this date
-            posted_to: Only fetch opportunities posted before this date (default: now)
-            limit: Maximum total opportunities to fetch
+            client: Shared HTTP client
+            limiter: Shared rate limiter (paused for everyone on 429)
+            params: Query parameters
+            stats: Per-code stats dict; 'api_calls', 'retries' and
+                'cache_hits' are incremented
 
         Returns:
-            Dict with opportunities list, total count, and API call count
+            Parsed JSON response (from the response cache when still fresh)
+
+        Raises:
+            QuotaExhausted: Daily quota used up
+            httpx.HTTPStatusError / httpx.RequestError: Retries exhausted
         """
-        all_opportunities = []
-        api_calls = 0
-        errors = []
+        cached = self.response_cache.lookup(self.BASE_URL, params) if self.response_cache else None
+        if cached and cached.is_fresh(self.response_cache.ttl_seconds):
+            stats["cache_hits"] += 1
+            return cached.json()
+        headers = cached.conditional_headers if cached else {}
+
+        attempt = 0
+        while True:
+            await limiter.acquire()
+            stats["api_calls"] += 1
 
-        # Default date range
+            try:
+                response = await client.get(self.BASE_URL, params=params, headers=headers)
+            except httpx.RequestError as e:
+                if attempt >= settings.SAM_MAX_RETRIES:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(f"SAM.gov request error ({e}), retrying in {delay:.1f}s")
+            else:
+                retryable = response.status_code == 429 or response.status_code >= 500
+                if not retryable or attempt >= settings.SAM_MAX_RETRIES:
+                    return self._read_response(response, params, cached)
+
+                delay = self._backoff_delay(attempt, response)
+                if response.status_code == 429:
+                    limiter.pause(delay)
+                logger.warning(
+                    f"SAM.gov HTTP {response.status_code} for NAICS {params.get('ncode')}, "
+                    f"retrying in {delay:.1f}s"
+                )
+
+            attempt += 1
+            stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    def _normalize_window(
+        self,
+        posted_from: Optional[datetime],
+        posted_to: Optional[datetime]
+    ) -> Tuple[datetime, datetime]:
+        """Apply the default 30-day window and strip tzinfo for strftime."""
         if not posted_from:
             posted_from = datetime.now(timezone.utc) - timedelta(days=30)
         if not posted_to:
             posted_to = datetime.now(timezone.utc)
 
-        # Make datetimes timezone-naive for strftime
         if posted_from.tzinfo:
             posted_from = posted_from.replace(tzinfo=None)
         if posted_to.tzinfo:
             posted_to = posted_to.replace(tzinfo=None)
 
+        return posted_from, posted_to
+
+    async def iter_opportunity_pages(
+        self,
+        naics_codes: List[str],
+        posted_from: Optional[datetime] = None,
+        posted_to: Optional[datetime] = None,
+        daily_calls_used: int = 0,
+        stats: Optional[FetchStats] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream every page of results for multiple NAICS codes.
+
+        Each NAICS code is paginated by offset until its totalRecords have
+        been fetched. Codes run concurrently (up to SAM_MAX_CONCURRENCY) over
+        a single pooled client, and pages are yielded as soon as they arrive,
+        so the caller can process page N while page N+1 is still in flight.
+        A shared token bucket keeps the run inside SAM.gov's burst and daily
+        quotas; 429 responses back off and retry instead of aborting.
+
+        Closing the generator (aclose()) cancels any outstanding requests;
+        callers that stop early must close it rather than just breaking out.
+
+        Args:
+            naics_codes: List of NAICS codes to search
+            posted_from: Only fetch opportunities posted after this date
+            posted_to: Only fetch opportunities posted before this date (default: now)
+            daily_calls_used: API calls already spent today against SAM_DAILY_QUOTA
+            stats: Optional FetchStats to collect per-code metrics and errors into
+
+        Yields:
+            Dict with 'naics_code', 'offset', 'total_records' and
+            'opportunities' (raw records, deduplicated across the run)
+        """
+        stats = stats if stats is not None else FetchStats()
+        posted_from, posted_to = self._normalize_window(posted_from, posted_to)
+
         logger.info(
             f"Batch search: {len(naics_codes)} NAICS codes, "
             f"date range {posted_from.strftime('%Y-%m-%d')} to {posted_to.strftime('%Y-%m-%d')}"
         )
 
-        for naics_code in naics_codes:
-            if len(all_opportunities) >= limit:
-                logger.info(f"Reached limit of {limit} opportunities")
-                break
+        limiter = TokenBucketLimiter(
+            rate=settings.SAM_RATE_LIMIT_PER_SECOND,
+            burst=settings.SAM_RATE_LIMIT_BURST,
+            daily_quota=settings.SAM_DAILY_QUOTA or None,
+            used_today=daily_calls_used
+        )
+        semaphore = asyncio.Semaphore(settings.SAM_MAX_CONCURRENCY)
+        # Bounded so fetchers pause when the consumer falls behind
+        pages: asyncio.Queue = asyncio.Queue(maxsize=settings.SAM_MAX_CONCURRENCY * 2)
+        done = object()
+        seen = set()
 
-            params = {
-                "api_key": self.api_key,
-                "limit": min(100, limit - len(all_opportunities)),
-                "offset": 0,
-                "postedFrom": posted_from.strftime("%m/%d/%Y"),
-                "postedTo": posted_to.strftime("%m/%d/%Y"),
-                "ncode": naics_code
-            }
+        async def fetch_code(client: httpx.AsyncClient, naics_code: str) -> None:
+            async with semaphore:
+                if stats.quota_exhausted:
+                    return
 
+                code_stats = {"api_calls": 0, "retries": 0, "cache_hits": 0, "pages": 0, "count": 0}
+                stats.naics_stats[naics_code] = code_stats
+                started = time.monotonic()
+                offset = 0
+
+                try:
+                    while not stats.quota_exhausted:
+                        params = {
+                            "api_key": self.api_key,
+                            "limit": settings.SAM_PAGE_SIZE,
+                            "offset": offset,
+                            "postedFrom": posted_from.strftime("%m/%d/%Y"),
+                            "postedTo": posted_to.strftime("%m/%d/%Y"),
+                            "ncode": naics_code
+                        }
+
+                        logger.info(f"Fetching NAICS {naics_code} (offset {offset})...")
+                        data = await self._fetch_with_retry(client, limiter, params, code_stats)
+
+                        opportunities = data.get("opportunitiesData") or []
+                        total_records = data.get("totalRecords", 0)
+                        code_stats["pages"] += 1
+                        code_stats["count"] += len(opportunities)
+                        code_stats["total_records"] = total_records
+
+                        unique = []
+                        for opp in opportunities:
+                            notice_id = opp.get("noticeId")
+                            if notice_id and notice_id not in seen:
+                                seen.add(notice_id)
+                                unique.append(opp)
+
+                        if unique:
+                            await pages.put({
+                                "naics_code": naics_code,
+                                "offset": offset,
+                                "total_records": total_records,
+                                "opportunities": unique
+                            })
+
+                        offset += len(opportunities)
+                        if not opportunities or offset >= total_records:
+                            break
+
+                    logger.info(f"NAICS {naics_code}: {code_stats['count']} opportunities")
+
+                except QuotaExhausted as e:
+                    stats.quota_exhausted = True
+                    code_stats["error"] = "quota_exhausted"
+                    stats.errors.append(f"NAICS {naics_code}: {e}")
+                    logger.warning(f"SAM.gov {e} - skipping remaining NAICS codes")
+
+                except httpx.HTTPStatusError as e:
+                    error_msg = f"NAICS {naics_code}: HTTP {e.response.status_code}"
+                    code_stats["error"] = f"HTTP {e.response.status_code}"
+                    logger.error(f"SAM.gov API error: {error_msg}")
+                    stats.errors.append(error_msg)
+
+                except Exception as e:
+                    error_msg = f"NAICS {naics_code}: {str(e)}"
+                    code_stats["error"] = str(e)
+                    logger.error(f"Error: {error_msg}")
+                    stats.errors.append(error_msg)
+
+                finally:
+                    code_stats["latency_ms"] = round((time.monotonic() - started) * 1000)
+
+        async def produce(client: httpx.AsyncClient) -> None:
+            await asyncio.gather(*(fetch_code(client, code) for code in naics_codes))
+            await pages.put(done)
+
+        async with self._build_client() as client:
+            producer = asyncio.create_task(produce(client))
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    logger.info(f"Fetching NAICS {naics_code}...")
-                    response = await client.get(self.BASE_URL, params=params)
-                    api_calls += 1
-                    response.raise_for_status()
-                    data = response.json()
+                while True:
+                    page = await pages.get()
+                    if page is done:
+                        break
+                    yield page
+            finally:
+                if not producer.done():
+                    producer.cancel()
+                    try:
+                        await producer
+                    except asyncio.CancelledError:
+                        pass
 
-                    opportunities = data.get("opportunitiesData", [])
-                    logger.info(f"NAICS {naics_code}: {len(opportunities)} opportunities")
-                    all_opportunities.extend(opportunities)
+        logger.info(
+            f"Batch complete: {len(seen)} unique opportunities from {stats.api_calls} API calls "
+            f"({stats.retries} retries)"
+        )
 
-            except httpx.HTTPStatusError as e:
-                api_calls += 1
-                error_msg = f"NAICS {naics_code}: HTTP {e.response.status_code}"
-                logger.error(f"SAM.gov API error: {error_msg}")
-                errors.append(error_msg)
+    async def search_opportunities_batch(
+        self,
+        naics_codes: List[str],
+        posted_from: Optional[datetime] = None,
+        posted_to: Optional[datetime] = None,
+        limit: int = 1000,
+        daily_calls_used: int = 0
+    ) -> Dict:
+        """
+        Fetch opportunities for multiple NAICS codes into a single list.
 
-                # Check if rate limited
-                if e.response.status_code == 429:
-                    logger.warning("Rate limited - stopping batch search")
-                    break
+        Collects the pages streamed by iter_opportunity_pages until `limit`
+        records have been gathered. Prefer iterating pages directly for large
+        runs so results need not be held in memory at once.
 
-            except Exception as e:
-                error_msg = f"NAICS {naics_code}: {str(e)}"
-                logger.error(f"Error: {error_msg}")
-                errors.append(error_msg)
+        Args:
+            naics_codes: List of NAICS codes to search
+            posted_from: Only fetch opportunities posted after this date
+            posted_to: Only fetch opportunities posted before this date (default: now)
+            limit: Maximum total opportunities to fetch
+            daily_calls_used: API calls already spent today against SAM_DAILY_QUOTA
 
-        # Deduplicate
-        seen = set()
-        unique = []
-        for opp in all_opportunities:
-            notice_id = opp.get("noticeId")
-            if notice_id and notice_id not in seen:
-                seen.add(notice_id)
-                unique.append(opp)
+        Returns:
+            Dict with opportunities list, total count, API call and retry
+            counts, and per-code stats ('naics_stats')
+        """
+        stats = FetchStats()
+        opportunities = []
+
+        pages = self.iter_opportunity_pages(
+            naics_codes,
+            posted_from=posted_from,
+            posted_to=posted_to,
+            daily_calls_used=daily_calls_used,
+            stats=stats
+        )
+        try:
+            async for page in pages:
+                opportunities.extend(page["opportunities"])
+                if len(opportunities) >= limit:
+                    logger.info(f"Reached limit of {limit} opportunities")
+                    break
+        finally:
+            # Breaking out only suspends the generator; closing it cancels
+            # the fetchers instead of leaving them to finish every NAICS code
+            await pages.aclose()
 
-        logger.info(f"Batch complete: {len(unique)} unique opportunities from {api_calls} API calls")
+        opportunities = opportunities[:limit]
 
         return {
-            "opportunities": unique,
-            "total_count": len(unique),
-            "api_calls": api_calls,
-            "errors": errors if errors else None
+            "opportunities": opportunities,
+            "total_count": len(opportunities),
+            **stats.to_dict()
         }
 
+    def parse_opportunity_row(self, raw_data: Dict) -> Dict:
+        """
+        Parse a SAM.gov record into Opportunity column values only.
+
+        This is the lean parser used by bulk discovery: no deprecated alias
+        keys, no per-record timestamps, and dates resolved through a shared
+        memo. Raises on malformed records so callers can count them.
+
+        Args:
+            raw_data: Raw opportunity data from SAM.gov API
+
+        Returns:
+            Dict keyed by Opportunity column names, including content_hash
+        """
+        get = raw_data.get
+
+        award = get("award") or {}
+        award_amount = None
+        if award.get("amount"):
+            try:
+                award_amount = float(award["amount"])
+            except (ValueError, TypeError):
+                pass
+
+        pop = get("placeOfPerformance") or {}
+        city = pop.get("city", "")
+        state = pop.get("state", "")
+
+        contacts = get("pointOfContact")
+        contact = contacts[0] if contacts else {}
+
+        attachment_links = [
+            {"name": attachment.get("name", ""), "url": attachment["link"]}
+            for attachment in get("attachments") or []
+            if attachment.get("link")
+        ]
+
+        row = {
+            "source": "sam.gov",
+            "source_id": get("noticeId", ""),
+            "solicitation_number": get("solicitationNumber", ""),
+            "title": get("title", ""),
+            "description": get("description", "") or get("additionalInfoText", ""),
+            "notice_type": get("type", ""),
+            "agency": get("department", ""),
+            "sub_agency": get("subTier", ""),
+            "office": get("office", ""),
+            "naics_code": get("naicsCode", ""),
+            "naics_description": get("classificationCode") or get("naicsDescription") or "",
+            "psc_code": get("productServiceCode", ""),
+            "set_aside_type": get("typeOfSetAside", ""),
+            "pop_city": city.get("name", "") if isinstance(city, dict) else city,
+            "pop_state": state.get("code", "") if isinstance(state, dict) else state,
+            "pop_zip": pop.get("zip", ""),
+            "posted_date": _parse_sam_date(get("postedDate")),
+            "response_deadline": _parse_sam_date(get("responseDeadLine")),
+            "estimated_value_high": award_amount,
+            "contact_name": contact.get("fullName", ""),
+            "contact_email": contact.get("email", ""),
+            "contact_phone": contact.get("phone", ""),
+            "source_url": get("uiLink", ""),
+            "attachments": attachment_links if attachment_links else None,
+            "status": "active",
+            "raw_data": raw_data,
+        }
+        # Fingerprint used by the upsert to skip unchanged records
+        row["content_hash"] = compute_content_hash(row)
+        return row
+
+    def parse_page(self, raw_opportunities: List[Dict]) -> Tuple[List[Dict], int]:
+        """
+        Parse one search page with the lean parser.
+
+        Args:
+            raw_opportunities: Records from one SAM.gov response
+
+        Returns:
+            Tuple of (parsed rows, number of records that failed to parse)
+        """
+        parse_row = self.parse_opportunity_row
+        parsed = []
+        errors = 0
+        for raw_opp in raw_opportunities:
+            try:
+                parsed.append(parse_row(raw_opp))
+            except Exception as e:
+                logger.error(f"Error parsing opportunity {raw_opp.get('noticeId', 'unknown')}: {e}")
+                errors += 1
+        return parsed, errors
+
     def parse_opportunity(self, raw_data: Dict) -> Dict:
         """
         Parse SAM.gov opportunity data into our internal format
 
+        Returns the lean column row plus the deprecated alias keys that older
+        callers still read. Bulk paths should use parse_page instead.
+
         Args:
             raw_data: Raw opportunity data from SAM.gov API
 
@@ -350,138 +755,7 @@ class SAMGovService:
             Dict with parsed opportunity data
         """
         try:
-            # Extract basic information
-            notice_id = raw_data.get("noticeId", "")
-            title = raw_data.get("title", "")
-            description = raw_data.get("description", "") or raw_data.get("additionalInfoText", "")
-
-            # Department and office information
-            department = raw_data.get("department", "")
-            sub_tier = raw_data.get("subTier", "")
-            office = raw_data.get("office", "")
-
-            # Classification
-            naics_code = raw_data.get("naicsCode", "")
-            naics_description = raw_data.get("classificationCode", "")
-            psc_code = raw_data.get("productServiceCode", "")
-            set_aside = raw_data.get("typeOfSetAside", "")
-
-            # Financial information
-            award_amount = None
-            if "award" in raw_data and raw_data["award"].get("amount"):
-                try:
-                    award_amount = float(raw_data["award"]["amount"])
-                except (ValueError, TypeError):
-                    pass
-
-            # Dates
-            posted_date = self._parse_date(raw_data.get("postedDate"))
-            response_deadline = self._parse_date(raw_data.get("responseDeadLine"))
-            archive_date = self._parse_date(raw_data.get("archiveDate"))
-
-            # Location
-            pop = raw_data.get("placeOfPerformance", {})
-            pop_city = pop.get("city", {}).get("name", "") if isinstance(pop.get("city"), dict) else pop.get("city", "")
-            pop_state = pop.get("state", {}).get("code", "") if isinstance(pop.get("state"), dict) else pop.get("state", "")
-            pop_zip = pop.get("zip", "")
-            pop_country = pop.get("country", {}).get("code", "") if isinstance(pop.get("country"), dict) else "USA"
-
-            # Contact information
-            contact = raw_data.get("pointOfContact", [{}])[0] if raw_data.get("pointOfContact") else {}
-            primary_contact_name = contact.get("fullName", "")
-            primary_contact_email = contact.get("email", "")
-            primary_contact_phone = contact.get("phone", "")
-
-            # Links
-            link = raw_data.get("uiLink", "")
-
-            # Extract attachment links
-            attachment_links = []
-            for attachment in raw_data.get("attachments", []):
-                if attachment.get("link"):
-                    attachment_links.append({
-                        "name": attachment.get("name", ""),
-                        "url": attachment.get("link", "")
-                    })
-
-            # Type and other fields
-            opportunity_type = raw_data.get("type", "")
-            solicitation_number = raw_data.get("solicitationNumber", "")
-            award_number = raw_data.get("award", {}).get("number", "")
-
-            return {
-                # Identity fields
-                "source": "sam.gov",
-                "source_id": notice_id,
-                "solicitation_number": solicitation_number,
-
-                # Core information
-                "title": title,
-                "description": description,
-                "notice_type": opportunity_type,
-
-                # Agency fields - normalized to match Opportunity model
-                "issuing_agency": department,
-                "issuing_sub_agency": sub_tier,
-                "issuing_office": office,
-
-                # Classification
-                "naics_code": naics_code,
-                "psc_code": psc_code,
-                "set_aside_type": set_aside,
-
-                # Location
-                "pop_city": pop_city,
-                "pop_state": pop_state,
-                "pop_zip": pop_zip,
-
-                # Dates
-                "posted_date": posted_date,
-                "response_deadline": response_deadline,
-
-                # Financial
-                "estimated_value_high": award_amount,
-
-                # Contact
-                "contact_name": primary_contact_name,
-                "contact_email": primary_contact_email,
-                "contact_phone": primary_contact_phone,
-
-                # Links
-                "source_url": link,
-                "attachments": attachment_links if attachment_links else None,
-
-                # Status
-                "status": "active",
-
-                # Raw data for reference
-                "raw_data": raw_data,
-
-                # Legacy fields for backward compatibility (deprecated)
-                "notice_id": notice_id,
-                "department": department,
-                "sub_tier": sub_tier,
-                "office": office,
-                "naics_description": naics_description,
-                "set_aside": set_aside,
-                "contract_value": award_amount,
-                "archive_date": archive_date,
-                "place_of_performance_city": pop_city,
-                "place_of_performance_state": pop_state,
-                "place_of_performance_zip": pop_zip,
-                "place_of_performance_country": pop_country,
-                "primary_contact_name": primary_contact_name,
-                "primary_contact_email": primary_contact_email,
-                "primary_contact_phone": primary_contact_phone,
-                "link": link,
-                "attachment_links": attachment_links,
-                "type": opportunity_type,
-                "award_number": award_number,
-                "award_amount": award_amount,
-                "is_active": True,
-                "last_synced_at": datetime.utcnow()
-            }
-
+            row = self.parse_opportunity_row(raw_data)
         except Exception as e:
             logger.error(f"Error parsing opportunity {raw_data.get('noticeId', 'unknown')}: {str(e)}")
             # Return minimal data so we don't lose the opportunity
@@ -493,26 +767,43 @@ class SAMGovService:
                 "last_synced_at": datetime.utcnow()
             }
 
-    def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
-        """Parse SAM.gov date string to datetime"""
-        if not date_str:
-            return None
+        pop = raw_data.get("placeOfPerformance") or {}
+        country = pop.get("country")
 
-        # SAM.gov typically uses format: "YYYY-MM-DDTHH:MM:SS-05:00" or "MM/DD/YYYY"
-        try:
-            # Try ISO format first
-            if "T" in date_str:
-                return datetime.fromisoformat(date_str.replace("Z", "+00:00").split(".")[0])
-            # Try MM/DD/YYYY format
-            elif "/" in date_str:
-                return datetime.strptime(date_str, "%m/%d/%Y")
-            # Try YYYY-MM-DD format
-            elif "-" in date_str and len(date_str) == 10:
-                return datetime.strptime(date_str, "%Y-%m-%d")
-        except Exception as e:
-            logger.warning(f"Could not parse date '{date_str}': {str(e)}")
+        return {
+            **row,
+
+            # Agency fields under their parser names (mapped back by the upsert)
+            "issuing_agency": row["agency"],
+            "issuing_sub_agency": row["sub_agency"],
+            "issuing_office": row["office"],
+
+            # Legacy fields for backward compatibility (deprecated)
+            "notice_id": row["source_id"],
+            "department": row["agency"],
+            "sub_tier": row["sub_agency"],
+            "set_aside": row["set_aside_type"],
+            "contract_value": row["estimated_value_high"],
+            "archive_date": _parse_sam_date(raw_data.get("archiveDate")),
+            "place_of_performance_city": row["pop_city"],
+            "place_of_performance_state": row["pop_state"],
+            "place_of_performance_zip": row["pop_zip"],
+            "place_of_performance_country": country.get("code", "") if isinstance(country, dict) else "USA",
+            "primary_contact_name": row["contact_name"],
+            "primary_contact_email": row["contact_email"],
+            "primary_contact_phone": row["contact_phone"],
+            "link": row["source_url"],
+            "attachment_links": row["attachments"] or [],
+            "type": row["notice_type"],
+            "award_number": (raw_data.get("award") or {}).get("number", ""),
+            "award_amount": row["estimated_value_high"],
+            "is_active": True,
+            "last_synced_at": datetime.utcnow()
+        }
 
-        return None
+    def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
+        """Parse SAM.gov date string to datetime"""
+        return _parse_sam_date(date_str)
 
     def map_set_aside_to_sam(self, set_aside: str) -> Optional[str]:
         """
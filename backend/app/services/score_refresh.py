@@ -0,0 +1,669 @@
+"""
+Post-discovery refresh of the match-score cache (company_opportunity_scores).
+
+Runs after every discovery run so list views can sort by fit without scoring
+anything at request time. Only pairs that changed are rescored:
+
+- companies whose scoring profile changed (or that were never scored) are
+  rescored against every active opportunity;
+- opportunities inserted or updated since the other companies' last refresh
+  (opportunities.updated_at - the upsert only bumps it when content changes)
+  are rescored for those companies.
+
+A pair is only scored when the opportunity is relevant to the company
+according to a cheap NAICS-sector / set-aside index (CandidateIndex); scores
+of pairs that stop being relevant are removed. Scores are computed with the
+vectorized MatchScoringService.compute_matrix and written in bulk, all in
+one transaction.
+
+Profile edits (company.update_company) don't trigger a full rescore: the
+edit is diffed against the old profile and only the sub-scores computed from
+the changed fields are marked dirty (CompanyScoreState.dirty_scores, see
+SUB_SCORE_DEPENDENCIES). The score_recompute job - or the next refresh,
+whichever runs first - recomputes just those columns and fit_score.
+refresh() holds the company_score_states rows locked while it runs, so an
+edit waits for it rather than having its dirty marks cleared. The
+deadline sub-score decays with the clock alone; a nightly pass
+(scripts/age_deadline_scores.py) brings it up to date.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Set
+import hashlib
+import json
+import time
+import logging
+
+import numpy as np
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, load_only
+
+from app.models.company import Company
+from app.models.company_opportunity_score import CompanyOpportunityScore
+from app.models.company_score_state import CompanyScoreState
+from app.models.opportunity import Opportunity
+from app.services.match_scoring import MatchScoringService, match_scoring_service, company_certifications, SUB_SCORES
+
+logger = logging.getLogger(__name__)
+
+# Bump when the scoring rules change so every company is rescored
+SCORING_VERSION = 1
+
+# Company fields read by MatchScoringService -> sub-scores computed from them
+# (changes to other fields don't rescore)
+SUB_SCORE_DEPENDENCIES = {
+    'naics_codes': ('naics',),
+    'set_asides': ('cert',),
+    'certifications': ('cert',),
+    'geographic_preferences': ('geo',),
+    'contract_value_range': ('size',),
+}
+SCORING_PROFILE_FIELDS = tuple(SUB_SCORE_DEPENDENCIES)
+
+# Sub-scores whose inputs also decide which pairs are relevant (CandidateIndex)
+RELEVANCE_SUB_SCORES = frozenset({'naics', 'cert'})
+
+# Opportunity columns read by MatchScoringService
+SCORING_OPPORTUNITY_COLUMNS = (
+    Opportunity.id, Opportunity.naics_code, Opportunity.set_aside_type,
+    Opportunity.estimated_value_high, Opportunity.pop_state, Opportunity.response_deadline
+)
+
+# Opportunities loaded and scored per step
+REFRESH_CHUNK_SIZE = 1000
+
+# Changed-since window overlap: an upsert that started before the last refresh
+# may have committed after it. Rescoring is idempotent.
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+def scoring_profile(company: Company) -> Dict:
+    """The company fields match scores depend on (lists sorted)."""
+    profile = {}
+    for field in SCORING_PROFILE_FIELDS:
+        value = getattr(company, field, None)
+        profile[field] = sorted(value) if isinstance(value, (list, tuple)) else value
+    return profile
+
+
+def _fingerprint(profile: Dict) -> str:
+    payload = json.dumps({'version': SCORING_VERSION, **profile}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def profile_fingerprint(company: Company) -> str:
+    """SHA-256 of the company fields (and rules version) match scores depend on."""
+    return _fingerprint(scoring_profile(company))
+
+
+def dirty_sub_scores(before: Dict, after: Dict) -> Set[str]:
+    """
+    Sub-scores invalidated by a profile change.
+
+    Args:
+        before: scoring_profile() before the edit
+        after: scoring_profile() after the edit
+
+    Returns:
+        Names from SUB_SCORES (empty and missing values are the same "no data")
+    """
+    dirty = set()
+    for field, sub_scores in SUB_SCORE_DEPENDENCIES.items():
+        if (before.get(field) or None) != (after.get(field) or None):
+            dirty.update(sub_scores)
+    return dirty
+
+
+class CandidateIndex:
+    """
+    Which companies an opportunity is relevant to.
+
+    An opportunity is relevant to a company when they share a 2-digit NAICS
+    sector (either side without NAICS codes matches everything) and, for a
+    set-aside requiring certifications, the company holds one of them.
+    """
+
+    def __init__(self, companies: Sequence[Company]):
+        self.companies = list(companies)
+        self._everyone = set(range(len(self.companies)))
+        self._by_sector: Dict[str, Set[int]] = defaultdict(set)
+        self._without_naics: Set[int] = set()
+        self._certs: List[Set[str]] = []
+
+        for j, company in enumerate(self.companies):
+            codes = [code for code in (company.naics_codes or []) if code]
+            if not codes:
+                self._without_naics.add(j)
+            for code in codes:
+                self._by_sector[code[:2]].add(j)
+            self._certs.append(set(company_certifications(company)))
+
+    def candidates(self, opportunity: Opportunity) -> Set[int]:
+        """Indexes (into companies) of the companies the opportunity is relevant to."""
+        if opportunity.naics_code:
+            matches = self._by_sector.get(opportunity.naics_code[:2], set()) | self._without_naics
+        else:
+            matches = self._everyone
+
+        set_aside = opportunity.set_aside_type
+        if set_aside and set_aside.upper() not in ['NONE', 'N/A', '']:
+            required = set(MatchScoringService.CERT_MAP.get(set_aside, []))
+            if required:
+                matches = {j for j in matches if self._certs[j] & required}
+
+        return matches
+
+    def mask(self, opportunities: Sequence[Opportunity]) -> np.ndarray:
+        """Boolean (len(opportunities), len(companies)) relevance matrix."""
+        mask = np.zeros((len(opportunities), len(self.companies)), dtype=bool)
+        for i, opportunity in enumerate(opportunities):
+            mask[i, list(self.candidates(opportunity))] = True
+        return mask
+
+
+class ScoreRefreshService:
+    """Keep company_opportunity_scores current for all companies."""
+
+    def refresh(self, db: Session, now: Optional[datetime] = None) -> Dict:
+        """
+        Rescore changed (company, opportunity) pairs and record the refresh.
+
+        Args:
+            db: Database session
+            now: Refresh time, also the deadline-score reference (default: utcnow)
+
+        Returns:
+            Dict with companies_rescored, companies_recomputed,
+            opportunities_changed, scores_written and seconds
+        """
+        started = time.monotonic()
+        now = now or datetime.utcnow()
+        result = {'companies_rescored': 0, 'companies_recomputed': 0, 'opportunities_changed': 0, 'scores_written': 0}
+
+        # Locked (in key order, so concurrent refreshes queue up instead of
+        # deadlocking) before the profiles are read: an invalidate() commits
+        # either before this read or after this refresh
+        states = {
+            state.company_id: state for state in db.query(CompanyScoreState)
+            .order_by(CompanyScoreState.company_id)
+            .with_for_update()
+        }
+        # Values, not the ORM rows: those pick up writes made through this session
+        read_hashes = {company_id: state.profile_hash for company_id, state in states.items()}
+        companies = db.query(Company).all()
+        if not companies:
+            db.rollback()
+            return {**result, 'seconds': 0.0}
+
+        fingerprints = {company.id: profile_fingerprint(company) for company in companies}
+
+        changed = [
+            company for company in companies
+            if company.id not in states or states[company.id].profile_hash != fingerprints[company.id]
+        ]
+        changed_ids = {company.id for company in changed}
+        unchanged = [company for company in companies if company.id not in changed_ids]
+
+        try:
+            if changed:
+                # Everything scored from the old profile goes, relevant pairs are rescored
+                db.query(CompanyOpportunityScore).filter(
+                    CompanyOpportunityScore.company_id.in_(changed_ids)
+                ).delete(synchronize_session=False)
+
+                active_ids = [row.id for row in self._active_opportunities(db, now).with_entities(Opportunity.id)]
+                result['companies_rescored'] = len(changed)
+                result['scores_written'] += self._score(db, active_ids, changed, now)
+
+            # Profile edits already diffed by invalidate(): dirty sub-scores only
+            for company in unchanged:
+                dirty = set(states[company.id].dirty_scores or [])
+                if dirty:
+                    counts = self._recompute_sub_scores(db, company, dirty, now)
+                    result['companies_recomputed'] += 1
+                    result['scores_written'] += counts['scores_updated'] + counts['scores_added']
+
+            if unchanged:
+                since = min(states[company.id].refreshed_at for company in unchanged) - REFRESH_OVERLAP
+                changed_opportunity_ids = [
+                    row.id for row in self._active_opportunities(db, now)
+                    .filter(Opportunity.updated_at > since)
+                    .with_entities(Opportunity.id)
+                ]
+                result['opportunities_changed'] = len(changed_opportunity_ids)
+                result['scores_written'] += self._score(db, changed_opportunity_ids, unchanged, now, replace=True)
+
+            self._save_states(db, companies, read_hashes, fingerprints, now)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Score refresh failed: {e}")
+            db.rollback()
+            raise
+
+        result['seconds'] = round(time.monotonic() - started, 2)
+        logger.info(
+            f"Score refresh: {result['companies_rescored']} companies rescored, "
+            f"{result['companies_recomputed']} recomputed, "
+            f"{result['opportunities_changed']} changed opportunities, "
+            f"{result['scores_written']} scores written in {result['seconds']}s"
+        )
+        return result
+
+    def _save_states(
+        self,
+        db: Session,
+        companies: Sequence[Company],
+        read_hashes: Dict,
+        fingerprints: Dict,
+        now: datetime
+    ) -> None:
+        """
+        Record what refresh() scored (no commit).
+
+        An existing state is only advanced while it still holds the
+        profile_hash this run read; a profile edit committed meanwhile keeps
+        its dirty marks for the score_recompute job. States this run created
+        are upserted, as another refresh may have inserted them first.
+
+        Args:
+            db: Database session
+            companies: Companies the refresh covered
+            read_hashes: profile_hash of each existing state as read at the start, by company_id
+            fingerprints: profile_fingerprint() of each company as scored
+            now: Refresh time
+        """
+        new_rows = []
+        for company in companies:
+            read_hash = read_hashes.get(company.id)
+            if read_hash is None:
+                new_rows.append({
+                    'company_id': company.id,
+                    'profile_hash': fingerprints[company.id],
+                    'refreshed_at': now,
+                    'dirty_scores': []
+                })
+                continue
+
+            advanced = db.query(CompanyScoreState).filter(
+                CompanyScoreState.company_id == company.id,
+                CompanyScoreState.profile_hash == read_hash
+            ).update({
+                CompanyScoreState.profile_hash: fingerprints[company.id],
+                CompanyScoreState.refreshed_at: now,
+                CompanyScoreState.dirty_scores: []
+            }, synchronize_session=False)
+            if not advanced:
+                logger.info(f"Company {company.id} profile changed during score refresh, keeping its dirty marks")
+
+        if not new_rows:
+            return
+
+        if db.get_bind().dialect.name == 'postgresql':
+            table = CompanyScoreState.__table__
+            stmt = pg_insert(table).values(new_rows)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.company_id],
+                set_={column: stmt.excluded[column] for column in ('profile_hash', 'refreshed_at', 'dirty_scores')}
+            ))
+        else:
+            for row in new_rows:
+                db.merge(CompanyScoreState(**row))
+
+    def invalidate(self, db: Session, company: Company, before: Dict) -> Set[str]:
+        """
+        Mark the sub-scores a profile edit invalidated (no commit).
+
+        The state's profile_hash is moved to the edited profile, so refresh()
+        recomputes the dirty sub-scores instead of rescoring the company in
+        full.
+
+        Args:
+            db: Database session
+            company: Company with the edit applied
+            before: scoring_profile(company) taken before the edit
+
+        Returns:
+            Sub-scores marked dirty (empty when no recompute job is needed)
+        """
+        dirty = dirty_sub_scores(before, scoring_profile(company))
+        if not dirty:
+            return set()
+
+        # Locked: a running recompute clears the marks when it commits
+        state = db.query(CompanyScoreState).filter(
+            CompanyScoreState.company_id == company.id
+        ).with_for_update().first()
+
+        # Never scored, or scored from an older profile / rules version:
+        # refresh() rescores the company in full anyway
+        if state is None or state.profile_hash != _fingerprint(before):
+            return set()
+
+        state.dirty_scores = sorted(set(state.dirty_scores or []) | dirty)
+        state.profile_hash = profile_fingerprint(company)
+        logger.info(f"Company {company.id} profile edit invalidated sub-scores {sorted(dirty)}")
+        return dirty
+
+    def recompute(self, db: Session, company: Company, now: Optional[datetime] = None) -> Dict:
+        """
+        Recompute a company's dirty sub-scores and fit_score, then clear the marks.
+
+        Args:
+            db: Database session
+            company: Company whose profile was edited
+            now: computed_at of rewritten rows (default: utcnow)
+
+        Returns:
+            Dict with sub_scores, scores_updated, scores_added,
+            scores_removed and seconds
+        """
+        started = time.monotonic()
+        now = now or datetime.utcnow()
+
+        state = db.query(CompanyScoreState).filter(
+            CompanyScoreState.company_id == company.id
+        ).with_for_update().first()
+        dirty = set(state.dirty_scores or []) if state else set()
+        result = {'sub_scores': sorted(dirty), 'scores_updated': 0, 'scores_added': 0, 'scores_removed': 0}
+
+        try:
+            if dirty:
+                result.update(self._recompute_sub_scores(db, company, dirty, now))
+                state.dirty_scores = []
+            db.commit()
+        except Exception as e:
+            logger.error(f"Sub-score recompute for company {company.id} failed: {e}")
+            db.rollback()
+            raise
+
+        result['seconds'] = round(time.monotonic() - started, 2)
+        logger.info(
+            f"Recomputed {result['sub_scores']} for company {company.id}: "
+            f"{result['scores_updated']} updated, {result['scores_added']} added, "
+            f"{result['scores_removed']} removed in {result['seconds']}s"
+        )
+        return result
+
+    def score_opportunities(
+        self,
+        db: Session,
+        company: Company,
+        opportunity_ids: List,
+        now: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Score opportunities one discovery run wrote for the company that ran it.
+
+        Other companies get them at the next refresh(), which rescores
+        everything updated since their last refresh. A company that was
+        never scored, or has a profile edit pending, is left to refresh() and
+        the score_recompute job as well.
+
+        Args:
+            db: Database session
+            company: Company the discovery ran for
+            opportunity_ids: Opportunities the run inserted or updated
+            now: Deadline-score reference and computed_at (default: utcnow)
+
+        Returns:
+            Dict with scores_written and seconds
+        """
+        started = time.monotonic()
+        now = now or datetime.utcnow()
+        result = {'scores_written': 0}
+
+        # Locked like recompute(): an edit committed meanwhile waits for this
+        state = db.query(CompanyScoreState).filter(
+            CompanyScoreState.company_id == company.id
+        ).with_for_update().first()
+
+        try:
+            if (
+                opportunity_ids and state is not None and not state.dirty_scores
+                and state.profile_hash == profile_fingerprint(company)
+            ):
+                active_ids = [
+                    row.id for row in self._active_opportunities(db, now)
+                    .filter(Opportunity.id.in_(opportunity_ids))
+                    .with_entities(Opportunity.id)
+                ]
+                result['scores_written'] = self._score(db, active_ids, [company], now, replace=True)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Scoring discovered opportunities for company {company.id} failed: {e}")
+            db.rollback()
+            raise
+
+        result['seconds'] = round(time.monotonic() - started, 2)
+        logger.info(
+            f"Scored {len(opportunity_ids)} discovered opportunities for company {company.id}: "
+            f"{result['scores_written']} scores written in {result['seconds']}s"
+        )
+        return result
+
+    def age_deadline_scores(self, db: Session, now: Optional[datetime] = None) -> Dict:
+        """
+        Bring cached deadline_score (and fit_score) up to date with the clock.
+
+        The deadline sub-score depends only on the opportunity and the date,
+        so all of an opportunity's rows get the same value: rows are updated
+        with one UPDATE per (score value, chunk of opportunities), fit_score
+        recomputed in SQL from the stored sub-scores. Rows already current
+        are not touched, and rows at 0 (deadline passed) are not read again.
+
+        Args:
+            db: Database session
+            now: Deadline-score reference (default: utcnow)
+
+        Returns:
+            Dict with opportunities, scores_updated and seconds
+        """
+        started = time.monotonic()
+        now = now or datetime.utcnow()
+
+        # A passed deadline scores 0 for good; anything else may still decay
+        ageable = db.query(CompanyOpportunityScore.opportunity_id).filter(
+            CompanyOpportunityScore.deadline_score != 0
+        ).distinct()
+        opportunities = db.query(Opportunity.id, Opportunity.response_deadline).filter(
+            Opportunity.response_deadline.isnot(None),
+            Opportunity.id.in_(ageable)
+        ).all()
+
+        by_score = defaultdict(list)
+        for opportunity, score in zip(opportunities, match_scoring_service.deadline_scores(opportunities, now).tolist()):
+            by_score[score].append(opportunity.id)
+
+        # Decimal weights keep the arithmetic in NUMERIC (exact, like the stored values)
+        weights = {name: Decimal(str(weight)) for name, weight in MatchScoringService.WEIGHTS.items()}
+        updated = 0
+        try:
+            for score, opportunity_ids in by_score.items():
+                value = Decimal(str(score))
+                fit = func.round(
+                    CompanyOpportunityScore.naics_score * weights['naics'] +
+                    CompanyOpportunityScore.cert_score * weights['cert'] +
+                    CompanyOpportunityScore.size_score * weights['size'] +
+                    CompanyOpportunityScore.geo_score * weights['geo'] +
+                    value * weights['deadline'],
+                    2
+                )
+                for i in range(0, len(opportunity_ids), REFRESH_CHUNK_SIZE):
+                    updated += db.query(CompanyOpportunityScore).filter(
+                        CompanyOpportunityScore.opportunity_id.in_(opportunity_ids[i:i + REFRESH_CHUNK_SIZE]),
+                        CompanyOpportunityScore.deadline_score != value
+                    ).update(
+                        {CompanyOpportunityScore.deadline_score: value, CompanyOpportunityScore.fit_score: fit},
+                        synchronize_session=False
+                    )
+            db.commit()
+        except Exception as e:
+            logger.error(f"Deadline score aging failed: {e}")
+            db.rollback()
+            raise
+
+        result = {
+            'opportunities': len(opportunities),
+            'scores_updated': updated,
+            'seconds': round(time.monotonic() - started, 2)
+        }
+        logger.info(
+            f"Deadline aging: {updated} scores updated across {len(opportunities)} opportunities "
+            f"in {result['seconds']}s"
+        )
+        return result
+
+    def _active_opportunities(self, db: Session, now: datetime):
+        return db.query(Opportunity).filter(
+            Opportunity.status == 'active',
+            or_(Opportunity.response_deadline.is_(None), Opportunity.response_deadline >= now)
+        )
+
+    def _score(
+        self,
+        db: Session,
+        opportunity_ids: List,
+        companies: Sequence[Company],
+        now: datetime,
+        replace: bool = False
+    ) -> int:
+        """
+        Score relevant pairs of the given opportunities and companies (no commit).
+
+        Args:
+            db: Database session
+            opportunity_ids: Opportunities to score
+            companies: Companies to score them for
+            now: Deadline-score reference and computed_at
+            replace: Delete the pairs' existing scores first (pairs no longer
+                relevant must not keep a stale score)
+
+        Returns:
+            Number of scores written
+        """
+        index = CandidateIndex(companies)
+        company_ids = [company.id for company in companies]
+        written = 0
+
+        for i in range(0, len(opportunity_ids), REFRESH_CHUNK_SIZE):
+            chunk_ids = opportunity_ids[i:i + REFRESH_CHUNK_SIZE]
+
+            if replace:
+                db.query(CompanyOpportunityScore).filter(
+                    CompanyOpportunityScore.opportunity_id.in_(chunk_ids),
+                    CompanyOpportunityScore.company_id.in_(company_ids)
+                ).delete(synchronize_session=False)
+
+            opportunities = db.query(Opportunity).options(
+                load_only(*SCORING_OPPORTUNITY_COLUMNS)
+            ).filter(Opportunity.id.in_(chunk_ids)).all()
+
+            mask = index.mask(opportunities)
+            if not mask.any():
+                continue
+
+            matrix = match_scoring_service.compute_matrix(opportunities, companies, now=now)
+            written += match_scoring_service.write_scores(db, matrix.to_rows(computed_at=now, mask=mask))
+
+        return written
+
+    def _recompute_sub_scores(self, db: Session, company: Company, dirty: Set[str], now: datetime) -> Dict:
+        """
+        Rewrite the given sub-scores and fit_score of a company's cached rows (no commit).
+
+        The other sub-scores are taken from the stored rows. When a dirty
+        sub-score also decides relevance (NAICS, certifications), active
+        opportunities that became relevant are scored in full and rows that
+        stopped being relevant are removed.
+
+        Args:
+            db: Database session
+            company: Company with the edited profile
+            dirty: Sub-scores to recompute
+            now: computed_at of rewritten rows
+
+        Returns:
+            Dict with scores_updated, scores_added and scores_removed
+        """
+        counts = {'scores_updated': 0, 'scores_added': 0, 'scores_removed': 0}
+        dirty = [name for name in SUB_SCORES if name in dirty]
+        relevance = bool(RELEVANCE_SUB_SCORES.intersection(dirty))
+        columns = [getattr(CompanyOpportunityScore, f'{name}_score') for name in SUB_SCORES]
+
+        opportunity_ids = [
+            row.opportunity_id for row in db.query(CompanyOpportunityScore.opportunity_id).filter(
+                CompanyOpportunityScore.company_id == company.id
+            )
+        ]
+        if relevance:
+            scored = set(opportunity_ids)
+            opportunity_ids += [
+                row.id for row in self._active_opportunities(db, now).with_entities(Opportunity.id)
+                if row.id not in scored
+            ]
+        index = CandidateIndex([company])
+
+        for i in range(0, len(opportunity_ids), REFRESH_CHUNK_SIZE):
+            chunk_ids = opportunity_ids[i:i + REFRESH_CHUNK_SIZE]
+
+            opportunities = db.query(Opportunity).options(
+                load_only(*SCORING_OPPORTUNITY_COLUMNS)
+            ).filter(Opportunity.id.in_(chunk_ids)).all()
+            stored = {
+                row.opportunity_id: row for row in db.query(
+                    CompanyOpportunityScore.opportunity_id, *columns
+                ).filter(
+                    CompanyOpportunityScore.company_id == company.id,
+                    CompanyOpportunityScore.opportunity_id.in_(chunk_ids)
+                )
+            }
+            relevant = index.mask(opportunities)[:, 0] if relevance else np.ones(len(opportunities), dtype=bool)
+            fresh = match_scoring_service.compute_sub_scores(opportunities, [company], dirty, now=now)
+
+            rows = []
+            removed = []
+            added = []
+            for k, opportunity in enumerate(opportunities):
+                row = stored.get(opportunity.id)
+                if not relevant[k]:
+                    if row is not None:
+                        removed.append(opportunity.id)
+                    continue
+                if row is None or any(value is None for value in row[1:]):
+                    added.append(opportunity)
+                    continue
+
+                old = {name: float(getattr(row, f'{name}_score')) for name in SUB_SCORES}
+                new = {**old, **{name: float(fresh[name][k, 0]) for name in dirty}}
+                if new == old:
+                    continue
+
+                scores = {f'{name}_score': Decimal(str(value)) for name, value in new.items()}
+                rows.append({
+                    'company_id': company.id,
+                    'opportunity_id': opportunity.id,
+                    'fit_score': Decimal(str(float(match_scoring_service.combine_fit(new)))),
+                    **scores,
+                    'computed_at': now
+                })
+
+            if removed:
+                db.query(CompanyOpportunityScore).filter(
+                    CompanyOpportunityScore.company_id == company.id,
+                    CompanyOpportunityScore.opportunity_id.in_(removed)
+                ).delete(synchronize_session=False)
+            if added:
+                rows += match_scoring_service.compute_matrix(added, [company], now=now).to_rows(computed_at=now)
+
+            match_scoring_service.write_scores(db, rows)
+            counts['scores_updated'] += len(rows) - len(added)
+            counts['scores_added'] += len(added)
+            counts['scores_removed'] += len(removed)
+
+        return counts
+
+
+# Singleton instance
+score_refresh_service = ScoreRefreshService()
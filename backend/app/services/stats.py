@@ -0,0 +1,277 @@
+"""
+Dashboard statistics.
+
+Reads come from the company_stats summary row (one primary-key lookup).
+Writers keep that row current by applying deltas: evaluation changes via
+apply_evaluation_change() and opportunity inserts/updates via
+apply_opportunity_changes(). refresh_company()/refresh_all() recompute rows
+from the source tables with single aggregate queries, for bulk deletes and
+NAICS profile changes.
+"""
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.opportunity import Opportunity
+from app.models.evaluation import Evaluation
+from app.models.company import Company
+from app.models.company_stats import CompanyStats
+import logging
+
+logger = logging.getLogger(__name__)
+
+RECOMMENDATIONS = ("BID", "NO_BID", "RESEARCH")
+PIPELINE_STATUSES = ("WATCHING", "BIDDING", "PASSED", "WON", "LOST")
+
+# Evaluation fields that feed the counters
+EVALUATION_STAT_FIELDS = ("recommendation", "fit_score", "win_probability", "user_saved")
+
+# (naics_code, is_active) -> change in opportunity count
+OpportunityChanges = Counter
+
+
+def evaluation_snapshot(evaluation: Optional[Evaluation]) -> Optional[Dict]:
+    """Capture the counter-relevant fields of an evaluation before it changes."""
+    if evaluation is None:
+        return None
+    return {field: getattr(evaluation, field) for field in EVALUATION_STAT_FIELDS}
+
+
+def opportunity_count_key(naics_code: Optional[str], status: Optional[str]) -> Tuple[Optional[str], bool]:
+    """Key under which an opportunity is counted in OpportunityChanges."""
+    return naics_code, status == "active"
+
+
+class StatsService:
+    """Per-company dashboard counters."""
+
+    # Reads
+
+    def get_company_stats(self, db: Session, company: Company) -> Dict:
+        """
+        Opportunity and evaluation statistics for a company.
+
+        Args:
+            db: Database session
+            company: Company instance
+
+        Returns:
+            Dict matching OpportunityStatsResponse
+        """
+        stats = self._get_or_refresh(db, company)
+        return {
+            "total_opportunities": stats.total_opportunities,
+            "active_opportunities": stats.active_opportunities,
+            "total_evaluations": stats.total_evaluations,
+            "bid_recommendations": stats.bid_recommendations,
+            "no_bid_recommendations": stats.no_bid_recommendations,
+            "research_recommendations": stats.research_recommendations,
+            "avg_fit_score": float(stats.avg_fit_score) if stats.avg_fit_score else None,
+            "avg_win_probability": float(stats.avg_win_probability) if stats.avg_win_probability else None,
+        }
+
+    def get_pipeline_stats(self, db: Session, company: Company) -> Dict:
+        """
+        Pipeline counts per saved status for a company.
+
+        Args:
+            db: Database session
+            company: Company instance
+
+        Returns:
+            Dict with total, a count per status (lowercase keys) and win_rate
+        """
+        stats = self._get_or_refresh(db, company)
+        counts = {
+            status.lower(): getattr(stats, f"pipeline_{status.lower()}")
+            for status in PIPELINE_STATUSES
+        }
+
+        won, lost = counts["won"], counts["lost"]
+        return {
+            "total": sum(counts.values()),
+            **counts,
+            "win_rate": round(won / (won + lost) * 100, 1) if (won + lost) > 0 else None
+        }
+
+    def _get_or_refresh(self, db: Session, company: Company) -> CompanyStats:
+        stats = db.get(CompanyStats, company.id)
+        if stats is None:
+            try:
+                stats = self.refresh_company(db, company)
+                db.commit()
+            except IntegrityError:
+                # Another request built the row first
+                db.rollback()
+                stats = db.get(CompanyStats, company.id)
+        return stats
+
+    # Full recompute
+
+    def refresh_company(self, db: Session, company: Company) -> CompanyStats:
+        """
+        Recompute one company's counters from the source tables (no commit).
+
+        Opportunity counts and evaluation aggregates are two single-row
+        subqueries using COUNT(*) FILTER (WHERE ...), selected in one round trip.
+
+        Args:
+            db: Database session
+            company: Company instance
+
+        Returns:
+            The refreshed CompanyStats row
+        """
+        opportunity_counts = select(
+            func.count().label("total_opportunities"),
+            func.count().filter(Opportunity.status == "active").label("active_opportunities")
+        ).where(
+            Opportunity.naics_code.in_(company.naics_codes or [])
+        ).subquery()
+
+        evaluation_counts = select(
+            func.count().label("total_evaluations"),
+            *[
+                func.count().filter(Evaluation.recommendation == recommendation)
+                .label(f"{recommendation.lower()}_recommendations")
+                for recommendation in RECOMMENDATIONS
+            ],
+            func.coalesce(func.sum(Evaluation.fit_score), 0).label("fit_score_sum"),
+            func.count(Evaluation.fit_score).label("fit_score_count"),
+            func.coalesce(func.sum(Evaluation.win_probability), 0).label("win_probability_sum"),
+            func.count(Evaluation.win_probability).label("win_probability_count"),
+            *[
+                func.count().filter(Evaluation.user_saved == status)
+                .label(f"pipeline_{status.lower()}")
+                for status in PIPELINE_STATUSES
+            ]
+        ).where(
+            Evaluation.company_id == company.id
+        ).subquery()
+
+        row = db.execute(select(opportunity_counts, evaluation_counts)).one()
+
+        stats = db.get(CompanyStats, company.id) or CompanyStats(company_id=company.id)
+        for key, value in row._mapping.items():
+            setattr(stats, key, value)
+        stats.updated_at = datetime.utcnow()
+        db.add(stats)
+        db.flush()
+        return stats
+
+    def refresh_all(self, db: Session, company_ids: Optional[Iterable] = None) -> int:
+        """
+        Recompute counters for all (or the given) companies and commit.
+
+        Args:
+            db: Database session
+            company_ids: Restrict to these companies (default: all)
+
+        Returns:
+            Number of companies refreshed
+        """
+        query = db.query(Company)
+        if company_ids is not None:
+            query = query.filter(Company.id.in_(list(company_ids)))
+
+        companies = query.all()
+        for company in companies:
+            self.refresh_company(db, company)
+        db.commit()
+
+        logger.info(f"Refreshed dashboard stats for {len(companies)} companies")
+        return len(companies)
+
+    # Incremental maintenance (callers commit)
+
+    def apply_evaluation_change(
+        self,
+        db: Session,
+        company_id,
+        before: Optional[Dict],
+        after: Optional[Dict]
+    ) -> None:
+        """
+        Apply the counter deltas for one evaluation insert, update or delete.
+
+        Args:
+            db: Database session
+            company_id: Company owning the evaluation
+            before: evaluation_snapshot() before the change (None for inserts)
+            after: evaluation_snapshot() after the change (None for deletes)
+        """
+        deltas: Counter = Counter()
+
+        for snapshot, sign in ((before, -1), (after, 1)):
+            if snapshot is None:
+                continue
+            deltas["total_evaluations"] += sign
+            if snapshot["recommendation"] in RECOMMENDATIONS:
+                deltas[f"{snapshot['recommendation'].lower()}_recommendations"] += sign
+            if snapshot["fit_score"] is not None:
+                deltas["fit_score_sum"] += sign * snapshot["fit_score"]
+                deltas["fit_score_count"] += sign
+            if snapshot["win_probability"] is not None:
+                deltas["win_probability_sum"] += sign * snapshot["win_probability"]
+                deltas["win_probability_count"] += sign
+            if snapshot["user_saved"] in PIPELINE_STATUSES:
+                deltas[f"pipeline_{snapshot['user_saved'].lower()}"] += sign
+
+        changed = {column: delta for column, delta in deltas.items() if delta}
+        if not changed:
+            return
+
+        # Atomic in-place increments; a missing row is built on first read
+        table = CompanyStats.__table__
+        db.execute(
+            table.update()
+            .where(table.c.company_id == company_id)
+            .values(
+                updated_at=datetime.utcnow(),
+                **{column: table.c[column] + delta for column, delta in changed.items()}
+            )
+        )
+
+    def apply_opportunity_changes(self, db: Session, changes: OpportunityChanges) -> None:
+        """
+        Apply opportunity count deltas to every company whose NAICS codes match.
+
+        Args:
+            db: Database session
+            changes: Counter of (naics_code, is_active) -> change in count
+        """
+        per_code: Dict[str, List[int]] = {}
+        for (naics_code, is_active), delta in changes.items():
+            if not naics_code or not delta:
+                continue
+            totals = per_code.setdefault(naics_code, [0, 0])
+            totals[0] += delta
+            if is_active:
+                totals[1] += delta
+
+        params = [
+            {"naics_code": code, "total": total, "active": active}
+            for code, (total, active) in per_code.items()
+            if total or active
+        ]
+        if not params:
+            return
+
+        db.execute(
+            text("""
+                UPDATE company_stats cs
+                SET total_opportunities = cs.total_opportunities + :total,
+                    active_opportunities = cs.active_opportunities + :active,
+                    updated_at = NOW()
+                FROM companies c
+                WHERE cs.company_id = c.id
+                  AND :naics_code = ANY(c.naics_codes)
+            """),
+            params
+        )
+
+
+# Singleton instance
+stats_service = StatsService()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Standalone script for aging cached deadline match scores - run via cron at 1 AM daily.
+
+The deadline sub-score of company_opportunity_scores decays as deadlines
+approach, without anything else about the pair changing. This pass rewrites
+deadline_score and fit_score of the rows whose deadline bucket changed
+since they were computed; nothing else is rescored.
+
+Usage:
+    python scripts/age_deadline_scores.py
+
+Cron entry:
+    0 1 * * * cd /opt/govai/backend && /opt/govai/venv/bin/python scripts/age_deadline_scores.py >> /var/log/govai/scores.log 2>&1
+"""
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+from datetime import datetime
+
+from app.core.database import SessionLocal
+from app.services.score_refresh import score_refresh_service
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def age_deadline_scores():
+    """Update deadline_score and fit_score of cached match scores."""
+    db = SessionLocal()
+    try:
+        return score_refresh_service.age_deadline_scores(db)
+    except Exception as e:
+        logger.error(f"Error aging deadline scores: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    start_time = datetime.now()
+    logger.info(f"=== Deadline score aging started at {start_time} ===")
+
+    try:
+        result = age_deadline_scores()
+        logger.info(f"Result: {result}")
+    except Exception as e:
+        logger.error(f"Job failed: {e}")
+        sys.exit(1)
+
+    end_time = datetime.now()
+    duration = (end_time - start_time).total_seconds()
+    logger.info(f"=== Deadline score aging completed in {duration:.2f} seconds ===")
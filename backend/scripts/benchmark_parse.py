@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for SAM.gov record parsing.
+
+Compares the legacy per-record parser (parse_opportunity, full dict with
+deprecated alias keys) against the lean page parser (parse_page, model
+columns only, memoized dates) on a recorded search response.
+
+Usage:
+    python scripts/benchmark_parse.py [--fixture PATH] [--records N] [--rounds R]
+
+The default fixture is scripts/fixtures/sam_search_page.json; pass a saved
+SAM.gov /opportunities/v2/search response to benchmark real data. Records are
+repeated up to --records so short fixtures still give stable timings.
+"""
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import copy
+import json
+import logging
+import time
+from typing import Callable, Dict, List
+
+from app.services.sam_gov import sam_gov_service, _parse_sam_date
+
+logging.basicConfig(level=logging.WARNING)
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sam_search_page.json")
+
+
+def load_records(path: str, count: int) -> List[Dict]:
+    """Load fixture records and repeat them (with unique notice IDs) up to `count`."""
+    with open(path) as f:
+        records = json.load(f)["opportunitiesData"]
+
+    expanded = []
+    for i in range(count):
+        record = copy.deepcopy(records[i % len(records)])
+        record["noticeId"] = f"{record['noticeId']}-{i}"
+        expanded.append(record)
+    return expanded
+
+
+def run(label: str, parse: Callable[[List[Dict]], None], records: List[Dict], rounds: int) -> float:
+    """Time `parse` over the records, keeping the best round. Returns records/second."""
+    best = float("inf")
+    for _ in range(rounds):
+        _parse_sam_date.cache_clear()
+        started = time.perf_counter()
+        parse(records)
+        best = min(best, time.perf_counter() - started)
+
+    rate = len(records) / best
+    print(f"{label:<34} {best * 1000:9.1f} ms   {rate:12,.0f} records/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SAM.gov record parsing")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="Recorded SAM.gov search response (JSON)")
+    parser.add_argument("--records", type=int, default=20000, help="Records to parse per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds (best is reported)")
+    args = parser.parse_args()
+
+    records = load_records(args.fixture, args.records)
+    print(f"Parsing {len(records)} records from {os.path.basename(args.fixture)}, best of {args.rounds}\n")
+
+    before = run(
+        "parse_opportunity (legacy dict)",
+        lambda page: [sam_gov_service.parse_opportunity(r) for r in page],
+        records,
+        args.rounds
+    )
+    after = run("parse_page (lean rows)", sam_gov_service.parse_page, records, args.rounds)
+
+    print(f"\nSpeedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Prompt-size (and optionally latency) benchmark for AI evaluations.
+
+Builds every company-evaluation prompt in a fixture corpus twice: as before
+token budgeting (raw description and capabilities statement, fixed
+max_tokens) and as now (cleaned, per-section budgets, computed max_tokens),
+and reports the token distributions. Token counts use the local tokenizer
+(tiktoken if installed); no API calls are made unless --live is given.
+
+First checks that cleaning loses nothing but clause text: every sentence of
+a description or capabilities statement that cites no FAR/DFARS clause and
+is not incorporation boilerplate must survive clean_text(). Exits non-zero
+if one doesn't.
+
+Usage:
+    python scripts/benchmark_prompts.py [--fixture PATH] [--rounds R] [--live] [--samples N]
+
+The default fixture is scripts/fixtures/evaluation_prompts.json (SAM.gov-style
+descriptions with HTML and FAR/DFARS clause listings, two company profiles);
+every opportunity is paired with every company. --live sends the first
+--samples prompts of each variant to OpenAI (bypassing the response cache)
+and reports latency and completion-token distributions. It spends tokens.
+"""
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import html
+import json
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Sequence, Tuple
+from unittest import mock
+
+from app.models.company import Company
+from app.models.opportunity import Opportunity
+from app.services import ai_evaluator
+from app.services.ai_evaluator import ai_evaluator_service, EVALUATION_MAX_TOKENS
+from app.services.prompt_budget import TIKTOKEN_AVAILABLE, clean_text, token_counter
+
+logging.basicConfig(level=logging.WARNING)
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "evaluation_prompts.json")
+
+# (system prompt, user prompt, max_tokens)
+Request = Tuple[str, str, int]
+
+# Clause citations and incorporation boilerplate - the only text cleaning may drop
+CLAUSE_TEXT = re.compile(
+    r"\b2?52\.\d{3}-\d{1,4}\b|incorporated?\s+(?:herein\s+)?by\s+reference|full\s+text\s+of\s+a\s+clause",
+    re.IGNORECASE
+)
+
+
+def load_pairs(path: str) -> List[Tuple[Opportunity, Company]]:
+    """Every fixture opportunity paired with every fixture company (transient models)."""
+    with open(path) as f:
+        fixture = json.load(f)
+
+    opportunities = [
+        Opportunity(
+            source_id=record["noticeId"],
+            title=record["title"],
+            description=record.get("description"),
+            agency=record.get("department"),
+            sub_agency=record.get("subTier"),
+            office=record.get("office"),
+            naics_code=record.get("naicsCode"),
+            set_aside_type=record.get("setAside"),
+            notice_type=record.get("type"),
+            response_deadline=datetime.strptime(record["responseDeadLine"], "%Y-%m-%d"),
+            pop_state=record.get("placeOfPerformanceState")
+        )
+        for record in fixture["opportunities"]
+    ]
+    companies = [Company(**fields) for fields in fixture["companies"]]
+
+    return [(opportunity, company) for opportunity in opportunities for company in companies]
+
+
+def lost_content(raw: str) -> List[str]:
+    """Sentences of `raw` without clause text that clean_text() dropped."""
+    plain = html.unescape(re.sub(r"<[^>]+>", " ", raw))
+    cleaned = " ".join(clean_text(raw).split())
+
+    lost = []
+    for sentence in re.split(r"(?<=[.!?])\s+|\n", plain):
+        sentence = " ".join(sentence.split())
+        if sentence and not CLAUSE_TEXT.search(sentence) and sentence not in cleaned:
+            lost.append(sentence)
+    return lost
+
+
+def check_content(pairs: List[Tuple[Opportunity, Company]]) -> int:
+    """Run lost_content() over every distinct free-text section. Returns sentences lost."""
+    sections = {opportunity.description for opportunity, _ in pairs} | {company.capabilities for _, company in pairs}
+    sections.discard(None)
+
+    lost = 0
+    for section in sections:
+        for sentence in lost_content(section):
+            lost += 1
+            if lost <= 5:
+                print(f"LOST: {sentence[:120]}")
+    print(f"Content check: {len(sections)} sections, {lost} non-clause sentences lost")
+    return lost
+
+
+def build_before(opportunity: Opportunity, company: Company) -> Request:
+    """The request as sent before budgeting: raw section text, fixed max_tokens."""
+    with mock.patch.object(ai_evaluator, "budget_section", lambda counter, text, max_tokens, empty: text or empty):
+        prompt = ai_evaluator_service._build_evaluation_prompt(opportunity, company)
+    return ai_evaluator_service._get_system_prompt(), prompt, EVALUATION_MAX_TOKENS
+
+
+def build_after(opportunity: Opportunity, company: Company) -> Request:
+    return ai_evaluator_service._evaluation_request(opportunity, company)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def describe(values: Sequence[float]) -> str:
+    return (
+        f"p50 {percentile(values, 50):8,.0f}   p95 {percentile(values, 95):8,.0f}   "
+        f"max {max(values):8,.0f}   total {sum(values):10,.0f}"
+    )
+
+
+def measure_sizes(
+    label: str,
+    build: Callable[[Opportunity, Company], Request],
+    pairs: List[Tuple[Opportunity, Company]],
+    rounds: int
+) -> Tuple[List[Request], Dict]:
+    """Build every request, keeping the best round's build time. Returns requests and token stats."""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        requests = [build(opportunity, company) for opportunity, company in pairs]
+        best = min(best, time.perf_counter() - started)
+
+    count = token_counter(ai_evaluator_service.model).count
+    prompt_tokens = [count(system) + count(prompt) for system, prompt, _ in requests]
+    reserved = [tokens + max_tokens for tokens, (_, _, max_tokens) in zip(prompt_tokens, requests)]
+
+    print(f"{label}  (build {best / len(pairs) * 1000:.2f} ms/prompt)")
+    print(f"  prompt tokens     {describe(prompt_tokens)}")
+    print(f"  max_tokens        {describe([max_tokens for _, _, max_tokens in requests])}")
+    print(f"  TPM reservation   {describe(reserved)}")
+    return requests, {"prompt_tokens": sum(prompt_tokens), "reserved": sum(reserved)}
+
+
+async def measure_latency(label: str, requests: List[Request]) -> None:
+    """Send requests to OpenAI one at a time and report latency / completion size."""
+    latencies = []
+    completion_tokens = []
+    truncated = 0
+
+    for system_prompt, prompt, max_tokens in requests:
+        started = time.perf_counter()
+        response = await ai_evaluator_service._create_completion(system_prompt, prompt, max_tokens)
+        latencies.append(time.perf_counter() - started)
+        completion_tokens.append(response.usage.completion_tokens)
+        truncated += response.choices[0].finish_reason == "length"
+
+    print(f"{label}  ({len(requests)} live calls, {truncated} hit max_tokens)")
+    print(f"  latency (s)       p50 {percentile(latencies, 50):8.2f}   p95 {percentile(latencies, 95):8.2f}   max {max(latencies):8.2f}")
+    print(f"  completion tokens {describe(completion_tokens)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AI evaluation prompt size and latency")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="Opportunities and companies (JSON)")
+    parser.add_argument("--rounds", type=int, default=5, help="Build rounds (best is reported)")
+    parser.add_argument("--live", action="store_true", help="Also measure OpenAI latency (spends tokens)")
+    parser.add_argument("--samples", type=int, default=10, help="Live calls per variant")
+    args = parser.parse_args()
+
+    pairs = load_pairs(args.fixture)
+    tokenizer = "tiktoken" if TIKTOKEN_AVAILABLE and token_counter(ai_evaluator_service.model).exact else "length estimate"
+    print(f"{len(pairs)} company evaluation prompts from {os.path.basename(args.fixture)} ({tokenizer})\n")
+
+    if check_content(pairs):
+        sys.exit(1)
+    print()
+
+    before, before_totals = measure_sizes("Before (raw sections, fixed max_tokens)", build_before, pairs, args.rounds)
+    print()
+    after, after_totals = measure_sizes("After (cleaned + budgeted, computed max_tokens)", build_after, pairs, args.rounds)
+
+    print(
+        f"\nPrompt tokens: -{1 - after_totals['prompt_tokens'] / before_totals['prompt_tokens']:.1%}   "
+        f"TPM reservation: -{1 - after_totals['reserved'] / before_totals['reserved']:.1%}"
+    )
+
+    if args.live:
+        async def live():
+            print()
+            await measure_latency("Before", before[:args.samples])
+            print()
+            await measure_latency("After", after[:args.samples])
+
+        # One event loop: the OpenAI client's connection pool is bound to it
+        asyncio.run(live())
+
+
+if __name__ == "__main__":
+    main()
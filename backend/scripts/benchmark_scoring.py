@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Equivalence check and benchmark for match scoring.
+
+Generates random opportunities and companies (transient models, no database)
+covering the edge cases of every sub-score - missing fields, short and
+related NAICS codes, unknown set-asides, lowercase states, "Nationwide",
+values on value-band edges, timezone-aware deadlines on whole-day
+boundaries - and checks that MatchScoringService.compute_matrix() returns
+exactly what compute_score() returns for every pair. Then times both.
+
+Usage:
+    python scripts/benchmark_scoring.py [--opportunities N] [--companies M] [--seed S]
+                                        [--check-only] [--rounds R]
+
+Exits non-zero if any pair differs.
+"""
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import List
+
+from app.models.company import Company
+from app.models.opportunity import Opportunity
+from app.services.match_scoring import match_scoring_service, MatchScoringService
+
+logging.basicConfig(level=logging.WARNING)
+
+NAICS_CODES = ["541511", "541512", "541519", "541330", "541611", "561720", "561730", "236220", "5415", "54", "611430"]
+SET_ASIDES = list(MatchScoringService.CERT_MAP) + [None, "", "NONE", "n/a", "Total Small Business Set-Aside (FAR 19.5)", "ISBEE"]
+CERTS = ["8(a)", "WOSB", "EDWOSB", "SDVOSB", "VOSB", "HUBZone", "Small Business", "ISBEE"]
+STATES = ["VA", "MD", "DC", "CA", "TX", "NC", "OK", "NV", "PA", "NY", "FL", "va", "tx"]
+BAND_EDGES = [0, 50_000, 100_000, 200_000, 500_000, 1_000_000, 2_000_000, 5_000_000, 10_000_000,
+              20_000_000, 50_000_000, 100_000_000, 250_000_000]
+DEADLINE_DAYS = [-30, -1, 0, 1, 6, 7, 13, 14, 29, 30, 59, 60, 61, 365]
+
+
+def random_opportunities(rng: random.Random, count: int, now: datetime) -> List[Opportunity]:
+    opportunities = []
+    for i in range(count):
+        value = rng.choice([None, 0, rng.choice(BAND_EDGES), rng.uniform(0, 300_000_000)])
+        deadline = None
+        if rng.random() < 0.9:
+            # Whole-day offsets +/- a second hit the floor() boundaries
+            deadline = now + timedelta(days=rng.choice(DEADLINE_DAYS), seconds=rng.choice([-1, 0, 1, 3600]))
+            if rng.random() < 0.5:
+                deadline = deadline.replace(tzinfo=timezone.utc)
+        opportunities.append(Opportunity(
+            source_id=f"bench-{i}",
+            title=f"Benchmark opportunity {i}",
+            naics_code=rng.choice(NAICS_CODES + [None, ""]),
+            set_aside_type=rng.choice(SET_ASIDES),
+            estimated_value_high=Decimal(str(round(value, 2))) if value is not None else None,
+            pop_state=rng.choice(STATES + [None, ""]),
+            response_deadline=deadline
+        ))
+    return opportunities
+
+
+def random_companies(rng: random.Random, count: int) -> List[Company]:
+    companies = []
+    for i in range(count):
+        company = Company(
+            name=f"Benchmark company {i}",
+            naics_codes=rng.sample(NAICS_CODES, rng.randint(0, 4)),
+            set_asides=rng.sample(CERTS, rng.randint(0, 3)),
+            geographic_preferences=rng.choice([
+                [], ["Nationwide"], rng.sample(STATES, rng.randint(1, 3)), ["Nationwide", "VA"]
+            ])
+        )
+        # Not a column; compute_score reads it when present
+        company.contract_value_range = rng.choice(list(MatchScoringService.VALUE_RANGES) + [None, "Unknown"])
+        companies.append(company)
+    return companies
+
+
+def check(opportunities: List[Opportunity], companies: List[Company], now: datetime) -> int:
+    """Compare matrix and scalar scores for every pair. Returns the number of mismatches."""
+    matrix = match_scoring_service.compute_matrix(opportunities, companies, now=now)
+    mismatches = 0
+    for opportunity, company, scores in matrix.pairs():
+        expected = match_scoring_service.compute_score(opportunity, company, now=now)
+        if scores != expected:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"MISMATCH {opportunity.source_id} / {company.name}: matrix={scores} scalar={expected}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark vectorized match scoring")
+    parser.add_argument("--opportunities", type=int, default=2000, help="Opportunities (rows)")
+    parser.add_argument("--companies", type=int, default=50, help="Companies (columns)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--check-only", action="store_true", help="Skip timing")
+    parser.add_argument("--rounds", type=int, default=3, help="Timing rounds (best is reported)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    opportunities = random_opportunities(rng, args.opportunities, now)
+    companies = random_companies(rng, args.companies)
+    pairs = len(opportunities) * len(companies)
+
+    mismatches = check(opportunities, companies, now)
+    print(f"Equivalence: {pairs - mismatches}/{pairs} pairs identical (seed {args.seed})")
+    if mismatches:
+        sys.exit(1)
+    if args.check_only:
+        return
+
+    def scalar():
+        for opportunity in opportunities:
+            for company in companies:
+                match_scoring_service.compute_score(opportunity, company, now=now)
+
+    def vectorized():
+        match_scoring_service.compute_matrix(opportunities, companies, now=now)
+
+    print(f"\nScoring {len(opportunities)} opportunities x {len(companies)} companies, best of {args.rounds}\n")
+    rates = {}
+    for label, run in (("compute_score (per pair)", scalar), ("compute_matrix (vectorized)", vectorized)):
+        best = float("inf")
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - started)
+        rates[label] = pairs / best
+        print(f"{label:<30} {best * 1000:9.1f} ms   {rates[label]:14,.0f} pairs/s")
+
+    print(f"\nSpeedup: {rates['compute_matrix (vectorized)'] / rates['compute_score (per pair)']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
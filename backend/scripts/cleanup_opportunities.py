@@ -19,6 +19,8 @@ import logging
 from datetime import datetime
 
 from app.core.database import SessionLocal
+from app.services.ai_cache import ai_response_cache
+from app.services.jobs import job_service
 from app.services.opportunity import opportunity_service
 
 # Configure logging
@@ -31,7 +33,8 @@ logger = logging.getLogger(__name__)
 
 def cleanup_old_opportunities():
     """
-    Clean up old opportunities (older than 90 days).
+    Clean up old opportunities (older than 90 days), finished jobs (older than
+    30 days) and expired AI response cache entries.
     """
     db = SessionLocal()
     try:
@@ -39,9 +42,16 @@ def cleanup_old_opportunities():
 
         deleted_count = opportunity_service.delete_old_opportunities(db, days_old=90)
 
-        logger.info(f"Cleanup completed: {deleted_count} opportunities deleted")
+        jobs_deleted = job_service.cleanup_old_jobs(db, days=30)
 
-        return {"deleted": deleted_count}
+        cache_purged = ai_response_cache.purge_expired(db)
+
+        logger.info(
+            f"Cleanup completed: {deleted_count} opportunities deleted, {jobs_deleted} finished jobs deleted, "
+            f"{cache_purged} expired AI cache entries purged"
+        )
+
+        return {"deleted": deleted_count, "jobs_deleted": jobs_deleted, "ai_cache_purged": cache_purged}
 
     except Exception as e:
         logger.error(f"Error in cleanup: {str(e)}")
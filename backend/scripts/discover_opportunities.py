@@ -14,14 +14,17 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import List, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from app.core.database import SessionLocal
 from app.models.company import Company
-from app.services.sam_gov import sam_gov_service
-from app.services.opportunity import opportunity_service
+from app.services.sam_gov import sam_gov_service, FetchStats
+from app.services.opportunity import opportunity_service, UpsertResult
 from app.services.discovery import discovery_service
+from app.services.score_refresh import score_refresh_service
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +33,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline configuration
+PARSE_WORKERS = 4  # Parallel parse workers
+UPSERT_CHUNK_SIZE = 500  # Records committed per upsert
+QUEUE_SIZE = 16  # Pages/chunks buffered between stages
+
 
 def get_unique_naics_codes(db) -> List[str]:
     """Get all unique NAICS codes from all companies."""
@@ -43,6 +51,164 @@ def get_unique_naics_codes(db) -> List[str]:
     return list(naics_set)
 
 
+class StageStats:
+    """Throughput counters for one pipeline stage."""
+    def __init__(self, name: str):
+        self.name = name
+        self.records = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+
+    def finish(self):
+        self.finished = time.monotonic()
+
+    def to_dict(self) -> Dict:
+        elapsed = (self.finished or time.monotonic()) - self.started
+        return {
+            'records': self.records,
+            'batches': self.batches,
+            'busy_seconds': round(self.busy_seconds, 2),
+            'elapsed_seconds': round(elapsed, 2),
+            'records_per_second': round(self.records / elapsed, 1) if elapsed > 0 else None
+        }
+
+
+async def run_pipeline(
+    db,
+    naics_codes: List[str],
+    posted_from: datetime,
+    posted_to: datetime,
+    daily_calls_used: int,
+    stats: FetchStats
+) -> Tuple[UpsertResult, Dict[str, Dict]]:
+    """
+    Run fetch, parse and upsert as three overlapping stages.
+
+    fetch -> [page queue] -> PARSE_WORKERS parsers -> [record queue] -> upserter
+
+    Queues are bounded, so a slow stage applies backpressure upstream and
+    memory stays flat regardless of how many NAICS codes are fetched. Parsing
+    and DB writes run in worker threads to keep the event loop free for
+    in-flight HTTP requests. The upserter commits every UPSERT_CHUNK_SIZE
+    records.
+
+    Returns:
+        Tuple of (combined UpsertResult, per-stage throughput stats)
+    """
+    loop = asyncio.get_running_loop()
+    page_queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    record_queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    done = object()
+
+    fetch_stage = StageStats('fetch')
+    parse_stage = StageStats('parse')
+    upsert_stage = StageStats('upsert')
+    upsert_result = UpsertResult()
+
+    parse_pool = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+    # Single DB thread: the session is never used concurrently
+    db_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="upsert")
+
+    async def fetcher():
+        pages = sam_gov_service.iter_opportunity_pages(
+            naics_codes,
+            posted_from=posted_from,
+            posted_to=posted_to,
+            daily_calls_used=daily_calls_used,
+            stats=stats
+        )
+        try:
+            while True:
+                # Busy time = time spent waiting on SAM.gov, not on the parse queue
+                started = time.monotonic()
+                try:
+                    page = await pages.__anext__()
+                except StopAsyncIteration:
+                    break
+                fetch_stage.busy_seconds += time.monotonic() - started
+                fetch_stage.records += len(page["opportunities"])
+                fetch_stage.batches += 1
+                await page_queue.put(page["opportunities"])
+        finally:
+            # Stops in-flight SAM.gov requests if the pipeline is cancelled
+            await pages.aclose()
+
+        fetch_stage.finish()
+        for _ in range(PARSE_WORKERS):
+            await page_queue.put(done)
+
+    async def parser():
+        while True:
+            raw_opportunities = await page_queue.get()
+            if raw_opportunities is done:
+                await record_queue.put(done)
+                return
+
+            started = time.monotonic()
+            parsed, errors = await loop.run_in_executor(
+                parse_pool, sam_gov_service.parse_page, raw_opportunities
+            )
+            parse_stage.busy_seconds += time.monotonic() - started
+            parse_stage.records += len(parsed)
+            parse_stage.batches += 1
+            upsert_result.errors += errors
+
+            if parsed:
+                await record_queue.put(parsed)
+
+    async def flush(chunk: List[Dict]):
+        started = time.monotonic()
+        result = await loop.run_in_executor(
+            db_pool, opportunity_service.upsert_opportunities_batch, db, chunk
+        )
+        upsert_stage.busy_seconds += time.monotonic() - started
+        upsert_stage.records += len(chunk)
+        upsert_stage.batches += 1
+        upsert_result.merge(result)
+
+    async def upserter():
+        chunk: List[Dict] = []
+        finished_parsers = 0
+
+        while finished_parsers < PARSE_WORKERS:
+            parsed = await record_queue.get()
+            if parsed is done:
+                finished_parsers += 1
+                continue
+
+            chunk.extend(parsed)
+            while len(chunk) >= UPSERT_CHUNK_SIZE:
+                await flush(chunk[:UPSERT_CHUNK_SIZE])
+                chunk = chunk[UPSERT_CHUNK_SIZE:]
+
+        if chunk:
+            await flush(chunk)
+
+    tasks = [asyncio.create_task(fetcher())]
+    tasks += [asyncio.create_task(parser()) for _ in range(PARSE_WORKERS)]
+    tasks.append(asyncio.create_task(upserter()))
+
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        parse_stage.finish()
+        upsert_stage.finish()
+        parse_pool.shutdown(wait=False)
+        db_pool.shutdown(wait=True)
+
+    stage_stats = {
+        stage.name: stage.to_dict()
+        for stage in (fetch_stage, parse_stage, upsert_stage)
+    }
+    return upsert_result, stage_stats
+
+
 def discover_opportunities():
     """
     Discover new opportunities from SAM.gov using optimized batch fetching.
@@ -52,6 +218,9 @@ def discover_opportunities():
     2. Deduplication via source_id before database operations
     3. Discovery run tracking for incremental fetching
     4. Only fetches opportunities posted since last successful run
+    5. Full offset pagination, with pages upserted as they stream in
+    6. Fetch, parse and upsert overlap as a bounded-queue pipeline
+    7. Match scores of changed pairs are refreshed after the run
     """
     db = SessionLocal()
     discovery_run = None
@@ -94,53 +263,57 @@ def discover_opportunities():
             posted_to=posted_to
         )
 
-        # Batch fetch from SAM.gov
+        # Calls already spent in the last 24h count against the SAM.gov daily quota
+        daily_calls_used = discovery_service.get_api_calls_since(db, now - timedelta(days=1))
+
+        # Fetch, parse and upsert run as overlapping pipeline stages
+        fetch_stats = FetchStats()
         try:
-            result = asyncio.run(sam_gov_service.search_opportunities_batch(
+            upsert_result, stage_stats = asyncio.run(run_pipeline(
+                db,
                 naics_codes=naics_codes,
                 posted_from=posted_from,
                 posted_to=posted_to,
-                limit=500
+                daily_calls_used=daily_calls_used,
+                stats=fetch_stats
             ))
         except Exception as e:
             logger.error(f"SAM.gov API error: {e}")
             discovery_service.fail_run(db, discovery_run, str(e))
             return {"status": "failed", "error": str(e)}
 
-        raw_opportunities = result.get("opportunities", [])
-        api_calls = result.get("api_calls", 0)
-        errors = result.get("errors", [])
+        found = stage_stats['fetch']['records']
+        api_calls = fetch_stats.api_calls
+        retries = fetch_stats.retries
+        cache_hits = fetch_stats.cache_hits
+        naics_stats = fetch_stats.naics_stats
+        errors = fetch_stats.errors
         # Check if any errors indicate rate limiting
         rate_limited = any("429" in str(e) or "rate" in str(e).lower() for e in (errors or []))
 
-        logger.info(f"SAM.gov returned {len(raw_opportunities)} opportunities in {api_calls} API calls")
+        logger.info(
+            f"SAM.gov returned {found} opportunities in {api_calls} API calls "
+            f"({retries} retries, {cache_hits} pages served from cache)"
+        )
 
         if rate_limited:
             logger.warning("Rate limited by SAM.gov - partial results")
 
-        # Parse all opportunities
-        parsed_opportunities = []
-        for raw_opp in raw_opportunities:
-            try:
-                opp_data = sam_gov_service.parse_opportunity(raw_opp)
-                parsed_opportunities.append(opp_data)
-            except Exception as e:
-                logger.error(f"Error parsing opportunity: {e}")
-                continue
+        for stage, stage_result in stage_stats.items():
+            logger.info(
+                f"Stage {stage}: {stage_result['records']} records in "
+                f"{stage_result['elapsed_seconds']}s ({stage_result['records_per_second']}/s, "
+                f"busy {stage_result['busy_seconds']}s)"
+            )
 
-        logger.info(f"Parsed {len(parsed_opportunities)} opportunities")
-
-        # Batch upsert with deduplication
-        if parsed_opportunities:
-            upsert_result = opportunity_service.upsert_opportunities_batch(db, parsed_opportunities)
-            results_dict = upsert_result.to_dict()
-        else:
-            results_dict = {'new': 0, 'updated': 0, 'unchanged': 0, 'errors': 0}
+        results_dict = upsert_result.to_dict()
 
         # Complete discovery run
         run_results = {
             'api_calls': api_calls,
-            'found': len(raw_opportunities),
+            'retries': retries,
+            'naics_stats': naics_stats,
+            'found': found,
             'new': results_dict['new'],
             'updated': results_dict['updated'],
             'unchanged': results_dict['unchanged'],
@@ -161,15 +334,27 @@ def discover_opportunities():
             f"{run_results['unchanged']} unchanged"
         )
 
+        # Rescore pairs this run changed (and companies whose profile changed)
+        # so list views can sort by fit without scoring at request time
+        try:
+            scores = score_refresh_service.refresh(db)
+        except Exception as e:
+            logger.error(f"Match score refresh failed: {e}")
+            scores = {"error": str(e)}
+
         return {
             "status": "completed" if not rate_limited else "partial",
             "naics_codes": len(naics_codes),
             "api_calls": api_calls,
-            "found": len(raw_opportunities),
+            "retries": retries,
+            "cache_hits": cache_hits,
+            "found": found,
             "new": results_dict['new'],
             "updated": results_dict['updated'],
             "unchanged": results_dict['unchanged'],
-            "errors": results_dict['errors']
+            "errors": results_dict['errors'],
+            "stages": stage_stats,
+            "scores": scores
         }
 
     except Exception as e:
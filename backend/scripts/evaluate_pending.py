@@ -22,6 +22,7 @@ from typing import List
 
 from app.core.database import SessionLocal
 from app.models.opportunity import Opportunity
+from app.services.ai_cache import ai_response_cache
 from app.services.ai_evaluator import ai_evaluator_service
 from app.services.opportunity import opportunity_service
 
@@ -121,9 +122,11 @@ def evaluate_pending_opportunities():
                 import time
                 time.sleep(2)
 
+        cache_stats = ai_response_cache.stats()["process"]
         logger.info(
             f"Evaluation completed: {evaluated} evaluated, "
-            f"{skipped} skipped, {errors} errors"
+            f"{skipped} skipped, {errors} errors, "
+            f"{cache_stats['hits']} served from AI cache ({cache_stats['tokens_saved']} tokens saved)"
         )
 
         return {
@@ -131,7 +134,8 @@ def evaluate_pending_opportunities():
             "total_pending": len(pending),
             "evaluated": evaluated,
             "skipped": skipped,
-            "errors": errors
+            "errors": errors,
+            "ai_cache": cache_stats
         }
 
     except Exception as e:
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Background job worker.
+
+Polls the jobs table, claims the oldest queued job (FOR UPDATE SKIP LOCKED, so
+several workers can run side by side) and runs the handler for its kind.
+Running jobs whose worker died are requeued once their heartbeat goes stale.
+
+Usage:
+    python scripts/run_job_worker.py          # run until stopped (systemd: govai-worker.service)
+    python scripts/run_job_worker.py --once   # drain the queue and exit
+"""
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import logging
+import signal
+import socket
+import threading
+import time
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.company import Company
+from app.models.job import Job
+from app.services.company_discovery import company_discovery_service
+from app.services.jobs import COMPANY_DISCOVERY, SCORE_RECOMPUTE, job_service
+from app.services.score_refresh import score_refresh_service
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Seconds between stale-job sweeps
+STALE_SWEEP_INTERVAL = 60
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+_stopping = False
+
+
+async def handle_company_discovery(db, job: Job, progress) -> dict:
+    """Discovery and evaluation for the job's company."""
+    company = db.get(Company, job.company_id) if job.company_id else None
+    if company is None:
+        raise ValueError("Company no longer exists")
+    if not company.naics_codes:
+        raise ValueError("Company NAICS codes required")
+
+    return await company_discovery_service.run(
+        db,
+        company,
+        force_refresh=bool(job.params.get("force_refresh")),
+        progress=progress
+    )
+
+
+async def handle_score_recompute(db, job: Job, progress) -> dict:
+    """Recompute the match sub-scores a profile edit invalidated."""
+    company = db.get(Company, job.company_id) if job.company_id else None
+    if company is None:
+        raise ValueError("Company no longer exists")
+
+    return score_refresh_service.recompute(db, company)
+
+
+HANDLERS = {
+    COMPANY_DISCOVERY: handle_company_discovery,
+    SCORE_RECOMPUTE: handle_score_recompute,
+}
+
+
+def _keep_alive(job_id, stop: threading.Event) -> None:
+    """
+    Refresh a job's heartbeat every JOB_HEARTBEAT_INTERVAL_SECONDS until stopped.
+
+    Runs in its own thread and session: handlers do synchronous database
+    work on the event loop (score refresh, recompute) for minutes without
+    reporting progress, and an asyncio task would stall with them.
+    """
+    while not stop.wait(settings.JOB_HEARTBEAT_INTERVAL_SECONDS):
+        db = SessionLocal()
+        try:
+            if not job_service.heartbeat(db, job_id, WORKER_ID):
+                logger.warning(f"Job {job_id} is no longer running on this worker")
+                return
+        except Exception as e:
+            logger.error(f"Heartbeat for job {job_id} failed: {e}")
+        finally:
+            db.close()
+
+
+async def run_job(db, job: Job) -> None:
+    """
+    Run one claimed job and record its outcome.
+
+    The handler gets its own session: progress commits on the job's session
+    would otherwise expire the handler's loaded rows on every update. The
+    heartbeat is kept fresh from a separate thread for as long as the
+    handler runs, so long steps are not mistaken for a dead worker.
+    """
+    started = time.monotonic()
+    work_db = SessionLocal()
+    stop_heartbeat = threading.Event()
+    heartbeat = threading.Thread(
+        target=_keep_alive, args=(job.id, stop_heartbeat), name=f"heartbeat-{job.id}", daemon=True
+    )
+    heartbeat.start()
+    try:
+        result = await HANDLERS[job.kind](
+            work_db,
+            job,
+            lambda **counters: job_service.update_progress(db, job, **counters)
+        )
+    except Exception as e:
+        work_db.rollback()
+        db.rollback()
+        logger.exception(f"Job {job.id} ({job.kind}) raised")
+        job_service.fail(db, job, str(e))
+        return
+    finally:
+        stop_heartbeat.set()
+        heartbeat.join()
+        work_db.close()
+
+    job_service.complete(db, job, result)
+    logger.info(f"Job {job.id} ({job.kind}) finished in {time.monotonic() - started:.2f}s: {result}")
+
+
+async def work(once: bool = False) -> int:
+    """
+    Claim and run jobs until stopped (or until the queue is empty with once=True).
+
+    Returns:
+        Number of jobs processed
+    """
+    processed = 0
+    last_sweep = 0.0
+
+    while not _stopping:
+        db = SessionLocal()
+        try:
+            if time.monotonic() - last_sweep >= STALE_SWEEP_INTERVAL:
+                job_service.requeue_stale(db, settings.JOB_STALE_AFTER_SECONDS, settings.JOB_MAX_ATTEMPTS)
+                last_sweep = time.monotonic()
+
+            job = job_service.claim_next(db, WORKER_ID, kinds=HANDLERS.keys())
+            if job is not None:
+                await run_job(db, job)
+                processed += 1
+                continue
+        except Exception as e:
+            logger.error(f"Worker loop error: {e}")
+        finally:
+            db.close()
+
+        if once:
+            break
+        await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+
+    return processed
+
+
+def _request_stop(signum, frame):
+    global _stopping
+    logger.info(f"Received signal {signum}, stopping after the current job")
+    _stopping = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run queued background jobs")
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    args = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, _request_stop)
+    signal.signal(signal.SIGINT, _request_stop)
+
+    start_time = datetime.now()
+    logger.info(f"=== Job worker {WORKER_ID} started at {start_time} ===")
+
+    processed = asyncio.run(work(once=args.once))
+
+    duration = (datetime.now() - start_time).total_seconds()
+    logger.info(f"=== Job worker stopped after {duration:.2f} seconds ({processed} jobs) ===")
@@ -18,11 +18,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import logging
 from datetime import datetime, timedelta
 
+from sqlalchemy.orm import contains_eager, joinedload
+
 from app.core.database import SessionLocal
 from app.models.user import User
-from app.models.company import Company
 from app.models.evaluation import Evaluation
 from app.models.opportunity import Opportunity
+from app.services.stats import stats_service
 from app.services.email import (
     email_service,
     get_daily_digest_template,
@@ -44,8 +46,8 @@ def send_daily_digest_emails():
     try:
         logger.info("Starting daily digest email task...")
 
-        # Get all users subscribed to daily emails
-        users = db.query(User).filter(
+        # Get all users subscribed to daily emails, with their companies
+        users = db.query(User).options(joinedload(User.company)).filter(
             User.email_verified == True,
             User.email_frequency == "daily",
             User.company_id.isnot(None)
@@ -62,14 +64,16 @@ def send_daily_digest_emails():
         for user in users:
             try:
                 # Get company
-                company = db.query(Company).filter(Company.id == user.company_id).first()
+                company = user.company
                 if not company:
                     skipped += 1
                     continue
 
                 # Get new BID recommendations from last 24 hours
                 yesterday = datetime.utcnow() - timedelta(days=1)
-                new_opportunities = db.query(Evaluation).join(Opportunity).filter(
+                new_opportunities = db.query(Evaluation).join(Opportunity).options(
+                    contains_eager(Evaluation.opportunity)
+                ).filter(
                     Evaluation.company_id == company.id,
                     Evaluation.recommendation == "BID",
                     Evaluation.created_at >= yesterday
@@ -77,7 +81,9 @@ def send_daily_digest_emails():
 
                 # Get upcoming deadlines (next 7 days) for pipeline items
                 next_week = datetime.utcnow() + timedelta(days=7)
-                deadline_reminders = db.query(Evaluation).join(Opportunity).filter(
+                deadline_reminders = db.query(Evaluation).join(Opportunity).options(
+                    contains_eager(Evaluation.opportunity)
+                ).filter(
                     Evaluation.company_id == company.id,
                     Evaluation.user_saved.in_(["WATCHING", "BIDDING"]),
                     Opportunity.response_deadline.isnot(None),
@@ -85,20 +91,11 @@ def send_daily_digest_emails():
                     Opportunity.response_deadline <= next_week
                 ).order_by(Opportunity.response_deadline).all()
 
-                # Get stats
-                total_evaluated = db.query(Evaluation).filter(
-                    Evaluation.company_id == company.id
-                ).count()
-
-                bid_count = db.query(Evaluation).filter(
-                    Evaluation.company_id == company.id,
-                    Evaluation.recommendation == "BID"
-                ).count()
-
-                in_pipeline = db.query(Evaluation).filter(
-                    Evaluation.company_id == company.id,
-                    Evaluation.user_saved.isnot(None)
-                ).count()
+                # Get stats (company_stats summary row)
+                company_stats = stats_service.get_company_stats(db, company)
+                total_evaluated = company_stats["total_evaluations"]
+                bid_count = company_stats["bid_recommendations"]
+                in_pipeline = stats_service.get_pipeline_stats(db, company)["total"]
 
                 # Format opportunities for email
                 new_opps_formatted = []
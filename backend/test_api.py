@@ -207,6 +207,98 @@ def test_authenticated_endpoints(token: str):
         write_output(f"Error: {str(e)}")
 
 
+def test_list_query_counts(token: str):
+    """List endpoints must run a constant number of SQL statements (no N+1 loads)"""
+    headers = {"Authorization": f"Bearer {token}"}
+
+    write_output("\n" + "=" * 60)
+    write_output("LIST ENDPOINT QUERY COUNTS")
+    write_output("=" * 60)
+
+    for path in ["/opportunities", "/opportunities/feed", "/evaluations", "/pipeline"]:
+        write_output(f"\n[GET /api/v1{path}] limit=1 vs limit=100")
+        try:
+            counts = {}
+            rows = {}
+            for limit in (1, 100):
+                response = requests.get(f"{API_URL}{path}", headers=headers, params={"limit": limit})
+                counts[limit] = int(response.headers.get("X-DB-Query-Count", -1))
+                data = response.json()
+                rows[limit] = len(data.get("opportunities", data.get("evaluations", [])))
+
+            write_output(f"Rows: {rows[1]} vs {rows[100]}, statements: {counts[1]} vs {counts[100]}")
+            assert counts[1] == counts[100], f"{path} statement count grows with page size"
+            write_output("OK: constant statement count")
+        except AssertionError as e:
+            write_output(f"FAILED: {str(e)}")
+        except Exception as e:
+            write_output(f"Error: {str(e)}")
+
+
+def test_ranked_feed(token: str):
+    """Ranked feed is ordered by fit_score and the cursor continues where the page ended"""
+    headers = {"Authorization": f"Bearer {token}"}
+
+    write_output("\n" + "=" * 60)
+    write_output("RANKED FEED")
+    write_output("=" * 60)
+
+    write_output("\n[GET /api/v1/opportunities/feed] limit=5, then next_cursor")
+    try:
+        first = requests.get(f"{API_URL}/opportunities/feed", headers=headers, params={"limit": 5})
+        write_output(f"Status: {first.status_code}")
+        data = first.json()
+        scores = [item["fit_score"] for item in data.get("opportunities", [])]
+        write_output(f"Total: {data.get('total')}, fit scores: {scores}")
+        assert scores == sorted(scores, reverse=True), "feed not ordered by fit_score"
+
+        if data.get("next_cursor"):
+            second = requests.get(
+                f"{API_URL}/opportunities/feed",
+                headers=headers,
+                params={"limit": 5, "cursor": data["next_cursor"]}
+            ).json()
+            next_scores = [item["fit_score"] for item in second.get("opportunities", [])]
+            write_output(f"Next page fit scores: {next_scores}")
+            assert not next_scores or next_scores[0] <= scores[-1], "cursor page out of order"
+        write_output("OK: ranked by fit_score")
+    except AssertionError as e:
+        write_output(f"FAILED: {str(e)}")
+    except Exception as e:
+        write_output(f"Error: {str(e)}")
+
+
+def test_discovery_job(token: str):
+    """Trigger discovery twice (second call coalesces) and read the job status"""
+    headers = {"Authorization": f"Bearer {token}"}
+
+    write_output("\n" + "=" * 60)
+    write_output("DISCOVERY JOB")
+    write_output("=" * 60)
+
+    write_output("\n[POST /api/v1/actions/trigger-discovery] x2")
+    try:
+        first = requests.post(f"{API_URL}/actions/trigger-discovery", headers=headers)
+        second = requests.post(f"{API_URL}/actions/trigger-discovery", headers=headers)
+        write_output(f"Status: {first.status_code}, {second.status_code}")
+        write_output(f"Response: {pretty_json(first.json())}")
+        if first.status_code != 202:
+            return
+
+        job_id = first.json()["job_id"]
+        if second.json().get("job_id") == job_id:
+            write_output("OK: duplicate trigger coalesced onto the same job")
+        else:
+            write_output("Second trigger started a new job (first one had already finished?)")
+
+        write_output(f"\n[GET /api/v1/jobs/{job_id}]")
+        response = requests.get(f"{API_URL}/jobs/{job_id}", headers=headers)
+        write_output(f"Status: {response.status_code}")
+        write_output(f"Response: {pretty_json(response.json())}")
+    except Exception as e:
+        write_output(f"Error: {str(e)}")
+
+
 def test_forgot_password():
     """Test forgot password (will show email in console)"""
     write_output("\n" + "=" * 60)
@@ -248,6 +340,9 @@ def main():
 
     if token:
         test_authenticated_endpoints(token)
+        test_list_query_counts(token)
+        test_ranked_feed(token)
+        test_discovery_job(token)
     else:
         write_output("\nSkipping authenticated tests - login failed")
 
@@ -43,10 +43,10 @@ else
     echo -e "${RED}Warning: No .env file found. Make sure to configure ${REMOTE_DIR}/backend/.env on the server${NC}"
 fi
 
-# Step 4: Upload systemd service file
-echo -e "${YELLOW}Uploading systemd service file...${NC}"
-scp govai-api.service ${SERVER}:/tmp/
-ssh ${SERVER} "sudo mv /tmp/govai-api.service /etc/systemd/system/ && sudo systemctl daemon-reload"
+# Step 4: Upload systemd service files
+echo -e "${YELLOW}Uploading systemd service files...${NC}"
+scp govai-api.service govai-worker.service ${SERVER}:/tmp/
+ssh ${SERVER} "sudo mv /tmp/govai-api.service /tmp/govai-worker.service /etc/systemd/system/ && sudo systemctl daemon-reload"
 
 # Step 5: Setup Python virtual environment and install dependencies
 echo -e "${YELLOW}Setting up Python environment...${NC}"
@@ -92,6 +92,7 @@ ENDSSH
 # Step 8: Restart the service
 echo -e "${YELLOW}Restarting ${SERVICE_NAME} service...${NC}"
 ssh ${SERVER} "sudo systemctl enable ${SERVICE_NAME} && sudo systemctl restart ${SERVICE_NAME}"
+ssh ${SERVER} "sudo systemctl enable govai-worker && sudo systemctl restart govai-worker"
 
 # Step 9: Check service status
 echo -e "${YELLOW}Checking service status...${NC}"